@@ -1,10 +1,12 @@
+from typing import Optional
 from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
-from core.auth import decode_access_token
+from core.identity import authenticate
+from core.user_cache import get_user
 from db.database import get_db
 from models.users import Role, Users
 
@@ -14,11 +16,16 @@ security = HTTPBearer()
 
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
+    x_verified_identity: Optional[str] = Header(None, include_in_schema=False),
     db: Session = Depends(get_db),
 ) -> Users:
     """
     Dependency для получения текущего пользователя из JWT токена.
 
+    При TRUSTED_IDENTITY_ENABLED токен не декодируется повторно, если
+    gateway передал подписанный X-Verified-Identity или токен уже в кэше.
+    Пользователь читается через кэш (core.user_cache), а не из БД на каждый запрос.
+
     Использование:
         @app.get("/me")
         def get_me(current_user: Users = Depends(get_current_user)):
@@ -30,11 +37,11 @@ def get_current_user(
         HTTPException 403: Если пользователь неактивен
     """
     token = credentials.credentials
-    payload = decode_access_token(token)
+    payload = authenticate(token, x_verified_identity)
 
     user_id = UUID(payload.get("sub"))
 
-    user = db.query(Users).filter(Users.id == user_id).first()
+    user = get_user(db, user_id)
 
     if not user:
         raise HTTPException(
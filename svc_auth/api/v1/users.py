@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 
 from api.deps import get_current_user, require_role
 from core.security import hash_password
+from core.user_cache import get_user
 from db.database import get_db
 from models.users import Role, Users
 from schemas import UserRead, UserUpdate
@@ -119,7 +120,7 @@ def get_user_by_id(
 
     Доступно только: ADMIN, SUPERVISOR
     """
-    user = db.query(Users).filter(Users.id == user_id).first()
+    user = get_user(db, user_id)
 
     if not user:
         raise HTTPException(
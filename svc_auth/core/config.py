@@ -20,6 +20,23 @@ class Settings(BaseSettings):
     APP_HOST: str = "0.0.0.0"
     APP_PORT: int = 8001
 
+    # Трассировка (W3C traceparent): "none", "jsonl" (span'ы JSON-строками в
+    # TRACING_JSONL_PATH) или свой экспортёр "package.module:ClassName"
+    TRACING_EXPORTER: str = "none"
+    TRACING_JSONL_PATH: str = "/tmp/traces/svc_auth.jsonl"
+
+    # Кэш пользователей (LRU + TTL) для get_current_user и GET /users/{id};
+    # отсутствующие пользователи кэшируются на USER_CACHE_NEGATIVE_TTL
+    USER_CACHE_MAX_ENTRIES: int = 10000
+    USER_CACHE_TTL: float = 30.0
+    USER_CACHE_NEGATIVE_TTL: float = 5.0
+
+    # Доверенная внутренняя сеть: пользователь, уже проверенный gateway, принимается
+    # из подписанного X-Verified-Identity без повторного декодирования JWT, а
+    # проверенные токены кэшируются (LRU по дайджесту токена, до exp)
+    TRUSTED_IDENTITY_ENABLED: bool = False
+    VERIFIED_TOKEN_CACHE_SIZE: int = 10000
+
     model_config = SettingsConfigDict(
         env_file=str(BASE_DIR / ".env"), case_sensitive=True, extra="ignore"
     )
@@ -0,0 +1,119 @@
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from fastapi import HTTPException, status
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Абсолютный срок запроса (Unix time в секундах), который ставит gateway
+DEADLINE_HEADER = "X-Request-Deadline"
+
+# SQLSTATE query_canceled: запрос прерван по statement_timeout
+_QUERY_CANCELED = "57014"
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+def parse_deadline(value: Optional[str]) -> Optional[float]:
+    """Срок из значения заголовка; None, если заголовка нет или он некорректен."""
+    if not value:
+        return None
+    try:
+        deadline = float(value)
+    except ValueError:
+        return None
+    return deadline if deadline > 0 else None
+
+
+def remaining() -> Optional[float]:
+    """Сколько секунд осталось до срока текущего запроса (None, если срока нет)."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.time()
+
+
+def deadline_timeout(default: float) -> float:
+    """
+    Таймаут исходящего HTTP запроса: default, урезанный до остатка срока.
+
+    Raises:
+        HTTPException 504: Если срок запроса уже истёк
+    """
+    left = remaining()
+    if left is None:
+        return default
+    if left <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="Request deadline exceeded"
+        )
+    return min(default, left)
+
+
+def deadline_headers() -> Dict[str, str]:
+    """Заголовок для передачи срока дальше по цепочке вызовов."""
+    deadline = _deadline.get()
+    return {} if deadline is None else {DEADLINE_HEADER: f"{deadline:.3f}"}
+
+
+def statement_timeout_ms() -> Optional[int]:
+    """statement_timeout Postgres для текущего запроса (None, если срока нет)."""
+    left = remaining()
+    if left is None:
+        return None
+    return max(int(left * 1000), 1)
+
+
+def _deadline_exceeded_response() -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        content={
+            "success": False,
+            "error": {"code": "DEADLINE_EXCEEDED", "message": "Request deadline exceeded"},
+        },
+    )
+
+
+def _is_statement_timeout(exc: Exception) -> bool:
+    return getattr(getattr(exc, "orig", None), "pgcode", None) == _QUERY_CANCELED
+
+
+class DeadlineMiddleware:
+    """
+    Учитывает срок запроса из X-Request-Deadline.
+
+    Просроченные запросы отклоняются с 504 до выполнения эндпоинта; срок
+    остальных доступен через remaining()/deadline_timeout(), а запрос к БД,
+    прерванный по statement_timeout, превращается в 504.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        deadline = parse_deadline(Headers(scope=scope).get(DEADLINE_HEADER))
+        if deadline is not None and deadline <= time.time():
+            await _deadline_exceeded_response()(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        token = _deadline.set(deadline)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            if response_started or not _is_statement_timeout(exc):
+                raise
+            await _deadline_exceeded_response()(scope, receive, send)
+        finally:
+            _deadline.reset(token)
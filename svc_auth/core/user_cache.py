@@ -0,0 +1,144 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
+
+from core.config import settings
+from models.users import Users
+
+
+class UserCache:
+    """
+    Ограниченный LRU кэш пользователей по id с TTL записи.
+
+    Хранятся значения колонок (не ORM объекты, привязанные к сессии);
+    отсутствующий пользователь кэшируется как None на более короткий срок.
+    Каждая инвалидация увеличивает version: пользователь, прочитанный из БД
+    до неё, в кэш не попадает, поэтому медленное чтение не вернёт устаревшие данные.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, negative_ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.version = 0
+        self._entries: "OrderedDict[UUID, Tuple[Optional[Dict[str, Any]], float]]" = OrderedDict()
+        # Синхронные эндпоинты и зависимости выполняются в пуле потоков
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "negative_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "invalidations": 0,
+        }
+
+    def get(self, user_id: UUID) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """(найден ли в кэше, значения колонок или None для отсутствующего пользователя)."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[1] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[user_id]
+                self._counters["misses"] += 1
+                return False, None
+            self._entries.move_to_end(user_id)
+            self._counters["hits" if entry[0] is not None else "negative_hits"] += 1
+            return True, entry[0]
+
+    def set(self, user_id: UUID, columns: Optional[Dict[str, Any]], version: int) -> bool:
+        """Сохраняет запись; False, если после чтения version пользователь менялся."""
+        ttl = self.ttl if columns is not None else self.negative_ttl
+        if self.max_entries <= 0 or ttl <= 0:
+            return False
+        with self._lock:
+            if version != self.version:
+                return False
+            self._entries[user_id] = (columns, time.monotonic() + ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+        return True
+
+    def invalidate(self, user_id: UUID) -> None:
+        with self._lock:
+            self.version += 1
+            if self._entries.pop(user_id, None) is not None:
+                self._counters["invalidations"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["negative_hits"] + self._counters["misses"]
+            hit_rate = (self._counters["hits"] + self._counters["negative_hits"]) / lookups if lookups else 0.0
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                **self._counters,
+                "hit_rate": round(hit_rate, 4),
+            }
+
+
+user_cache = UserCache(
+    max_entries=settings.USER_CACHE_MAX_ENTRIES,
+    ttl=settings.USER_CACHE_TTL,
+    negative_ttl=settings.USER_CACHE_NEGATIVE_TTL,
+)
+
+
+def _columns(user: Users) -> Dict[str, Any]:
+    return {column.key: getattr(user, column.key) for column in Users.__table__.columns}
+
+
+def get_user(db: Session, user_id: UUID) -> Optional[Users]:
+    """
+    Пользователь по id через кэш (None, если не найден).
+
+    Пользователь из кэша присоединяется к сессии без запроса к БД, поэтому
+    его можно изменять и сохранять так же, как прочитанного из БД.
+    """
+    found, columns = user_cache.get(user_id)
+    if found:
+        if columns is None:
+            return None
+        user = Users(**columns)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+    version = user_cache.version
+    user = db.query(Users).filter(Users.id == user_id).first()
+    user_cache.set(user_id, _columns(user) if user is not None else None, version)
+    return user
+
+
+# Любое изменение пользователя через ORM (PATCH /users/me, действия админа)
+# сбрасывает его запись: сразу при flush и ещё раз после commit, чтобы
+# чтение, успевшее между ними, не оставило в кэше старые данные.
+@event.listens_for(Users, "after_insert")
+@event.listens_for(Users, "after_update")
+@event.listens_for(Users, "after_delete")
+def _invalidate_changed_user(mapper, connection, target: Users) -> None:
+    user_cache.invalidate(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_user_ids", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    for user_id in session.info.pop("changed_user_ids", ()):
+        user_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_users(session: Session) -> None:
+    session.info.pop("changed_user_ids", None)
@@ -7,6 +7,9 @@ from fastapi.responses import JSONResponse
 
 from api.v1 import auth, users
 from core.config import settings
+from core.deadline import DeadlineMiddleware
+from core.tracing import TracingMiddleware, configure_tracing
+from core.user_cache import user_cache
 
 
 @asynccontextmanager
@@ -14,6 +17,7 @@ async def lifespan(app: FastAPI):
     """Lifespan events для FastAPI"""
     # Startup
     print(f"Starting svc_auth on {settings.APP_HOST}:{settings.APP_PORT}")
+    configure_tracing("svc_auth")
     yield
     # Shutdown
     print("Shutting down svc_auth")
@@ -30,6 +34,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Срок запроса от gateway (X-Request-Deadline)
+app.add_middleware(DeadlineMiddleware)
+
+# Трассировка запросов (W3C traceparent)
+app.add_middleware(TracingMiddleware)
+
 
 # Exception handlers для единого формата
 @app.exception_handler(RequestValidationError)
@@ -70,6 +80,12 @@ def read_root():
     return {"service": "svc_auth", "version": "1.0.0", "status": "running"}
 
 
+@app.get("/internal/stats")
+def internal_stats():
+    """Счётчики кэша пользователей (попадания, промахи, hit rate)"""
+    return {"success": True, "data": {"user_cache": user_cache.stats()}}
+
+
 if __name__ == "__main__":
     import uvicorn
 
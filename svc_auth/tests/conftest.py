@@ -20,11 +20,13 @@ try:
     from svc_auth.main import app  # type: ignore
     from svc_auth.models.users import Base  # type: ignore
     from svc_auth.core import security as security_module  # type: ignore
+    from svc_auth.core.user_cache import user_cache  # type: ignore
 except ModuleNotFoundError:
     from db.database import get_db
     from main import app
     from models.users import Base
     from core import security as security_module
+    from core.user_cache import user_cache
 
 
 security_module.hash_password = lambda password: f"hashed::{password}"
@@ -60,6 +62,8 @@ def client(db_session: Session):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    # users of earlier tests are gone from the recreated database
+    user_cache.clear()
 
     with TestClient(app) as test_client:
         yield test_client
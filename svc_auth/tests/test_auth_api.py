@@ -4,9 +4,13 @@ import pytest
 from sqlalchemy.orm import Session
 
 try:
-    from svc_auth.models.users import Users  # type: ignore
+    from svc_auth.core.auth import create_access_token  # type: ignore
+    from svc_auth.core.user_cache import user_cache  # type: ignore
+    from svc_auth.models.users import Role, Users  # type: ignore
 except ModuleNotFoundError:
-    from models.users import Users
+    from core.auth import create_access_token
+    from core.user_cache import user_cache
+    from models.users import Role, Users
 
 
 def _register_user(client, email="user@example.com", password="Secret123!", role="engineer"):
@@ -88,3 +92,44 @@ def test_login_fails_for_invalid_credentials(client):
 
     assert response.status_code == 401
     assert response.json()["detail"] == "Incorrect email or password"
+
+
+def _login(client, email: str, password: str = "Secret123!") -> dict:
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    return {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+
+
+def test_current_user_is_cached_and_invalidated_on_update(client, db_session: Session):
+    _register_user(client, email="cached@example.com")
+    headers = _login(client, "cached@example.com")
+    hits = user_cache.stats()["hits"]
+
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 200
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 200
+    assert user_cache.stats()["hits"] == hits + 1
+
+    updated = client.patch("/api/v1/users/me", json={"full_name": "Renamed"}, headers=headers)
+    assert updated.json()["data"]["full_name"] == "Renamed"
+    assert client.get("/api/v1/users/me", headers=headers).json()["data"]["full_name"] == "Renamed"
+
+    # admin-side change made outside the endpoint
+    stored = db_session.query(Users).filter(Users.email == "cached@example.com").first()
+    stored.is_active = False
+    db_session.commit()
+
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 403
+
+
+def test_missing_user_is_cached_briefly(client):
+    headers = {"Authorization": f"Bearer {create_access_token(uuid4(), Role.ENGINEER)}"}
+
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 404
+
+    before = user_cache.stats()
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 404
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 404
+
+    stats = client.get("/internal/stats").json()["data"]["user_cache"]
+    assert stats["negative_hits"] - before["negative_hits"] == 2
+    assert stats["misses"] == before["misses"]
+    assert 0 < stats["hit_rate"] <= 1
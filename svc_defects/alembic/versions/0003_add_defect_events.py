@@ -0,0 +1,45 @@
+"""Add defect_events table for the SSE stream of defect changes
+
+Revision ID: 0003_add_defect_events
+Revises: 0002_update_attachments
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003_add_defect_events'
+down_revision: Union[str, None] = '0002_update_attachments'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Журнал изменений дефектов (id события = Last-Event-ID)"""
+
+    op.create_table(
+        'defect_events',
+        sa.Column('id', sa.BigInteger(), sa.Identity(), primary_key=True, nullable=False),
+        sa.Column('event_type', sa.String(length=50), nullable=False),
+        sa.Column('defect_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('project_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('author_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('assignee_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('data', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index('ix_defect_events_project_id', 'defect_events', ['project_id'], unique=False)
+    op.create_index('ix_defect_events_created_at', 'defect_events', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Откат изменений"""
+
+    op.drop_index('ix_defect_events_created_at', table_name='defect_events')
+    op.drop_index('ix_defect_events_project_id', table_name='defect_events')
+    op.drop_table('defect_events')
@@ -0,0 +1,75 @@
+"""Add composite and partial indexes for defect list filters
+
+Revision ID: 0004_add_defect_list_indexes
+Revises: 0003_add_defect_events
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004_add_defect_list_indexes'
+down_revision: Union[str, None] = '0003_add_defect_events'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Порядок списка дефектов: GET /defects/ сортирует по (created_at, id) DESC
+LIST_ORDER = [sa.text('created_at DESC'), sa.text('id DESC')]
+
+OPEN_STATUSES = sa.text("status IN ('NEW', 'IN_PROGRESS', 'ON_REVIEW')")
+
+# name -> (ведущие столбцы, предикат частичного индекса)
+INDEXES = {
+    'ix_defects_created_at_id': ([], None),
+    'ix_defects_project_created': (['project_id'], None),
+    'ix_defects_project_status_created': (['project_id', 'status'], None),
+    'ix_defects_project_priority_created': (['project_id', 'priority'], None),
+    'ix_defects_status_created': (['status'], None),
+    'ix_defects_author_created': (['author_id'], None),
+    'ix_defects_assignee_created': (['assignee_id'], None),
+    'ix_defects_open_project_created': (['project_id'], OPEN_STATUSES),
+    'ix_defects_open_assignee_created': (['assignee_id'], OPEN_STATUSES),
+}
+
+# Одиночные индексы из 0001: их первый столбец теперь ведёт составные индексы
+SUPERSEDED_INDEXES = {
+    'ix_defects_project_id': 'project_id',
+    'ix_defects_author_id': 'author_id',
+    'ix_defects_assignee_id': 'assignee_id',
+}
+
+
+def upgrade() -> None:
+    """
+    Составные и частичные индексы под фильтры и сортировку списка дефектов.
+
+    CREATE/DROP INDEX CONCURRENTLY не блокируют запись в defects, но не
+    работают внутри транзакции, поэтому выполняются в autocommit_block.
+    """
+
+    with op.get_context().autocommit_block():
+        for name, (columns, where) in INDEXES.items():
+            op.create_index(
+                name,
+                'defects',
+                [*columns, *LIST_ORDER],
+                unique=False,
+                postgresql_concurrently=True,
+                postgresql_where=where,
+            )
+        for name in SUPERSEDED_INDEXES:
+            op.drop_index(name, table_name='defects', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Откат изменений"""
+
+    with op.get_context().autocommit_block():
+        for name, column in SUPERSEDED_INDEXES.items():
+            op.create_index(name, 'defects', [column], unique=False, postgresql_concurrently=True)
+        for name in reversed(list(INDEXES)):
+            op.drop_index(name, table_name='defects', postgresql_concurrently=True)
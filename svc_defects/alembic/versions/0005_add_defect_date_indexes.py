@@ -0,0 +1,39 @@
+"""Add indexes for defect date range filters
+
+Revision ID: 0005_add_defect_date_indexes
+Revises: 0004_add_defect_list_indexes
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005_add_defect_date_indexes'
+down_revision: Union[str, None] = '0004_add_defect_list_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# created_from/created_to уже покрыты индексами 0004 по (…, created_at, id)
+INDEXES = {
+    'ix_defects_updated_at': 'updated_at',
+    'ix_defects_due_date': 'due_date',
+}
+
+
+def upgrade() -> None:
+    """Индексы под фильтры updated_from/updated_to и due_after/due_before."""
+
+    with op.get_context().autocommit_block():
+        for name, column in INDEXES.items():
+            op.create_index(name, 'defects', [column], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Откат изменений"""
+
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.drop_index(name, table_name='defects', postgresql_concurrently=True)
@@ -2,12 +2,14 @@ from typing import Optional
 from uuid import UUID
 
 import httpx
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
-from core.auth import decode_access_token
 from core.config import settings
+from core.deadline import deadline_headers, deadline_timeout
+from core.identity import authenticate
+from core.tracing import span, trace_headers
 from db.database import get_db
 from models.defects import DefectStatus
 
@@ -17,10 +19,14 @@ security = HTTPBearer()
 
 def get_current_user_from_token(
     credentials: HTTPAuthorizationCredentials = Depends(security),
+    x_verified_identity: Optional[str] = Header(None, include_in_schema=False),
 ) -> dict:
     """
     Извлекает user_id и role из JWT токена.
 
+    При TRUSTED_IDENTITY_ENABLED пользователь берётся из подписанного
+    заголовка gateway X-Verified-Identity или кэша проверенных токенов.
+
     Использование:
         @app.get("/defects")
         def get_defects(current_user: dict = Depends(get_current_user_from_token)):
@@ -36,7 +42,7 @@ def get_current_user_from_token(
         HTTPException 401: Если токен невалиден
     """
     token = credentials.credentials
-    payload = decode_access_token(token)
+    payload = authenticate(token, x_verified_identity)
 
     user_id = UUID(payload.get("sub"))
     role = payload.get("role")
@@ -90,11 +96,12 @@ async def validate_user_exists(user_id: UUID, token: str) -> bool:
         HTTPException 503: Если сервис auth недоступен
     """
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(
-                f"{settings.AUTH_SERVICE_URL}/api/v1/users/{user_id}",
-                headers={"Authorization": f"Bearer {token}"}
-            )
+        async with httpx.AsyncClient(timeout=deadline_timeout(5.0)) as client:
+            with span("GET svc_auth /api/v1/users/{user_id}", kind="client"):
+                response = await client.get(
+                    f"{settings.AUTH_SERVICE_URL}/api/v1/users/{user_id}",
+                    headers={"Authorization": f"Bearer {token}", **deadline_headers(), **trace_headers()}
+                )
 
             if response.status_code == 200:
                 return True
@@ -137,11 +144,12 @@ async def validate_project_exists(project_id: UUID, token: str) -> bool:
         HTTPException 503: Если сервис projects недоступен
     """
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(
-                f"{settings.PROJECTS_SERVICE_URL}/api/v1/projects/{project_id}",
-                headers={"Authorization": f"Bearer {token}"}
-            )
+        async with httpx.AsyncClient(timeout=deadline_timeout(5.0)) as client:
+            with span("GET svc_projects /api/v1/projects/{project_id}", kind="client"):
+                response = await client.get(
+                    f"{settings.PROJECTS_SERVICE_URL}/api/v1/projects/{project_id}",
+                    headers={"Authorization": f"Bearer {token}", **deadline_headers(), **trace_headers()}
+                )
 
             if response.status_code == 200:
                 return True
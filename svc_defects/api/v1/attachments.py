@@ -1,9 +1,13 @@
-from typing import List
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import List, Optional, Tuple
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile, status
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, UploadFile, status
 from fastapi.responses import Response
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 
 from api.deps import get_current_user_from_token
 from db.database import get_db
@@ -16,6 +20,9 @@ router = APIRouter(prefix="/attachments", tags=["Attachments"])
 # Максимальный размер файла: 10 МБ
 MAX_FILE_SIZE = 10 * 1024 * 1024
 
+# Размер блока при чтении загружаемого файла
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 # Разрешённые MIME типы
 ALLOWED_CONTENT_TYPES = [
     "image/jpeg",
@@ -29,9 +36,12 @@ ALLOWED_CONTENT_TYPES = [
 
 @router.post("/", response_model=dict, status_code=status.HTTP_201_CREATED)
 async def upload_attachment(
-    defect_id: UUID = Form(..., description="ID дефекта"),
+    defect_id: Optional[UUID] = Form(None, description="ID дефекта"),
+    defect_id_query: Optional[UUID] = Query(
+        None, alias="defect_id", description="ID дефекта (альтернатива полю формы)"
+    ),
     file: UploadFile = File(..., description="Файл для загрузки"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user_from_token),
 ):
     """
@@ -47,8 +57,12 @@ async def upload_attachment(
     - Максимальный размер файла: 10 МБ
     - Разрешённые типы: JPEG, PNG, GIF, WebP, PDF
 
+    Файл читается блоками: загрузка прерывается, как только превышен лимит,
+    не дожидаясь чтения всего файла.
+
     Args:
         defect_id: ID дефекта (через Form data)
+        defect_id_query: ID дефекта в query-параметре ?defect_id=...
         file: Загружаемый файл (multipart/form-data)
 
     Returns:
@@ -59,6 +73,7 @@ async def upload_attachment(
         HTTPException 404: Если дефект не найден
         HTTPException 413: Если файл слишком большой
         HTTPException 415: Если тип файла не поддерживается
+        HTTPException 422: Если defect_id не передан
     """
     # Проверка прав доступа
     user_role = current_user["role"]
@@ -68,8 +83,15 @@ async def upload_attachment(
             detail="Access denied. Only ENGINEER, MANAGER, or ADMIN can upload attachments.",
         )
 
+    defect_id = defect_id or defect_id_query
+    if defect_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="defect_id is required",
+        )
+
     # Проверка существования дефекта
-    defect = db.query(Defects).filter(Defects.id == defect_id).first()
+    defect = await db.get(Defects, defect_id)
 
     if not defect:
         raise HTTPException(
@@ -77,16 +99,18 @@ async def upload_attachment(
             detail=f"Defect with ID {defect_id} not found",
         )
 
-    # Чтение файла
-    file_data = await file.read()
-    file_size = len(file_data)
-
-    # Проверка размера файла
-    if file_size > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f"File size {file_size} bytes exceeds maximum allowed size {MAX_FILE_SIZE} bytes (10 MB)",
-        )
+    # Чтение файла блоками с проверкой размера
+    chunks = []
+    file_size = 0
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        file_size += len(chunk)
+        if file_size > MAX_FILE_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File size exceeds maximum allowed size {MAX_FILE_SIZE} bytes (10 MB)",
+            )
+        chunks.append(chunk)
+    file_data = b"".join(chunks)
 
     # Проверка типа файла
     content_type = file.content_type or "application/octet-stream"
@@ -110,8 +134,8 @@ async def upload_attachment(
     )
 
     db.add(db_attachment)
-    db.commit()
-    db.refresh(db_attachment)
+    await db.commit()
+    await db.refresh(db_attachment)
 
     return {"success": True, "data": AttachmentRead.model_validate(db_attachment)}
 
@@ -121,7 +145,7 @@ async def get_defect_attachments(
     defect_id: UUID,
     skip: int = Query(0, ge=0, description="Количество записей для пропуска"),
     limit: int = Query(100, ge=1, le=1000, description="Максимальное количество записей"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user_from_token),
 ):
     """
@@ -145,7 +169,7 @@ async def get_defect_attachments(
         HTTPException 404: Если дефект не найден
     """
     # Проверка существования дефекта
-    defect = db.query(Defects).filter(Defects.id == defect_id).first()
+    defect = await db.get(Defects, defect_id)
 
     if not defect:
         raise HTTPException(
@@ -155,13 +179,15 @@ async def get_defect_attachments(
 
     # Получение вложений
     attachments = (
-        db.query(Attachment)
-        .filter(Attachment.defect_id == defect_id)
-        .order_by(Attachment.uploaded_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+        await db.scalars(
+            select(Attachment)
+            .options(defer(Attachment.file_data))
+            .where(Attachment.defect_id == defect_id)
+            .order_by(Attachment.uploaded_at.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+    ).all()
 
     return {
         "success": True,
@@ -169,10 +195,81 @@ async def get_defect_attachments(
     }
 
 
+def _attachment_etag(attachment: Attachment) -> str:
+    # Вложения неизменяемы: id + размер однозначно определяют содержимое
+    return f'"{attachment.id.hex}-{attachment.file_size}"'
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Слабое сравнение ETag для If-None-Match (RFC 9110, 13.1.2)."""
+    if header.strip() == "*":
+        return True
+    candidates = [value.strip().removeprefix("W/") for value in header.split(",")]
+    return etag in candidates
+
+
+def _uploaded_at_utc(attachment: Attachment) -> datetime:
+    uploaded_at = attachment.uploaded_at
+    if uploaded_at.tzinfo is None:
+        return uploaded_at.replace(tzinfo=UTC)
+    return uploaded_at.astimezone(UTC)
+
+
+def _not_modified(request: Request, attachment: Attachment, etag: str) -> bool:
+    """Проверка условных заголовков If-None-Match / If-Modified-Since."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return _uploaded_at_utc(attachment).replace(microsecond=0) <= since
+    return False
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Разбор заголовка Range с одним диапазоном байт.
+
+    Returns:
+        (start, end) включительно; None, если заголовок не поддерживается
+        (несколько диапазонов, другие единицы) и нужно отдать файл целиком
+
+    Raises:
+        ValueError: Если диапазон не удовлетворим для файла данного размера
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    first, _, last = spec.strip().partition("-")
+    # Некорректный заголовок (RFC 9110) игнорируется: каждая непустая граница — только цифры
+    if not (first or last) or any(bound and not bound.isdigit() for bound in (first, last)):
+        return None
+
+    if not first:
+        # Суффиксный диапазон: последние N байт
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError("unsatisfiable suffix range")
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError("unsatisfiable range")
+    return start, min(end, size - 1)
+
+
 @router.get("/{attachment_id}/download")
 async def download_attachment(
     attachment_id: UUID,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user_from_token),
 ):
     """
@@ -181,17 +278,23 @@ async def download_attachment(
     Возвращает бинарные данные файла с правильным Content-Type заголовком.
     Файл отображается в браузере (inline) или скачивается, в зависимости от типа.
 
+    Поддерживаются условные запросы (If-None-Match / If-Modified-Since -> 304)
+    и запрос одного диапазона байт (Range -> 206). Для 304 и 206 файл целиком
+    из БД не читается: диапазон вырезается на стороне БД через substr().
+
     Args:
         attachment_id: ID вложения
+        request: Запрос (заголовки Range, If-Range, If-None-Match, If-Modified-Since)
 
     Returns:
-        Response с бинарными данными файла
+        Response с бинарными данными файла (200, 206 или 304)
 
     Raises:
         HTTPException 404: Если вложение не найдено
+        HTTPException 416: Если диапазон Range не удовлетворим
     """
-    # Поиск вложения
-    attachment = db.query(Attachment).filter(Attachment.id == attachment_id).first()
+    # Поиск вложения (без бинарных данных)
+    attachment = await db.get(Attachment, attachment_id, options=[defer(Attachment.file_data)])
 
     if not attachment:
         raise HTTPException(
@@ -199,21 +302,60 @@ async def download_attachment(
             detail=f"Attachment with ID {attachment_id} not found",
         )
 
-    # Возвращаем файл
+    etag = _attachment_etag(attachment)
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": etag,
+        "Last-Modified": format_datetime(_uploaded_at_utc(attachment), usegmt=True),
+        "Cache-Control": "private, max-age=86400",
+    }
+
+    if _not_modified(request, attachment, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    headers["Content-Disposition"] = f'inline; filename="{attachment.file_name}"'
+
+    # Range учитывается, только если If-Range (при наличии) совпадает с ETag
+    byte_range = None
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range.strip() == etag):
+        try:
+            byte_range = _parse_range(range_header, attachment.file_size)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                detail=f"Range not satisfiable for file of {attachment.file_size} bytes",
+                headers={"Content-Range": f"bytes */{attachment.file_size}"},
+            )
+
+    if byte_range is None:
+        file_data = await db.scalar(select(Attachment.file_data).where(Attachment.id == attachment_id))
+        headers["Content-Length"] = str(attachment.file_size)
+        return Response(
+            content=file_data,
+            media_type=attachment.content_type,
+            headers=headers,
+        )
+
+    start, end = byte_range
+    chunk = await db.scalar(
+        select(func.substr(Attachment.file_data, start + 1, end - start + 1)).where(Attachment.id == attachment_id)
+    )
+    headers["Content-Range"] = f"bytes {start}-{end}/{attachment.file_size}"
+    headers["Content-Length"] = str(len(chunk))
     return Response(
-        content=attachment.file_data,
+        content=bytes(chunk),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
         media_type=attachment.content_type,
-        headers={
-            "Content-Disposition": f'inline; filename="{attachment.file_name}"',
-            "Content-Length": str(attachment.file_size),
-        },
+        headers=headers,
     )
 
 
 @router.delete("/{attachment_id}", response_model=dict)
 async def delete_attachment(
     attachment_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user_from_token),
 ):
     """
@@ -237,7 +379,7 @@ async def delete_attachment(
         HTTPException 403: Если у пользователя нет прав на удаление
     """
     # Поиск вложения
-    attachment = db.query(Attachment).filter(Attachment.id == attachment_id).first()
+    attachment = await db.get(Attachment, attachment_id, options=[defer(Attachment.file_data)])
 
     if not attachment:
         raise HTTPException(
@@ -257,8 +399,8 @@ async def delete_attachment(
         )
 
     # Удаление вложения
-    db.delete(attachment)
-    db.commit()
+    await db.delete(attachment)
+    await db.commit()
 
     return {
         "success": True,
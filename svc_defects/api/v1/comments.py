@@ -2,7 +2,8 @@ from typing import List
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.deps import get_current_user_from_token
 from db.database import get_db
@@ -16,7 +17,7 @@ router = APIRouter(prefix="/comments", tags=["Comments"])
 @router.post("/", response_model=dict, status_code=status.HTTP_201_CREATED)
 async def create_comment(
     comment_data: CommentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user_from_token),
 ):
     """
@@ -32,7 +33,7 @@ async def create_comment(
         HTTPException 404: Если дефект не найден
     """
     # Проверка существования дефекта
-    defect = db.query(Defects).filter(Defects.id == comment_data.defect_id).first()
+    defect = await db.get(Defects, comment_data.defect_id)
 
     if not defect:
         raise HTTPException(
@@ -51,8 +52,8 @@ async def create_comment(
     )
 
     db.add(db_comment)
-    db.commit()
-    db.refresh(db_comment)
+    await db.commit()
+    await db.refresh(db_comment)
 
     return {"success": True, "data": CommentRead.model_validate(db_comment)}
 
@@ -62,7 +63,7 @@ async def get_defect_comments(
     defect_id: UUID,
     skip: int = Query(0, ge=0, description="Количество записей для пропуска"),
     limit: int = Query(100, ge=1, le=1000, description="Максимальное количество записей"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user_from_token),
 ):
     """
@@ -77,7 +78,7 @@ async def get_defect_comments(
         HTTPException 404: Если дефект не найден
     """
     # Проверка существования дефекта
-    defect = db.query(Defects).filter(Defects.id == defect_id).first()
+    defect = await db.get(Defects, defect_id)
 
     if not defect:
         raise HTTPException(
@@ -87,13 +88,14 @@ async def get_defect_comments(
 
     # Получение комментариев
     comments = (
-        db.query(Comment)
-        .filter(Comment.defect_id == defect_id)
-        .order_by(Comment.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+        await db.scalars(
+            select(Comment)
+            .where(Comment.defect_id == defect_id)
+            .order_by(Comment.created_at.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+    ).all()
 
     return {"success": True, "data": [CommentRead.model_validate(c) for c in comments]}
 
@@ -102,7 +104,7 @@ async def get_defect_comments(
 async def update_comment(
     comment_id: UUID,
     text: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user_from_token),
 ):
     """
@@ -118,7 +120,7 @@ async def update_comment(
         HTTPException 403: Если пользователь не автор комментария
     """
     # Поиск комментария
-    comment = db.query(Comment).filter(Comment.id == comment_id).first()
+    comment = await db.get(Comment, comment_id)
 
     if not comment:
         raise HTTPException(
@@ -138,8 +140,8 @@ async def update_comment(
     # Обновление текста комментария
     comment.text = text
 
-    db.commit()
-    db.refresh(comment)
+    await db.commit()
+    await db.refresh(comment)
 
     return {"success": True, "data": CommentRead.model_validate(comment)}
 
@@ -147,7 +149,7 @@ async def update_comment(
 @router.delete("/{comment_id}", response_model=dict)
 async def delete_comment(
     comment_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user_from_token),
 ):
     """
@@ -165,7 +167,7 @@ async def delete_comment(
         HTTPException 403: Если у пользователя нет прав на удаление
     """
     # Поиск комментария
-    comment = db.query(Comment).filter(Comment.id == comment_id).first()
+    comment = await db.get(Comment, comment_id)
 
     if not comment:
         raise HTTPException(
@@ -185,7 +187,7 @@ async def delete_comment(
         )
 
     # Удаление комментария
-    db.delete(comment)
-    db.commit()
+    await db.delete(comment)
+    await db.commit()
 
     return {"success": True, "data": {"message": "Comment deleted successfully"}}
@@ -1,10 +1,11 @@
-from datetime import datetime, UTC
+from datetime import date, datetime, UTC
 from typing import List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, case, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.deps import (
     check_valid_status_transition,
@@ -13,18 +14,19 @@ from api.deps import (
     validate_project_exists,
     validate_user_exists,
 )
+from core.pagination import decode_cursor, encode_cursor
 from db.database import get_db
 from models.comments import Comment
 from models.defect_history import DefectHistory
-from models.defects import DefectPriority, Defects, DefectStatus
-from schemas.defects import DefectCreate, DefectRead, DefectUpdate
+from models.defects import OPEN_DEFECT_STATUSES, DefectPriority, Defects, DefectStatus, open_status_clause
+from schemas.defects import DefectCreate, DefectRead, DefectStatsRead, DefectUpdate
 
 router = APIRouter(prefix="/defects", tags=["Defects"])
 security = HTTPBearer()
 
 
 def _create_history_entry(
-    db: Session,
+    db: AsyncSession,
     defect_id: UUID,
     changed_by_id: UUID,
     field_name: str,
@@ -52,10 +54,111 @@ def _create_history_entry(
     db.add(history_entry)
 
 
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Граница диапазона в UTC (время без часового пояса считается UTC)."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value.astimezone(UTC)
+
+
+class DefectFilters:
+    """
+    Фильтры дефектов из query-параметров, общие для списка и статистики.
+
+    apply() добавляет к запросу ограничения роли и переданные фильтры, так
+    что GET /defects/ и GET /defects/stats всегда считают одни и те же строки.
+    """
+
+    def __init__(
+        self,
+        project_id: Optional[UUID] = Query(None, description="Фильтр по ID проекта"),
+        status: Optional[DefectStatus] = Query(None, description="Фильтр по статусу"),
+        priority: Optional[DefectPriority] = Query(None, description="Фильтр по приоритету"),
+        assignee_id: Optional[UUID] = Query(None, description="Фильтр по ID исполнителя"),
+        author_id: Optional[UUID] = Query(None, description="Фильтр по ID автора"),
+        is_open: Optional[bool] = Query(
+            None, description="true: только открытые (NEW, IN_PROGRESS, ON_REVIEW), false: только закрытые"
+        ),
+        created_from: Optional[datetime] = Query(None, description="Создан не раньше (включительно)"),
+        created_to: Optional[datetime] = Query(None, description="Создан раньше (не включительно)"),
+        updated_from: Optional[datetime] = Query(None, description="Изменён не раньше (включительно)"),
+        updated_to: Optional[datetime] = Query(None, description="Изменён раньше (не включительно)"),
+        due_after: Optional[date] = Query(None, description="Срок не раньше даты (включительно)"),
+        due_before: Optional[date] = Query(None, description="Срок не позже даты (включительно)"),
+    ):
+        self.project_id = project_id
+        self.status = status
+        self.priority = priority
+        self.assignee_id = assignee_id
+        self.author_id = author_id
+        self.is_open = is_open
+        self.created_from = _as_utc(created_from)
+        self.created_to = _as_utc(created_to)
+        self.updated_from = _as_utc(updated_from)
+        self.updated_to = _as_utc(updated_to)
+        self.due_after = due_after
+        self.due_before = due_before
+
+    def apply(self, query: Select, current_user: dict) -> Select:
+        # Фильтрация по ролям
+        user_role = current_user["role"]
+        user_id = current_user["user_id"]
+
+        if user_role == "ENGINEER":
+            # ENGINEER видит только свои дефекты (как автор или исполнитель)
+            query = query.where(
+                (Defects.author_id == user_id) | (Defects.assignee_id == user_id)
+            )
+        elif user_role in ["SUPERVISOR", "CUSTOMER"]:
+            # SUPERVISOR и CUSTOMER видят дефекты своих проектов
+            # (Примечание: для полной реализации нужно джойнить с Projects
+            # и проверять manager_id, но для упрощения оставим фильтр по author_id)
+            query = query.where(Defects.author_id == user_id)
+
+        # Применение фильтров
+        if self.project_id:
+            query = query.where(Defects.project_id == self.project_id)
+
+        if self.status:
+            query = query.where(Defects.status == self.status)
+
+        if self.priority:
+            query = query.where(Defects.priority == self.priority)
+
+        if self.assignee_id:
+            query = query.where(Defects.assignee_id == self.assignee_id)
+
+        if self.author_id:
+            query = query.where(Defects.author_id == self.author_id)
+
+        if self.is_open is not None:
+            query = query.where(open_status_clause() if self.is_open else ~open_status_clause())
+
+        # Диапазоны дат: [from, to) для времени, включительно для срока
+        if self.created_from:
+            query = query.where(Defects.created_at >= self.created_from)
+        if self.created_to:
+            query = query.where(Defects.created_at < self.created_to)
+
+        if self.updated_from:
+            query = query.where(Defects.updated_at >= self.updated_from)
+        if self.updated_to:
+            query = query.where(Defects.updated_at < self.updated_to)
+
+        if self.due_after:
+            query = query.where(Defects.due_date >= self.due_after)
+        if self.due_before:
+            query = query.where(Defects.due_date <= self.due_before)
+
+        return query
+
+
 @router.post("/", response_model=dict, status_code=status.HTTP_201_CREATED)
 async def create_defect(
     defect: DefectCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user_from_token),
     _role_check=Depends(require_role("ENGINEER", "MANAGER", "ADMIN")),
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -103,7 +206,7 @@ async def create_defect(
     )
 
     db.add(db_defect)
-    db.flush()  # Получаем ID для истории
+    await db.flush()  # Получаем ID для истории
 
     # Создание первой записи в истории
     _create_history_entry(
@@ -115,8 +218,8 @@ async def create_defect(
         new_value=f"Defect created with status {defect.status.value}",
     )
 
-    db.commit()
-    db.refresh(db_defect)
+    await db.commit()
+    await db.refresh(db_defect)
 
     return {"success": True, "data": DefectRead.model_validate(db_defect)}
 
@@ -125,12 +228,9 @@ async def create_defect(
 async def get_defects(
     skip: int = Query(0, ge=0, description="Количество записей для пропуска"),
     limit: int = Query(100, ge=1, le=1000, description="Максимальное количество записей"),
-    project_id: Optional[UUID] = Query(None, description="Фильтр по ID проекта"),
-    status: Optional[DefectStatus] = Query(None, description="Фильтр по статусу"),
-    priority: Optional[DefectPriority] = Query(None, description="Фильтр по приоритету"),
-    assignee_id: Optional[UUID] = Query(None, description="Фильтр по ID исполнителя"),
-    author_id: Optional[UUID] = Query(None, description="Фильтр по ID автора"),
-    db: Session = Depends(get_db),
+    after: Optional[str] = Query(None, description="Курсор: next_cursor предыдущей страницы"),
+    filters: DefectFilters = Depends(),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user_from_token),
 ):
     """
@@ -141,55 +241,116 @@ async def get_defects(
     - MANAGER и ADMIN: видят все дефекты
     - SUPERVISOR и CUSTOMER: видят дефекты своих проектов (требуется дополнительная логика)
 
+    Пагинация:
+    - after=<cursor> (keyset): страница начинается сразу после записи, на
+      которой закончилась предыдущая; глубокие страницы не сканируют
+      пропущенные строки. Курсор сочетается с любыми фильтрами
+    - skip/limit (offset): оставлен для совместимости, с after не сочетается
+
+    next_cursor — курсор следующей страницы, null на последней.
+
     Returns:
-        {"success": True, "data": [DefectRead, ...]}
+        {"success": True, "data": [DefectRead, ...], "next_cursor": str | None}
+
+    Raises:
+        HTTPException 400: Если курсор повреждён или передан вместе со skip
     """
-    query = db.query(Defects)
+    if after is not None and skip:
+        raise HTTPException(
+            status_code=400,
+            detail="Parameters 'after' and 'skip' cannot be combined",
+        )
 
-    # Фильтрация по ролям
-    user_role = current_user["role"]
-    user_id = current_user["user_id"]
+    query = filters.apply(select(Defects), current_user)
 
-    if user_role == "ENGINEER":
-        # ENGINEER видит только свои дефекты (как автор или исполнитель)
-        query = query.filter(
-            (Defects.author_id == user_id) | (Defects.assignee_id == user_id)
-        )
-    elif user_role in ["SUPERVISOR", "CUSTOMER"]:
-        # SUPERVISOR и CUSTOMER видят дефекты своих проектов
-        # (Примечание: для полной реализации нужно джойнить с Projects
-        # и проверять manager_id, но для упрощения оставим фильтр по author_id)
-        query = query.filter(Defects.author_id == user_id)
+    # Сортировка по дате создания (новые первыми), id различает дефекты с одной датой
+    query = query.order_by(Defects.created_at.desc(), Defects.id.desc())
+
+    # Пагинация: keyset по (created_at, id) или offset
+    if after is not None:
+        query = query.where(tuple_(Defects.created_at, Defects.id) < tuple_(*decode_cursor(after)))
+    else:
+        query = query.offset(skip)
+
+    # Лишняя запись показывает, есть ли следующая страница
+    defects = (await db.scalars(query.limit(limit + 1))).all()
+    next_cursor = None
+    if len(defects) > limit:
+        defects = defects[:limit]
+        next_cursor = encode_cursor(defects[-1].created_at, defects[-1].id)
+
+    return {
+        "success": True,
+        "data": [DefectRead.model_validate(d) for d in defects],
+        "next_cursor": next_cursor,
+    }
 
-    # Применение фильтров
-    if project_id:
-        query = query.filter(Defects.project_id == project_id)
 
-    if status:
-        query = query.filter(Defects.status == status)
+def _close_time_days(dialect_name: str):
+    """Время от создания до закрытия в днях (updated_at закрытого дефекта = момент закрытия)."""
+    if dialect_name == "sqlite":
+        return func.julianday(Defects.updated_at) - func.julianday(Defects.created_at)
+    return func.extract("epoch", Defects.updated_at - Defects.created_at) / 86400
 
-    if priority:
-        query = query.filter(Defects.priority == priority)
 
-    if assignee_id:
-        query = query.filter(Defects.assignee_id == assignee_id)
+@router.get("/stats", response_model=dict)
+async def get_defects_stats(
+    filters: DefectFilters = Depends(),
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user_from_token),
+):
+    """
+    Статистика дефектов: количество по статусам, приоритетам и проектам,
+    открытые/закрытые и среднее время закрытия (в днях).
 
-    if author_id:
-        query = query.filter(Defects.author_id == author_id)
+    Фильтры и права доступа те же, что у GET /defects/. Считается одним
+    GROUP BY (project_id, status, priority) в БД: строк в ответе БД не больше,
+    чем сочетаний проект/статус/приоритет, сами дефекты не передаются.
 
-    # Сортировка по дате создания (новые первыми)
-    query = query.order_by(Defects.created_at.desc())
+    Returns:
+        {"success": True, "data": DefectStatsRead}
+    """
+    is_closed = Defects.status == DefectStatus.CLOSED
+    query = filters.apply(
+        select(
+            Defects.project_id,
+            Defects.status,
+            Defects.priority,
+            func.count().label("count"),
+            func.sum(case((is_closed, _close_time_days(db.bind.dialect.name)))).label("close_days"),
+        ),
+        current_user,
+    ).group_by(Defects.project_id, Defects.status, Defects.priority)
+
+    stats = {
+        "total": 0,
+        "by_status": {},
+        "by_priority": {},
+        "by_project": {},
+        "open": 0,
+        "closed": 0,
+    }
+    close_days = 0.0
+    for row in await db.execute(query):
+        stats["total"] += row.count
+        stats["by_status"][row.status] = stats["by_status"].get(row.status, 0) + row.count
+        stats["by_priority"][row.priority] = stats["by_priority"].get(row.priority, 0) + row.count
+        stats["by_project"][row.project_id] = stats["by_project"].get(row.project_id, 0) + row.count
+        if row.status in OPEN_DEFECT_STATUSES:
+            stats["open"] += row.count
+        elif row.status == DefectStatus.CLOSED:
+            stats["closed"] += row.count
+            close_days += float(row.close_days or 0)
 
-    # Пагинация
-    defects = query.offset(skip).limit(limit).all()
+    stats["average_close_time_days"] = close_days / stats["closed"] if stats["closed"] else None
 
-    return {"success": True, "data": [DefectRead.model_validate(d) for d in defects]}
+    return {"success": True, "data": DefectStatsRead.model_validate(stats)}
 
 
 @router.get("/{defect_id}", response_model=dict)
 async def get_defect(
     defect_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user_from_token),
 ):
     """
@@ -202,7 +363,7 @@ async def get_defect(
         HTTPException 404: Если дефект не найден
         HTTPException 403: Если у пользователя нет прав на просмотр
     """
-    defect = db.query(Defects).filter(Defects.id == defect_id).first()
+    defect = await db.get(Defects, defect_id)
 
     if not defect:
         raise HTTPException(
@@ -229,7 +390,7 @@ async def get_defect(
 async def update_defect(
     defect_id: UUID,
     defect_update: DefectUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user_from_token),
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ):
@@ -255,7 +416,7 @@ async def update_defect(
     token = credentials.credentials
 
     # Поиск дефекта
-    defect = db.query(Defects).filter(Defects.id == defect_id).first()
+    defect = await db.get(Defects, defect_id)
 
     if not defect:
         raise HTTPException(
@@ -312,8 +473,8 @@ async def update_defect(
     # Обновление timestamp
     defect.updated_at = datetime.now(UTC)
 
-    db.commit()
-    db.refresh(defect)
+    await db.commit()
+    await db.refresh(defect)
 
     return {"success": True, "data": DefectRead.model_validate(defect)}
 
@@ -321,7 +482,7 @@ async def update_defect(
 @router.delete("/{defect_id}", response_model=dict)
 async def delete_defect(
     defect_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user_from_token),
 ):
     """
@@ -339,7 +500,7 @@ async def delete_defect(
         HTTPException 403: Если у пользователя нет прав на удаление
     """
     # Поиск дефекта
-    defect = db.query(Defects).filter(Defects.id == defect_id).first()
+    defect = await db.get(Defects, defect_id)
 
     if not defect:
         raise HTTPException(
@@ -366,8 +527,8 @@ async def delete_defect(
         )
 
     # Удаление дефекта (каскадное удаление комментариев и истории через ondelete="CASCADE")
-    db.delete(defect)
-    db.commit()
+    await db.delete(defect)
+    await db.commit()
 
     return {"success": True, "data": {"message": "Defect deleted successfully"}}
 
@@ -377,7 +538,7 @@ async def get_defect_history(
     defect_id: UUID,
     skip: int = Query(0, ge=0, description="Количество записей для пропуска"),
     limit: int = Query(100, ge=1, le=1000, description="Максимальное количество записей"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user_from_token),
 ):
     """
@@ -390,7 +551,7 @@ async def get_defect_history(
         HTTPException 404: Если дефект не найден
     """
     # Проверяем существование дефекта
-    defect = db.query(Defects).filter(Defects.id == defect_id).first()
+    defect = await db.get(Defects, defect_id)
 
     if not defect:
         raise HTTPException(
@@ -400,13 +561,14 @@ async def get_defect_history(
 
     # Получаем историю изменений
     history = (
-        db.query(DefectHistory)
-        .filter(DefectHistory.defect_id == defect_id)
-        .order_by(DefectHistory.changed_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+        await db.scalars(
+            select(DefectHistory)
+            .where(DefectHistory.defect_id == defect_id)
+            .order_by(DefectHistory.changed_at.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+    ).all()
 
     from schemas.defects import DefectHistoryEntryRead
 
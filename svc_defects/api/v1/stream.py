@@ -0,0 +1,118 @@
+import asyncio
+from typing import AsyncIterator, Optional, Tuple
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Header, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from api.deps import get_current_user_from_token
+from core.config import settings
+from core.deadline import remaining
+from core.events import format_event, latest_event_id, notifier, visible_events
+from db.database import get_session_factory
+
+# Отдельный роутер с тем же префиксом: подключается раньше defects.router,
+# иначе /defects/stream совпал бы с /defects/{defect_id}
+router = APIRouter(prefix="/defects", tags=["Defects"])
+
+
+def _parse_last_event_id(value: Optional[str]) -> Optional[int]:
+    if value is None or not value.strip().isdigit():
+        return None
+    return int(value.strip())
+
+
+async def _latest_event_id(session_factory: async_sessionmaker) -> int:
+    async with session_factory() as db:
+        return await latest_event_id(db)
+
+
+async def _fetch_events(
+    session_factory: async_sessionmaker, current_user: dict, after_id: int, project_id: Optional[UUID]
+) -> Tuple[list, int]:
+    async with session_factory() as db:
+        events, settled_through = await visible_events(
+            db, current_user, after_id, project_id, settings.SSE_BATCH_SIZE
+        )
+        return [format_event(event) for event in events], settled_through
+
+
+async def _event_stream(
+    session_factory: async_sessionmaker,
+    current_user: dict,
+    after_id: int,
+    project_id: Optional[UUID],
+) -> AsyncIterator[str]:
+    """
+    События журнала после after_id по мере их появления.
+
+    Поток просыпается сразу после commit'а с событиями в этом процессе и
+    раз в SSE_POLL_INTERVAL опрашивает журнал (события других инстансов);
+    при отсутствии событий раз в SSE_HEARTBEAT_INTERVAL отправляется
+    комментарий-heartbeat. Срок запроса (X-Request-Deadline), если он
+    задан, ограничивает время жизни потока. События отдаются в порядке
+    commit'ов: поток не обгоняет незакоммиченные транзакции (visible_events).
+    """
+    yield f"retry: {settings.SSE_RETRY_MS}\n\n"
+    loop = asyncio.get_running_loop()
+    last_write = loop.time()
+
+    while True:
+        left = remaining()
+        if left is not None and left <= 0:
+            return
+
+        version = notifier.version
+        chunks, settled_through = await _fetch_events(session_factory, current_user, after_id, project_id)
+        for chunk in chunks:
+            yield chunk
+        # Пачка из SSE_BATCH_SIZE id журнала: за ней, вероятно, есть ещё события
+        batch_full = settled_through - after_id >= settings.SSE_BATCH_SIZE
+        after_id = settled_through
+
+        now = loop.time()
+        if chunks:
+            last_write = now
+        if batch_full:
+            continue
+        if not chunks and now - last_write >= settings.SSE_HEARTBEAT_INTERVAL:
+            yield ": heartbeat\n\n"
+            last_write = now
+
+        timeout = min(settings.SSE_POLL_INTERVAL, settings.SSE_HEARTBEAT_INTERVAL - (now - last_write))
+        if left is not None:
+            timeout = min(timeout, left)
+        await notifier.wait(version, max(timeout, 0.0))
+
+
+@router.get("/stream")
+async def stream_defect_events(
+    project_id: Optional[UUID] = Query(None, description="Только события проекта"),
+    last_event_id: Optional[str] = Header(None, description="id последнего полученного события"),
+    current_user: dict = Depends(get_current_user_from_token),
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+):
+    """
+    Поток изменений дефектов (Server-Sent Events).
+
+    События: defect.created, defect.updated, defect.deleted, comment.created,
+    comment.updated, comment.deleted, attachment.created, attachment.deleted.
+    data — JSON с полями изменённого объекта (для defect.updated ещё и
+    список changed). Видимость та же, что у GET /defects/.
+
+    Без Last-Event-ID поток начинается с новых событий; с ним — продолжается
+    после указанного события (события хранятся DEFECT_EVENTS_RETENTION_HOURS).
+
+    Returns:
+        text/event-stream
+    """
+    after_id = _parse_last_event_id(last_event_id)
+    if after_id is None:
+        after_id = await _latest_event_id(session_factory)
+
+    return StreamingResponse(
+        _event_stream(session_factory, current_user, after_id, project_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -3,10 +3,13 @@ from typing import Optional
 
 from pydantic import AliasChoices, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from sqlalchemy.engine import URL
+from sqlalchemy.engine import URL, make_url
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Async драйверы приложения; Alembic продолжает работать через database_url (psycopg2)
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
 
 class Settings(BaseSettings):
     """Настройки приложения из .env файла"""
@@ -41,6 +44,29 @@ class Settings(BaseSettings):
     AUTH_SERVICE_URL: str
     PROJECTS_SERVICE_URL: str
 
+    # Трассировка (W3C traceparent): "none", "jsonl" (span'ы JSON-строками в
+    # TRACING_JSONL_PATH) или свой экспортёр "package.module:ClassName"
+    TRACING_EXPORTER: str = "none"
+    TRACING_JSONL_PATH: str = "/tmp/traces/svc_defects.jsonl"
+
+    # Доверенная внутренняя сеть: пользователь, уже проверенный gateway, принимается
+    # из подписанного X-Verified-Identity без повторного декодирования JWT, а
+    # проверенные токены кэшируются (LRU по дайджесту токена, до exp)
+    TRUSTED_IDENTITY_ENABLED: bool = False
+    VERIFIED_TOKEN_CACHE_SIZE: int = 10000
+
+    # SSE поток изменений дефектов (GET /defects/stream): heartbeat, опрос журнала
+    # (события других инстансов), размер пачки, пауза переподключения клиента (мс)
+    SSE_HEARTBEAT_INTERVAL: float = 15.0
+    SSE_POLL_INTERVAL: float = 5.0
+    SSE_BATCH_SIZE: int = 100
+    SSE_RETRY_MS: int = 3000
+    # Сколько секунд пропуск в id журнала считается незакоммиченной транзакцией:
+    # события после него ждут; по истечении пропуск считается откатом
+    SSE_COMMIT_GRACE: float = 10.0
+    # Сколько часов события хранятся для возобновления по Last-Event-ID
+    DEFECT_EVENTS_RETENTION_HOURS: float = 24.0
+
     model_config = SettingsConfigDict(
         env_file=str(BASE_DIR / ".env"), case_sensitive=True, extra="ignore"
     )
@@ -57,6 +83,15 @@ class Settings(BaseSettings):
             "DATABASE_URL или DB_USER/DB_PASSWORD/DB_NAME должны быть заданы"
         )
 
+    @property
+    def async_database_url(self) -> str:
+        """database_url с async драйвером (asyncpg) для AsyncEngine приложения."""
+        url = make_url(self.database_url)
+        backend = url.get_backend_name()
+        if backend in ASYNC_DRIVERS:
+            url = url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+        return url.render_as_string(hide_password=False)
+
     def _build_database_url_from_components(self) -> Optional[str]:
         if not all([self.DB_USER, self.DB_PASSWORD, self.DB_NAME]):
             return None
@@ -0,0 +1,241 @@
+import asyncio
+import json
+import threading
+from datetime import datetime, timedelta, UTC
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, event, func, inspect, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from models.attachments import Attachment
+from models.comments import Comment
+from models.defect_events import DefectEvent
+from models.defects import Defects
+
+# Поля дефекта, передаваемые в событиях defect.*
+_DEFECT_FIELDS = ("id", "project_id", "title", "status", "priority", "assignee_id", "due_date", "location")
+
+
+class EventNotifier:
+    """
+    Будит SSE потоки этого процесса после commit'а, записавшего события.
+
+    version растёт при каждом уведомлении: поток запоминает её до чтения
+    журнала и не засыпает, если событие пришло между чтением и ожиданием.
+    События других инстансов сервиса потоки находят опросом журнала.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self._waiters: Set[asyncio.Future] = set()
+        self._lock = threading.Lock()
+
+    def notify(self) -> None:
+        with self._lock:
+            self.version += 1
+            waiters = list(self._waiters)
+        for future in waiters:
+            future.get_loop().call_soon_threadsafe(_wake, future)
+
+    async def wait(self, version: int, timeout: float) -> None:
+        """Ждёт уведомления после version, но не дольше timeout секунд."""
+        future = asyncio.get_running_loop().create_future()
+        with self._lock:
+            if self.version != version:
+                return
+            self._waiters.add(future)
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                self._waiters.discard(future)
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+notifier = EventNotifier()
+
+
+def _record(connection, target: Any, event_type: str, defect: Any, data: Dict[str, Any]) -> None:
+    """Пишет событие в журнал в той же транзакции, что и само изменение."""
+    connection.execute(
+        DefectEvent.__table__.insert().values(
+            event_type=event_type,
+            defect_id=defect.id,
+            project_id=defect.project_id,
+            author_id=defect.author_id,
+            assignee_id=defect.assignee_id,
+            data=json.dumps(data, default=str),
+            created_at=datetime.now(UTC),
+        )
+    )
+    session = Session.object_session(target)
+    if session is not None:
+        session.info["defect_events_written"] = True
+
+
+def _defect_row(connection, defect_id: UUID):
+    table = Defects.__table__
+    return connection.execute(
+        select(table.c.id, table.c.project_id, table.c.author_id, table.c.assignee_id).where(table.c.id == defect_id)
+    ).first()
+
+
+def _defect_data(defect: Defects) -> Dict[str, Any]:
+    return {field: getattr(defect, field) for field in _DEFECT_FIELDS}
+
+
+@event.listens_for(Defects, "after_insert")
+def _defect_created(mapper, connection, target: Defects) -> None:
+    _record(connection, target, "defect.created", target, _defect_data(target))
+
+
+@event.listens_for(Defects, "after_update")
+def _defect_updated(mapper, connection, target: Defects) -> None:
+    state = inspect(target)
+    changed = [
+        column.key
+        for column in state.mapper.column_attrs
+        if column.key != "updated_at" and state.attrs[column.key].history.has_changes()
+    ]
+    if changed:
+        _record(connection, target, "defect.updated", target, {**_defect_data(target), "changed": changed})
+
+
+@event.listens_for(Defects, "after_delete")
+def _defect_deleted(mapper, connection, target: Defects) -> None:
+    _record(connection, target, "defect.deleted", target, {"id": target.id, "project_id": target.project_id})
+
+
+def _listen_child(model, mapper_event: str, event_type: str, fields: tuple) -> None:
+    """Событие комментария/вложения; видимость и проект берутся из дефекта."""
+
+    def listener(mapper, connection, target) -> None:
+        defect = _defect_row(connection, target.defect_id)
+        if defect is not None:
+            _record(connection, target, event_type, defect, {field: getattr(target, field) for field in fields})
+
+    event.listen(model, mapper_event, listener)
+
+
+_COMMENT_FIELDS = ("id", "defect_id", "author_id")
+_ATTACHMENT_FIELDS = ("id", "defect_id", "file_name", "file_size", "content_type")
+
+_listen_child(Comment, "after_insert", "comment.created", _COMMENT_FIELDS)
+_listen_child(Comment, "after_update", "comment.updated", _COMMENT_FIELDS)
+_listen_child(Comment, "after_delete", "comment.deleted", _COMMENT_FIELDS)
+_listen_child(Attachment, "after_insert", "attachment.created", _ATTACHMENT_FIELDS)
+_listen_child(Attachment, "after_delete", "attachment.deleted", _ATTACHMENT_FIELDS)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_streams(session: Session) -> None:
+    if session.info.pop("defect_events_written", False):
+        notifier.notify()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_events(session: Session) -> None:
+    session.info.pop("defect_events_written", None)
+
+
+async def _settled_through(db: AsyncSession, after_id: int, limit: Optional[int] = None) -> int:
+    """
+    Наибольший id, до которого (после after_id) журнал уже не изменится.
+
+    id выдаётся при INSERT, а видимым событие становится при commit: если
+    транзакция с событием 41 ещё не закоммичена, а 42 уже видно, отдать 42
+    значит потерять 41. Поэтому граница останавливается перед пропуском в id,
+    пока следующее за ним событие моложе SSE_COMMIT_GRACE; более старый
+    пропуск считается откатом (id последовательности при откате сгорает).
+    """
+    cutoff = datetime.now(UTC) - timedelta(seconds=settings.SSE_COMMIT_GRACE)
+    query = (
+        select(DefectEvent.id, (DefectEvent.created_at < cutoff).label("settled"))
+        .where(DefectEvent.id > after_id)
+        .order_by(DefectEvent.id)
+    )
+    if limit is not None:
+        query = query.limit(limit)
+
+    settled_through = after_id
+    for row in await db.execute(query):
+        if row.id != settled_through + 1 and not row.settled:
+            break
+        settled_through = row.id
+    return settled_through
+
+
+async def latest_event_id(db: AsyncSession) -> int:
+    """Начало потока без Last-Event-ID: последнее событие, перед которым нет незакоммиченных."""
+    cutoff = datetime.now(UTC) - timedelta(seconds=settings.SSE_COMMIT_GRACE)
+    settled = await db.scalar(select(func.max(DefectEvent.id)).where(DefectEvent.created_at < cutoff)) or 0
+    return await _settled_through(db, settled)
+
+
+async def visible_events(
+    db: AsyncSession,
+    current_user: dict,
+    after_id: int,
+    project_id: Optional[UUID] = None,
+    limit: int = 100,
+) -> Tuple[List[DefectEvent], int]:
+    """
+    События после after_id, которые пользователь видит в GET /defects/, и
+    новая позиция потока.
+
+    Отдаются только события до границы _settled_through (не больше limit id
+    журнала), так что событие, закоммиченное позже события с большим id, не
+    пропускается. Позиция — эта граница, даже если события до неё скрыты.
+
+    Права доступа те же, что у списка дефектов:
+    - ENGINEER: дефекты, где он автор или исполнитель
+    - SUPERVISOR и CUSTOMER: дефекты, где он автор
+    - MANAGER и ADMIN: все дефекты
+    """
+    settled_through = await _settled_through(db, after_id, limit)
+    if settled_through == after_id:
+        return [], after_id
+
+    query = select(DefectEvent).where(DefectEvent.id > after_id, DefectEvent.id <= settled_through)
+
+    user_role = current_user["role"]
+    user_id = current_user["user_id"]
+    if user_role == "ENGINEER":
+        query = query.where(or_(DefectEvent.author_id == user_id, DefectEvent.assignee_id == user_id))
+    elif user_role in ["SUPERVISOR", "CUSTOMER"]:
+        query = query.where(DefectEvent.author_id == user_id)
+
+    if project_id:
+        query = query.where(DefectEvent.project_id == project_id)
+
+    events = list((await db.scalars(query.order_by(DefectEvent.id))).all())
+    return events, settled_through
+
+
+def format_event(defect_event: DefectEvent) -> str:
+    """Событие в формате text/event-stream."""
+    return f"id: {defect_event.id}\nevent: {defect_event.event_type}\ndata: {defect_event.data}\n\n"
+
+
+async def prune_events(session_factory: async_sessionmaker, older_than: datetime) -> int:
+    async with session_factory() as db:
+        result = await db.execute(delete(DefectEvent).where(DefectEvent.created_at < older_than))
+        await db.commit()
+    return result.rowcount
+
+
+async def prune_events_periodically(session_factory: async_sessionmaker, interval: float = 3600.0) -> None:
+    """Раз в interval секунд удаляет события старше DEFECT_EVENTS_RETENTION_HOURS."""
+    while True:
+        await asyncio.sleep(interval)
+        older_than = datetime.now(UTC) - timedelta(hours=settings.DEFECT_EVENTS_RETENTION_HOURS)
+        await prune_events(session_factory, older_than)
@@ -0,0 +1,32 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(created_at: datetime, item_id: UUID) -> str:
+    """Непрозрачный курсор keyset-пагинации: позиция (created_at, id) последней записи страницы."""
+    raw = json.dumps([created_at.isoformat(), str(item_id)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Позиция (created_at, id) из курсора encode_cursor.
+
+    Raises:
+        HTTPException 400: Если курсор повреждён
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, item_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), UUID(item_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
@@ -1,32 +1,66 @@
-from typing import Generator
+from typing import AsyncGenerator
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
 
 from core.config import settings
+from core.deadline import statement_timeout_ms
+from core.tracing import instrument_engine
 
-# Создаем движок SQLAlchemy
-engine = create_engine(
-    settings.database_url,
+# Создаем async движок SQLAlchemy (asyncpg): запросы не блокируют event loop
+engine = create_async_engine(
+    settings.async_database_url,
     pool_pre_ping=True,  # Проверка соединения перед использованием
     echo=False,  # Для production: False, для debug: True
 )
 
-# Фабрика сессий
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# SQL запросы записываются span'ами трассировки
+instrument_engine(engine.sync_engine)
 
 
-def get_db() -> Generator:
+class DefectsSession(Session):
+    """Синхронная сессия внутри AsyncSession: на неё подписаны события сессии."""
+
+
+# Фабрика сессий. expire_on_commit=False: после commit атрибуты не
+# перечитываются неявно (ленивая загрузка в async коде невозможна)
+AsyncSessionLocal = async_sessionmaker(
+    engine,
+    class_=AsyncSession,
+    sync_session_class=DefectsSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+@event.listens_for(DefectsSession, "after_begin")
+def _apply_statement_timeout(session, transaction, connection) -> None:
+    """
+    Ограничивает запросы транзакции оставшимся сроком HTTP запроса
+    (X-Request-Deadline): Postgres сам прерывает запрос, который не успевает.
+    """
+    timeout_ms = statement_timeout_ms()
+    if timeout_ms is not None and connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout_ms}")
+
+
+def get_session_factory() -> async_sessionmaker:
+    """
+    Dependency для долгих ответов (SSE), которые открывают короткую сессию
+    на каждое обращение к БД, а не держат одну на всё соединение.
+    """
+    return AsyncSessionLocal
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency для получения DB сессии в FastAPI эндпоинтах.
 
     Использование:
         @app.get("/defects")
-        def get_defects(db: Session = Depends(get_db)):
+        async def get_defects(db: AsyncSession = Depends(get_db)):
             ...
     """
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -1,4 +1,5 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 import uvicorn
 from fastapi import FastAPI, HTTPException, Request, status
@@ -6,8 +7,12 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
-from api.v1 import attachments, comments, defects
+from api.v1 import attachments, comments, defects, stream
 from core.config import settings
+from core.deadline import DeadlineMiddleware
+from core.events import prune_events_periodically
+from core.tracing import TracingMiddleware, configure_tracing
+from db.database import AsyncSessionLocal, engine
 
 
 @asynccontextmanager
@@ -15,8 +20,15 @@ async def lifespan(app: FastAPI):
     """Lifespan events 4;O FastAPI"""
     # Startup
     print(f"Starting svc_defects on {settings.APP_HOST}:{settings.APP_PORT}")
+    configure_tracing("svc_defects")
+    # Old events of the SSE stream journal are pruned in the background
+    pruning = asyncio.create_task(prune_events_periodically(AsyncSessionLocal))
     yield
     # Shutdown
+    pruning.cancel()
+    with suppress(asyncio.CancelledError):
+        await pruning
+    await engine.dispose()
     print("Shutting down svc_defects")
 
 
@@ -36,6 +48,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request deadline from the gateway (X-Request-Deadline)
+app.add_middleware(DeadlineMiddleware)
+
+# Request tracing (W3C traceparent)
+app.add_middleware(TracingMiddleware)
+
 
 # Exception handlers 4;O 548=>3> D>@<0B0 >B25B>2
 @app.exception_handler(RequestValidationError)
@@ -63,6 +81,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
             "success": False,
             "error": {"code": "HTTP_ERROR", "message": exc.detail},
         },
+        headers=exc.headers,
     )
 
 
@@ -79,6 +98,8 @@ async def general_exception_handler(request: Request, exc: Exception):
 
 
 # >4:;NG5=85 @>CB5@>2
+# /defects/stream is registered before /defects/{defect_id}
+app.include_router(stream.router, prefix="/api/v1")
 app.include_router(defects.router, prefix="/api/v1")
 app.include_router(comments.router, prefix="/api/v1")
 app.include_router(attachments.router, prefix="/api/v1")
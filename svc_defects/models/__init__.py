@@ -2,6 +2,7 @@
 
 from .attachments import Attachment
 from .comments import Comment
+from .defect_events import DefectEvent
 from .defect_history import DefectHistory
 from .defects import Base, DefectPriority, Defects, DefectStatus
 
@@ -12,5 +13,6 @@ __all__ = [
     "DefectPriority",
     "Comment",
     "DefectHistory",
+    "DefectEvent",
     "Attachment",
 ]
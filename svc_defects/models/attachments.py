@@ -3,7 +3,7 @@ from uuid import uuid4
 
 from sqlalchemy import Column, DateTime, ForeignKey, LargeBinary, String, Integer
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import backref, relationship
 
 from .defects import Base
 
@@ -25,4 +25,4 @@ class Attachment(Base):
     uploaded_by_id = Column(UUID(as_uuid=True), nullable=False)
     uploaded_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(UTC))
 
-    defect = relationship("Defects", backref="attachments")
+    defect = relationship("Defects", backref=backref("attachments", passive_deletes=True))
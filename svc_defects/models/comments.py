@@ -3,7 +3,7 @@ from uuid import uuid4
 
 from sqlalchemy import Column, DateTime, ForeignKey, Text
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import backref, relationship
 
 from .defects import Base
 
@@ -19,4 +19,4 @@ class Comment(Base):
     text = Column(Text, nullable=False)
     created_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(UTC))
 
-    defect = relationship("Defects", backref="comments")
+    defect = relationship("Defects", backref=backref("comments", passive_deletes=True))
@@ -0,0 +1,28 @@
+from datetime import datetime, UTC
+
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+
+from .defects import Base
+
+
+class DefectEvent(Base):
+    """
+    SQLAlchemy-модель журнала изменений дефектов для SSE потока.
+
+    id растёт монотонно и служит id события (Last-Event-ID); author_id и
+    assignee_id дефекта копируются в событие, чтобы проверять видимость без
+    JOIN и после удаления дефекта.
+    """
+
+    __tablename__ = "defect_events"
+
+    # BIGSERIAL в Postgres; в SQLite автоинкремент есть только у INTEGER PRIMARY KEY
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    event_type = Column(String(50), nullable=False)
+    defect_id = Column(UUID(as_uuid=True), nullable=False)
+    project_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    author_id = Column(UUID(as_uuid=True), nullable=False)
+    assignee_id = Column(UUID(as_uuid=True), nullable=True)
+    data = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(UTC), index=True)
@@ -3,7 +3,7 @@ from uuid import uuid4
 
 from sqlalchemy import Column, DateTime, ForeignKey, String
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import backref, relationship
 
 from .defects import Base
 
@@ -21,4 +21,4 @@ class DefectHistory(Base):
     new_value = Column(String(255), nullable=True)
     changed_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(UTC))
 
-    defect = relationship("Defects", backref="history_entries")
+    defect = relationship("Defects", backref=backref("history_entries", passive_deletes=True))
@@ -2,7 +2,7 @@ from datetime import date, datetime, UTC
 from enum import Enum
 from uuid import uuid4
 
-from sqlalchemy import Column, Date, DateTime, Enum as SAEnum, String, Text
+from sqlalchemy import Column, Date, DateTime, Enum as SAEnum, Index, String, Text, bindparam
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import declarative_base
 
@@ -26,6 +26,10 @@ class DefectStatus(str, Enum):
     CANCELED = "CANCELED"
 
 
+# Статусы, в которых дефект ещё в работе
+OPEN_DEFECT_STATUSES = (DefectStatus.NEW, DefectStatus.IN_PROGRESS, DefectStatus.ON_REVIEW)
+
+
 Base = declarative_base()
 
 
@@ -35,14 +39,49 @@ class Defects(Base):
     __tablename__ = "defects"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
-    project_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    project_id = Column(UUID(as_uuid=True), nullable=False)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=False)
     priority = Column(SAEnum(DefectPriority, name="defect_priority"), nullable=False)
     status = Column(SAEnum(DefectStatus, name="defect_status"), nullable=False)
-    author_id = Column(UUID(as_uuid=True), nullable=False, index=True)
-    assignee_id = Column(UUID(as_uuid=True), nullable=True, index=True)
+    author_id = Column(UUID(as_uuid=True), nullable=False)
+    assignee_id = Column(UUID(as_uuid=True), nullable=True)
     due_date = Column(Date, nullable=True)
     location = Column(String(255), nullable=True)
     created_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(UTC))
     updated_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(UTC))
+
+
+def open_status_clause():
+    """
+    status IN (<открытые статусы>) со значениями прямо в тексте SQL: условие
+    запроса совпадает с предикатом частичных индексов, и планировщик может их
+    использовать (с bind-параметрами совпадение не доказуемо).
+    """
+    values = [defect_status.value for defect_status in OPEN_DEFECT_STATUSES]
+    return Defects.status.in_(bindparam("open_statuses", values, expanding=True, literal_execute=True))
+
+
+# Индексы списка дефектов (GET /defects/): фильтры + сортировка (created_at, id) DESC,
+# так что страница читается из индекса без сортировки. Одиночные индексы
+# project_id/author_id/assignee_id заменены составными с тем же первым столбцом.
+_LIST_ORDER = (Defects.created_at.desc(), Defects.id.desc())
+
+Index("ix_defects_created_at_id", *_LIST_ORDER)
+Index("ix_defects_project_created", Defects.project_id, *_LIST_ORDER)
+Index("ix_defects_project_status_created", Defects.project_id, Defects.status, *_LIST_ORDER)
+Index("ix_defects_project_priority_created", Defects.project_id, Defects.priority, *_LIST_ORDER)
+Index("ix_defects_status_created", Defects.status, *_LIST_ORDER)
+Index("ix_defects_author_created", Defects.author_id, *_LIST_ORDER)
+Index("ix_defects_assignee_created", Defects.assignee_id, *_LIST_ORDER)
+
+# Диапазоны дат (created_from/created_to читают индексы выше по created_at)
+Index("ix_defects_updated_at", Defects.updated_at)
+Index("ix_defects_due_date", Defects.due_date)
+
+# Частичные индексы открытых дефектов (is_open=true): закрытые, которых со
+# временем большинство, в них не попадают
+_OPEN = Defects.status.in_(OPEN_DEFECT_STATUSES)
+
+Index("ix_defects_open_project_created", Defects.project_id, *_LIST_ORDER, postgresql_where=_OPEN, sqlite_where=_OPEN)
+Index("ix_defects_open_assignee_created", Defects.assignee_id, *_LIST_ORDER, postgresql_where=_OPEN, sqlite_where=_OPEN)
@@ -1,5 +1,5 @@
 from datetime import date, datetime
-from typing import Optional
+from typing import Dict, Optional
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -148,3 +148,18 @@ class DefectHistoryEntryRead(DefectHistoryEntryBase):
     changed_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# --------- Статистика ---------
+
+
+class DefectStatsRead(BaseModel):
+    """Агрегированная статистика дефектов (GET /defects/stats)."""
+
+    total: int
+    by_status: Dict[DefectStatus, int]
+    by_priority: Dict[DefectPriority, int]
+    by_project: Dict[UUID, int]
+    open: int
+    closed: int
+    average_close_time_days: Optional[float] = None
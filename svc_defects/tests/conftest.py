@@ -4,28 +4,32 @@ import sys
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 
 SERVICE_ROOT = Path(__file__).resolve().parents[1]
 if str(SERVICE_ROOT) not in sys.path:
     sys.path.insert(0, str(SERVICE_ROOT))
 
 try:
-    from svc_defects.db.database import get_db  # type: ignore
+    from svc_defects.db.database import get_db, get_session_factory  # type: ignore
     from svc_defects.main import app  # type: ignore
     from svc_defects.models.defects import Base  # type: ignore
     import svc_defects.models.comments  # noqa: F401
     import svc_defects.models.attachments  # noqa: F401
     import svc_defects.models.defect_history  # noqa: F401
+    import svc_defects.models.defect_events  # noqa: F401
     from svc_defects.api import deps as defects_deps  # type: ignore
 except ModuleNotFoundError:
-    from db.database import get_db
+    from db.database import get_db, get_session_factory
     from main import app
     from models.defects import Base
     import models.comments  # noqa: F401
     import models.attachments  # noqa: F401
     import models.defect_history  # noqa: F401
+    import models.defect_events  # noqa: F401
     from api import deps as defects_deps
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test_svc_defects.db"
@@ -34,10 +38,19 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The app runs on AsyncSession: aiosqlite over the same file stands in for asyncpg.
+# NullPool, because every TestClient runs the app in a new event loop.
+async_engine = create_async_engine(
+    "sqlite+aiosqlite:///./test_svc_defects.db", poolclass=NullPool
+)
+TestingAsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
 
 @pytest.fixture(scope="function")
 def db_session() -> Generator[Session, None, None]:
-    """Provide a clean SQLite session for each test."""
+    """Provide a clean SQLite session for each test (seeding and assertions)."""
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
     session = TestingSessionLocal()
@@ -51,18 +64,31 @@ def db_session() -> Generator[Session, None, None]:
 def client(db_session: Session):
     """FastAPI test client with DB dependency overridden."""
 
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
+    async def override_get_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: TestingAsyncSessionLocal
 
     with TestClient(app) as test_client:
         yield test_client
 
     app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_session_factory, None)
+
+
+@pytest.fixture
+def executed_sql():
+    """(statement, parameters) of every SQL statement the app runs during the test."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(async_engine.sync_engine, "before_cursor_execute", record)
 
 
 @pytest.fixture(autouse=True)
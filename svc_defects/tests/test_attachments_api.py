@@ -0,0 +1,166 @@
+from uuid import uuid4
+
+import pytest
+from fastapi import status
+
+try:
+    from svc_defects.api import deps  # type: ignore
+    from svc_defects.api.v1 import attachments as attachments_router  # type: ignore
+    from svc_defects.main import app  # type: ignore
+    from svc_defects.models.attachments import Attachment  # type: ignore
+    from svc_defects.models.defects import (  # type: ignore
+        DefectPriority,
+        DefectStatus,
+        Defects,
+    )
+except ModuleNotFoundError:
+    from api import deps
+    from api.v1 import attachments as attachments_router
+    from main import app
+    from models.attachments import Attachment
+    from models.defects import (
+        DefectPriority,
+        DefectStatus,
+        Defects,
+    )
+
+
+def _set_current_user(role: str, user_id):
+    app.dependency_overrides[deps.get_current_user_from_token] = (
+        lambda: {"user_id": user_id, "role": role}
+    )
+
+
+@pytest.fixture
+def defect(db_session):
+    defect = Defects(
+        project_id=uuid4(),
+        title="Leaking roof",
+        description="Water on level 3",
+        priority=DefectPriority.MEDIUM,
+        status=DefectStatus.NEW,
+        author_id=uuid4(),
+    )
+    db_session.add(defect)
+    db_session.commit()
+    return defect
+
+
+def test_upload_attachment_accepts_defect_id_in_query(client, db_session, defect):
+    _set_current_user("ENGINEER", uuid4())
+
+    response = client.post(
+        f"/api/v1/attachments/?defect_id={defect.id}",
+        files={"file": ("crack.png", b"\x89PNG" + b"0" * 100, "image/png")},
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    stored = db_session.query(Attachment).filter(Attachment.defect_id == defect.id).one()
+    assert stored.file_size == 104
+
+
+def test_upload_attachment_rejects_oversized_file(client, db_session, defect, monkeypatch):
+    monkeypatch.setattr(attachments_router, "MAX_FILE_SIZE", 1024)
+    monkeypatch.setattr(attachments_router, "UPLOAD_CHUNK_SIZE", 256)
+    _set_current_user("ENGINEER", uuid4())
+
+    response = client.post(
+        "/api/v1/attachments/",
+        data={"defect_id": str(defect.id)},
+        files={"file": ("big.png", b"0" * 2048, "image/png")},
+    )
+
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    assert db_session.query(Attachment).count() == 0
+
+
+@pytest.fixture
+def attachment(db_session, defect):
+    attachment = Attachment(
+        defect_id=defect.id,
+        file_name="plan.pdf",
+        file_data=bytes(range(256)) * 4,
+        file_size=1024,
+        content_type="application/pdf",
+        uploaded_by_id=uuid4(),
+    )
+    db_session.add(attachment)
+    db_session.commit()
+    return attachment
+
+
+def test_download_attachment_serves_byte_range(client, attachment):
+    _set_current_user("CUSTOMER", uuid4())
+
+    full = client.get(f"/api/v1/attachments/{attachment.id}/download")
+    assert full.status_code == status.HTTP_200_OK
+    assert full.headers["accept-ranges"] == "bytes"
+
+    response = client.get(
+        f"/api/v1/attachments/{attachment.id}/download",
+        headers={"Range": "bytes=10-19", "If-Range": full.headers["etag"]},
+    )
+
+    assert response.status_code == status.HTTP_206_PARTIAL_CONTENT
+    assert response.content == bytes(range(10, 20))
+    assert response.headers["content-range"] == "bytes 10-19/1024"
+
+    suffix = client.get(
+        f"/api/v1/attachments/{attachment.id}/download", headers={"Range": "bytes=-4"}
+    )
+    assert suffix.content == bytes(range(252, 256))
+
+    unsatisfiable = client.get(
+        f"/api/v1/attachments/{attachment.id}/download", headers={"Range": "bytes=5000-"}
+    )
+    assert unsatisfiable.status_code == status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+    assert unsatisfiable.headers["content-range"] == "bytes */1024"
+
+
+@pytest.mark.parametrize("range_header", ["bytes=abc-5", "bytes=5-abc", "bytes=-"])
+def test_download_attachment_ignores_malformed_range(client, attachment, range_header):
+    _set_current_user("CUSTOMER", uuid4())
+
+    response = client.get(f"/api/v1/attachments/{attachment.id}/download", headers={"Range": range_header})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content == attachment.file_data
+    assert "content-range" not in response.headers
+
+
+def test_download_empty_attachment_rejects_suffix_range(client, db_session, defect):
+    empty = Attachment(
+        defect_id=defect.id,
+        file_name="empty.txt",
+        file_data=b"",
+        file_size=0,
+        content_type="text/plain",
+        uploaded_by_id=uuid4(),
+    )
+    db_session.add(empty)
+    db_session.commit()
+    _set_current_user("CUSTOMER", uuid4())
+
+    response = client.get(f"/api/v1/attachments/{empty.id}/download", headers={"Range": "bytes=-5"})
+
+    assert response.status_code == status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+    assert response.headers["content-range"] == "bytes */0"
+
+
+def test_download_attachment_honours_conditional_headers(client, attachment):
+    _set_current_user("ENGINEER", uuid4())
+
+    first = client.get(f"/api/v1/attachments/{attachment.id}/download")
+    etag = first.headers["etag"]
+
+    by_etag = client.get(
+        f"/api/v1/attachments/{attachment.id}/download", headers={"If-None-Match": etag}
+    )
+    assert by_etag.status_code == status.HTTP_304_NOT_MODIFIED
+    assert by_etag.content == b""
+
+    by_date = client.get(
+        f"/api/v1/attachments/{attachment.id}/download",
+        headers={"If-Modified-Since": first.headers["last-modified"]},
+    )
+    assert by_date.status_code == status.HTTP_304_NOT_MODIFIED
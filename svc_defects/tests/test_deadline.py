@@ -0,0 +1,39 @@
+import time
+
+import pytest
+from fastapi import HTTPException
+
+try:
+    from svc_defects.core import deadline  # type: ignore
+except ModuleNotFoundError:
+    from core import deadline
+
+
+def test_expired_deadline_is_rejected_before_endpoint(client):
+    response = client.get("/api/v1/defects/", headers={"X-Request-Deadline": f"{time.time() - 1:.3f}"})
+
+    assert response.status_code == 504
+    assert response.json()["error"]["code"] == "DEADLINE_EXCEEDED"
+
+
+def test_outgoing_calls_use_remaining_budget():
+    token = deadline._deadline.set(time.time() + 2.0)
+    try:
+        assert 1.0 < deadline.deadline_timeout(5.0) <= 2.0
+        assert deadline.deadline_timeout(0.5) == 0.5
+        assert 1000 < deadline.statement_timeout_ms() <= 2000
+        assert "X-Request-Deadline" in deadline.deadline_headers()
+    finally:
+        deadline._deadline.reset(token)
+
+    token = deadline._deadline.set(time.time() - 1.0)
+    try:
+        with pytest.raises(HTTPException) as exc:
+            deadline.deadline_timeout(5.0)
+        assert exc.value.status_code == 504
+        assert deadline.statement_timeout_ms() == 1
+    finally:
+        deadline._deadline.reset(token)
+
+    assert deadline.deadline_timeout(5.0) == 5.0
+    assert deadline.deadline_headers() == {}
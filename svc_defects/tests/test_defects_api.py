@@ -1,3 +1,4 @@
+from datetime import UTC, datetime, timedelta
 from uuid import uuid4
 
 import pytest
@@ -86,3 +87,172 @@ def test_create_defect_persists_and_tracks_history(client, db_session):
     )
     assert len(history) == 1
     assert history[0].field_name == "created"
+
+
+def test_update_comment_and_delete_defect_through_async_session(client, db_session):
+    current_user = uuid4()
+    _set_current_user("ENGINEER", current_user)
+    headers = {"Authorization": "Bearer stub-token"}
+    created = client.post(
+        "/api/v1/defects/",
+        json={
+            "project_id": str(uuid4()),
+            "title": "Broken window",
+            "description": "Glass cracked",
+            "priority": DefectPriority.LOW.value,
+            "author_id": str(current_user),
+        },
+        headers=headers,
+    ).json()["data"]
+    defect_url = f"/api/v1/defects/{created['id']}"
+
+    updated = client.patch(
+        defect_url,
+        json={"status": DefectStatus.IN_PROGRESS.value, "priority": DefectPriority.HIGH.value},
+        headers=headers,
+    )
+    assert updated.status_code == status.HTTP_200_OK
+    assert updated.json()["data"]["status"] == DefectStatus.IN_PROGRESS.value
+
+    history = client.get(f"{defect_url}/history", headers=headers).json()["data"]
+    assert sorted(entry["field_name"] for entry in history) == ["created", "priority", "status"]
+
+    comment = client.post(
+        "/api/v1/comments/", json={"defect_id": created["id"], "author_id": str(current_user), "text": "On it"}
+    )
+    assert comment.status_code == status.HTTP_201_CREATED
+    comments = client.get(f"/api/v1/comments/defects/{created['id']}/comments").json()["data"]
+    assert [c["text"] for c in comments] == ["On it"]
+
+    listed = client.get("/api/v1/defects/", params={"status": DefectStatus.IN_PROGRESS.value}).json()["data"]
+    assert [d["id"] for d in listed] == [created["id"]]
+
+    assert client.delete(defect_url).status_code == status.HTTP_200_OK
+    assert client.get(defect_url).status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_list_defects_pages_with_cursor(client, db_session):
+    current_user = uuid4()
+    project_id = uuid4()
+    same_time = datetime(2024, 5, 1, 12, 0, tzinfo=UTC)
+    for index, created_at in enumerate(
+        [same_time, same_time, same_time - timedelta(days=1), same_time + timedelta(days=1), same_time]
+    ):
+        db_session.add(
+            Defects(
+                project_id=project_id if index != 4 else uuid4(),
+                title=f"Defect {index}",
+                description="Paged",
+                priority=DefectPriority.LOW,
+                status=DefectStatus.NEW,
+                author_id=current_user,
+                created_at=created_at,
+            )
+        )
+    db_session.commit()
+    _set_current_user("ENGINEER", current_user)
+
+    params = {"project_id": str(project_id), "limit": 3}
+    everything = client.get("/api/v1/defects/", params={**params, "limit": 10}).json()
+    assert everything["next_cursor"] is None
+
+    pages, cursors = [], []
+    cursor = None
+    while True:
+        page = client.get("/api/v1/defects/", params={**params, **({"after": cursor} if cursor else {})}).json()
+        pages.append([d["id"] for d in page["data"]])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+        cursors.append(cursor)
+
+    assert [len(page) for page in pages] == [3, 1]
+    assert sum(pages, []) == [d["id"] for d in everything["data"]]
+    assert everything["data"][0]["title"] == "Defect 3"
+    assert everything["data"][-1]["title"] == "Defect 2"
+
+    invalid = client.get("/api/v1/defects/", params={"after": "not-a-cursor"})
+    assert invalid.status_code == status.HTTP_400_BAD_REQUEST
+    combined = client.get("/api/v1/defects/", params={"after": cursors[0], "skip": 1})
+    assert combined.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_defect_stats_aggregates_with_filters_and_role_scope(client, db_session):
+    engineer = uuid4()
+    project_a, project_b = uuid4(), uuid4()
+    created = datetime(2024, 5, 1, tzinfo=UTC)
+    rows = [
+        (project_a, DefectStatus.NEW, DefectPriority.HIGH, engineer, None),
+        (project_a, DefectStatus.CLOSED, DefectPriority.HIGH, engineer, 2),
+        (project_a, DefectStatus.CLOSED, DefectPriority.LOW, uuid4(), 4),
+        (project_b, DefectStatus.IN_PROGRESS, DefectPriority.LOW, uuid4(), None),
+        (project_b, DefectStatus.CANCELED, DefectPriority.LOW, uuid4(), None),
+    ]
+    for project_id, defect_status, priority, author_id, closed_after_days in rows:
+        db_session.add(
+            Defects(
+                project_id=project_id,
+                title="Stats",
+                description="Aggregated",
+                priority=priority,
+                status=defect_status,
+                author_id=author_id,
+                created_at=created,
+                updated_at=created + timedelta(days=closed_after_days or 0),
+            )
+        )
+    db_session.commit()
+
+    _set_current_user("MANAGER", uuid4())
+    stats = client.get("/api/v1/defects/stats").json()["data"]
+    assert stats["total"] == 5
+    assert stats["by_status"] == {"NEW": 1, "CLOSED": 2, "IN_PROGRESS": 1, "CANCELED": 1}
+    assert stats["by_priority"] == {"HIGH": 2, "LOW": 3}
+    assert stats["by_project"] == {str(project_a): 3, str(project_b): 2}
+    assert (stats["open"], stats["closed"]) == (2, 2)
+    assert stats["average_close_time_days"] == pytest.approx(3.0)
+
+    by_project = client.get("/api/v1/defects/stats", params={"project_id": str(project_b)}).json()["data"]
+    assert by_project["by_project"] == {str(project_b): 2}
+    assert by_project["average_close_time_days"] is None
+
+    _set_current_user("ENGINEER", engineer)
+    own = client.get("/api/v1/defects/stats", params={"priority": "HIGH"}).json()["data"]
+    assert (own["total"], own["open"], own["closed"]) == (2, 1, 1)
+    assert own["average_close_time_days"] == pytest.approx(2.0)
+
+
+def test_list_defects_filters_by_date_ranges(client, db_session):
+    author_id = uuid4()
+    started = datetime(2024, 3, 1, tzinfo=UTC)
+    for day in range(6):
+        db_session.add(
+            Defects(
+                project_id=uuid4(),
+                title=f"Day {day}",
+                description="Dated",
+                priority=DefectPriority.MEDIUM,
+                status=DefectStatus.NEW,
+                author_id=author_id,
+                due_date=(started + timedelta(days=10 + day)).date(),
+                created_at=started + timedelta(days=day),
+                updated_at=started + timedelta(days=day + 2),
+            )
+        )
+    db_session.commit()
+    _set_current_user("MANAGER", uuid4())
+
+    def titles(**params):
+        response = client.get("/api/v1/defects/", params=params)
+        assert response.status_code == status.HTTP_200_OK
+        return sorted(item["title"] for item in response.json()["data"])
+
+    # created_to is exclusive, naive and offset timestamps are compared in UTC
+    assert titles(created_from="2024-03-02", created_to="2024-03-04") == ["Day 1", "Day 2"]
+    assert titles(created_from="2024-03-05T03:00:00+03:00") == ["Day 4", "Day 5"]
+    assert titles(updated_to="2024-03-05") == ["Day 0", "Day 1"]
+    assert titles(updated_from="2024-03-08") == ["Day 5"]
+    assert titles(due_after="2024-03-14", due_before="2024-03-15") == ["Day 3", "Day 4"]
+
+    stats = client.get("/api/v1/defects/stats", params={"created_from": "2024-03-04"}).json()["data"]
+    assert stats["total"] == 3
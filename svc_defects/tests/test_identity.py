@@ -0,0 +1,82 @@
+import base64
+import hashlib
+import hmac
+import time
+
+import pytest
+from fastapi import HTTPException
+
+try:
+    from svc_defects.core import identity  # type: ignore
+    from svc_defects.core.config import settings  # type: ignore
+except ModuleNotFoundError:
+    from core import identity
+    from core.config import settings
+
+
+USER_ID = "6f1c2a8e-3b4d-4e5f-8a9b-0c1d2e3f4a5b"
+
+
+def _signed(token: str, exp: int, role: str = "ENGINEER") -> str:
+    """Header value as the gateway builds it."""
+    fields = f"v1.{USER_ID}.{role}.{exp}"
+    signature = hmac.new(
+        identity._signing_key(), f"{fields}.{identity.token_digest(token)}".encode(), hashlib.sha256
+    ).digest()
+    return f"{fields}.{base64.urlsafe_b64encode(signature).rstrip(b'=').decode()}"
+
+
+@pytest.fixture
+def trusted_mode(monkeypatch):
+    decoded = []
+
+    def fake_decode(token):
+        decoded.append(token)
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    monkeypatch.setattr(settings, "TRUSTED_IDENTITY_ENABLED", True)
+    monkeypatch.setattr(identity, "decode_access_token", fake_decode)
+    identity.verified_tokens.clear()
+    yield decoded
+    identity.verified_tokens.clear()
+
+
+def test_signed_identity_skips_jwt_decode_and_is_cached(trusted_mode):
+    exp = int(time.time()) + 60
+
+    payload = identity.authenticate("token-a", _signed("token-a", exp))
+
+    assert payload == {"sub": USER_ID, "role": "ENGINEER", "exp": exp}
+    # inter-service calls carry the same token without the header
+    assert identity.authenticate("token-a") == payload
+    assert trusted_mode == []
+
+
+def test_identity_is_bound_to_its_token_and_expiry(trusted_mode):
+    with pytest.raises(HTTPException):
+        identity.authenticate("token-b", _signed("token-a", int(time.time()) + 60))
+    with pytest.raises(HTTPException):
+        identity.authenticate("token-a", _signed("token-a", int(time.time()) - 1))
+    with pytest.raises(HTTPException):
+        identity.authenticate("token-a", _signed("token-a", int(time.time()) + 60)[:-2] + "xx")
+
+    assert trusted_mode == ["token-b", "token-a", "token-a"]
+
+
+def test_header_is_ignored_outside_trusted_mode(monkeypatch):
+    monkeypatch.setattr(settings, "TRUSTED_IDENTITY_ENABLED", False)
+    monkeypatch.setattr(identity, "decode_access_token", lambda token: {"sub": "decoded"})
+
+    assert identity.authenticate("token-a", _signed("token-a", int(time.time()) + 60)) == {"sub": "decoded"}
+
+
+def test_verified_token_cache_is_bounded():
+    cache = identity.VerifiedTokenCache(max_entries=2)
+    exp = time.time() + 60
+    for digest in ("a", "b", "c"):
+        cache.set(digest, {"sub": digest, "exp": exp})
+    cache.set("expired", {"sub": "expired", "exp": time.time() - 1})
+
+    assert cache.get("a") is None
+    assert cache.get("expired") is None
+    assert cache.get("c")["sub"] == "c"
@@ -0,0 +1,144 @@
+import importlib.util
+from datetime import UTC, datetime, timedelta
+from itertools import cycle
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+try:
+    from svc_defects.api import deps  # type: ignore
+    from svc_defects.core.pagination import encode_cursor  # type: ignore
+    from svc_defects.main import app  # type: ignore
+    from svc_defects.models.defects import (  # type: ignore
+        DefectPriority,
+        DefectStatus,
+        Defects,
+        open_status_clause,
+    )
+except ModuleNotFoundError:
+    from api import deps
+    from core.pagination import encode_cursor
+    from main import app
+    from models.defects import DefectPriority, DefectStatus, Defects, open_status_clause
+
+# Shapes of GET /defects/ and the index that must serve each of them.
+# SQLite's EXPLAIN QUERY PLAN stands in for Postgres EXPLAIN here: both
+# planners pick these indexes for equality filters + (created_at, id) order.
+PROJECT_IDS = [uuid4() for _ in range(10)]
+PROJECT_ID = str(PROJECT_IDS[0])
+QUERY_SHAPES = [
+    ("MANAGER", {}, "ix_defects_created_at_id"),
+    ("MANAGER", {"project_id": PROJECT_ID}, "ix_defects_project_created"),
+    ("MANAGER", {"after": encode_cursor(datetime(2024, 5, 1, tzinfo=UTC), uuid4())}, "ix_defects_created_at_id"),
+    ("MANAGER", {"project_id": PROJECT_ID, "after": encode_cursor(datetime(2024, 5, 1), uuid4())}, "ix_defects_project_created"),
+    ("MANAGER", {"project_id": PROJECT_ID, "status": "NEW"}, "ix_defects_project_status_created"),
+    ("MANAGER", {"project_id": PROJECT_ID, "priority": "HIGH"}, "ix_defects_project_priority_created"),
+    ("MANAGER", {"status": "IN_PROGRESS"}, "ix_defects_status_created"),
+    ("MANAGER", {"created_from": "2024-01-05", "created_to": "2024-01-08"}, "ix_defects_created_at_id"),
+    ("MANAGER", {"project_id": PROJECT_ID, "created_from": "2024-01-05T00:00:00Z"}, "ix_defects_project_created"),
+    ("MANAGER", {"project_id": PROJECT_ID, "is_open": "true"}, "ix_defects_open_project_created"),
+    ("CUSTOMER", {}, "ix_defects_author_created"),
+    ("MANAGER", {"assignee_id": str(uuid4()), "is_open": "true"}, "ix_defects_open_assignee_created"),
+]
+
+
+@pytest.fixture
+def analyzed_defects(db_session):
+    """A table shaped like production (most defects closed) with planner statistics."""
+    statuses = cycle([DefectStatus.CLOSED] * 8 + [DefectStatus.NEW, DefectStatus.IN_PROGRESS])
+    projects = cycle(PROJECT_IDS)
+    people = [uuid4() for _ in range(20)]
+    started = datetime(2024, 1, 1, tzinfo=UTC)
+    db_session.add_all(
+        Defects(
+            project_id=next(projects),
+            title=f"Defect {index}",
+            description="Plan",
+            priority=list(DefectPriority)[index % len(DefectPriority)],
+            status=next(statuses),
+            author_id=people[index % 20],
+            assignee_id=people[(index * 7) % 20],
+            created_at=started + timedelta(hours=index),
+        )
+        for index in range(500)
+    )
+    db_session.commit()
+    db_session.execute(text("ANALYZE"))
+
+
+def _list_query(client, executed_sql, role, params):
+    """The SQL statement (with parameters) GET /defects/ runs for these params."""
+    app.dependency_overrides[deps.get_current_user_from_token] = lambda: {"user_id": uuid4(), "role": role}
+    executed_sql.clear()
+    assert client.get("/api/v1/defects/", params=params).status_code == 200
+
+    [query] = [(statement, parameters) for statement, parameters in executed_sql if "FROM defects" in statement]
+    return query
+
+
+def _plan(db_session, statement, parameters):
+    rows = db_session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return [row[-1] for row in rows]
+
+
+@pytest.mark.parametrize("role, params, index", QUERY_SHAPES)
+def test_defect_list_query_is_served_by_index_without_sort(
+    client, db_session, analyzed_defects, executed_sql, role, params, index
+):
+    statement, parameters = _list_query(client, executed_sql, role, params)
+
+    plan = _plan(db_session, statement, parameters)
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+    if "is_open" not in params:
+        # SQLite does not weigh how small a partial index is, so for is_open it
+        # may pick the full sibling index; Postgres prefers the partial one
+        assert any(f"USING INDEX {index}" in step for step in plan), plan
+
+    # INDEXED BY fails unless the query can use the index, for a partial index
+    # only if the WHERE clause implies its predicate
+    forced = _plan(db_session, statement.replace("FROM defects", f"FROM defects INDEXED BY {index}", 1), parameters)
+    assert not any("TEMP B-TREE" in step for step in forced), forced
+
+
+def test_engineer_scope_searches_author_and_assignee_indexes(client, db_session, analyzed_defects, executed_sql):
+    plan = _plan(db_session, *_list_query(client, executed_sql, "ENGINEER", {}))
+
+    assert not any(step.startswith("SCAN defects") for step in plan), plan
+    assert any("ix_defects_author_created" in step for step in plan), plan
+    assert any("ix_defects_assignee_created" in step for step in plan), plan
+
+
+def _load_migration(name):
+    path = Path(__file__).resolve().parents[1] / "alembic" / "versions" / f"{name}.py"
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+PARTIAL_INDEXES = [
+    index for index in Defects.__table__.indexes if index.dialect_options["postgresql"]["where"] is not None
+]
+
+
+@pytest.mark.parametrize("index", PARTIAL_INDEXES, ids=lambda index: index.name)
+def test_is_open_filter_matches_partial_index_predicate(client, db_session, executed_sql, index):
+    # Postgres uses a partial index only if the query's WHERE implies its
+    # predicate; with bind parameters instead of literals it never does
+    dialect = postgresql.dialect()
+    where = index.dialect_options["postgresql"]["where"]
+    predicate = str(where.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    query_clause = str(open_status_clause().compile(dialect=dialect, compile_kwargs={"render_postcompile": True}))
+    assert query_clause == predicate
+
+    # The migration creates the index in Postgres from its own copy of the predicate
+    migration = _load_migration("0004_add_defect_list_indexes")
+    _, migration_where = migration.INDEXES[index.name]
+    assert migration_where.text == predicate.replace("defects.", "")
+
+    # ... and the SQL the endpoint actually sends carries the literal predicate
+    statement, _ = _list_query(client, executed_sql, "MANAGER", {"is_open": "true"})
+    assert predicate in statement
@@ -0,0 +1,154 @@
+import json
+import time
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import func
+
+try:
+    from svc_defects.api import deps  # type: ignore
+    from svc_defects.core.config import settings  # type: ignore
+    from svc_defects.main import app  # type: ignore
+    from svc_defects.models.comments import Comment  # type: ignore
+    from svc_defects.models.defect_events import DefectEvent  # type: ignore
+    from svc_defects.models.defects import DefectPriority, DefectStatus, Defects  # type: ignore
+except ModuleNotFoundError:
+    from api import deps
+    from core.config import settings
+    from main import app
+    from models.comments import Comment
+    from models.defect_events import DefectEvent
+    from models.defects import DefectPriority, DefectStatus, Defects
+
+
+def _set_current_user(role: str, user_id):
+    app.dependency_overrides[deps.get_current_user_from_token] = (
+        lambda: {"user_id": user_id, "role": role}
+    )
+
+
+def _add_defect(db_session, author_id, project_id=None, title="Cracked column"):
+    defect = Defects(
+        project_id=project_id or uuid4(),
+        title=title,
+        description="Visible crack",
+        priority=DefectPriority.HIGH,
+        status=DefectStatus.NEW,
+        author_id=author_id,
+    )
+    db_session.add(defect)
+    db_session.commit()
+    return defect
+
+
+def _read_stream(client, headers=None, params=None, seconds=0.3):
+    # X-Request-Deadline bounds the stream, so the response ends on its own
+    headers = {"X-Request-Deadline": f"{time.time() + seconds:.3f}", **(headers or {})}
+    response = client.get("/api/v1/defects/stream", headers=headers, params=params)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    return response.text
+
+
+def _events(body: str):
+    events = []
+    for block in body.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if line and not line.startswith(":"))
+        if "event" in fields:
+            events.append((int(fields["id"]), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_stream_replays_events_after_last_event_id(client, db_session):
+    author_id = uuid4()
+    defect = _add_defect(db_session, author_id)
+    defect.status = DefectStatus.IN_PROGRESS
+    db_session.commit()
+    db_session.add(Comment(defect_id=defect.id, author_id=author_id, text="Checked on site"))
+    db_session.commit()
+    _set_current_user("ENGINEER", author_id)
+
+    body = _read_stream(client, headers={"Last-Event-ID": "0"})
+
+    assert body.startswith(f"retry: {settings.SSE_RETRY_MS}\n\n")
+    events = _events(body)
+    assert [event_type for _, event_type, _ in events] == ["defect.created", "defect.updated", "comment.created"]
+    assert events[1][2]["changed"] == ["status"]
+    assert events[2][2]["defect_id"] == str(defect.id)
+
+    resumed = _events(_read_stream(client, headers={"Last-Event-ID": str(events[0][0])}))
+    assert [event_id for event_id, _, _ in resumed] == [event_id for event_id, _, _ in events[1:]]
+
+
+def test_stream_applies_role_and_project_visibility(client, db_session):
+    author_id = uuid4()
+    project_id = uuid4()
+    _add_defect(db_session, author_id, project_id=project_id)
+    _add_defect(db_session, author_id, title="Other project")
+
+    _set_current_user("ENGINEER", uuid4())
+    assert _events(_read_stream(client, headers={"Last-Event-ID": "0"})) == []
+
+    _set_current_user("MANAGER", uuid4())
+    events = _events(
+        _read_stream(client, headers={"Last-Event-ID": "0"}, params={"project_id": str(project_id)})
+    )
+    assert [data["project_id"] for _, _, data in events] == [str(project_id)]
+
+
+def test_stream_without_last_event_id_starts_from_new_events(client, db_session, monkeypatch):
+    author_id = uuid4()
+    _add_defect(db_session, author_id)
+    monkeypatch.setattr(settings, "SSE_HEARTBEAT_INTERVAL", 0.05)
+    _set_current_user("ADMIN", author_id)
+
+    body = _read_stream(client)
+
+    assert _events(body) == []
+    assert ": heartbeat\n\n" in body
+
+
+def _journal_event(defect, event_id, age_seconds=0.0):
+    return DefectEvent(
+        id=event_id,
+        event_type="defect.updated",
+        defect_id=defect.id,
+        project_id=defect.project_id,
+        author_id=defect.author_id,
+        data=json.dumps({"id": str(defect.id), "changed": ["status"]}),
+        created_at=datetime.now(UTC) - timedelta(seconds=age_seconds),
+    )
+
+
+def test_stream_waits_for_events_committed_out_of_id_order(client, db_session, monkeypatch):
+    author_id = uuid4()
+    defect = _add_defect(db_session, author_id)
+    first_id = db_session.query(func.max(DefectEvent.id)).scalar()
+    monkeypatch.setattr(settings, "SSE_COMMIT_GRACE", 30.0)
+    _set_current_user("MANAGER", uuid4())
+
+    # Transaction B (id first_id + 2) commits while A (first_id + 1) is still open:
+    # the stream must not move past A's id, or A's event is never delivered
+    db_session.add(_journal_event(defect, first_id + 2))
+    db_session.commit()
+    assert _events(_read_stream(client, headers={"Last-Event-ID": str(first_id)})) == []
+
+    db_session.add(_journal_event(defect, first_id + 1))
+    db_session.commit()
+    events = _events(_read_stream(client, headers={"Last-Event-ID": str(first_id)}))
+    assert [event_id for event_id, _, _ in events] == [first_id + 1, first_id + 2]
+
+
+def test_stream_skips_gap_older_than_commit_grace(client, db_session, monkeypatch):
+    author_id = uuid4()
+    defect = _add_defect(db_session, author_id)
+    first_id = db_session.query(func.max(DefectEvent.id)).scalar()
+    monkeypatch.setattr(settings, "SSE_COMMIT_GRACE", 30.0)
+    _set_current_user("MANAGER", uuid4())
+
+    # first_id + 1 was rolled back: after the grace window the stream moves on
+    db_session.add(_journal_event(defect, first_id + 2, age_seconds=60.0))
+    db_session.commit()
+
+    events = _events(_read_stream(client, headers={"Last-Event-ID": str(first_id)}))
+    assert [event_id for event_id, _, _ in events] == [first_id + 2]
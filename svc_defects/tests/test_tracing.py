@@ -0,0 +1,73 @@
+import json
+
+import pytest
+from sqlalchemy import create_engine, text
+
+try:
+    from svc_defects.core import tracing  # type: ignore
+except ModuleNotFoundError:
+    from core import tracing
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+
+@pytest.fixture
+def spans(monkeypatch):
+    collected = []
+
+    class _Collector(tracing.SpanExporter):
+        def export(self, span):
+            collected.append(span)
+
+    monkeypatch.setattr(tracing, "_exporter", _Collector())
+    return collected
+
+
+def test_sql_statements_are_child_spans(spans):
+    engine = create_engine("sqlite://")
+    tracing.instrument_engine(engine)
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))  # outside a trace: not recorded
+        with tracing.span("report") as parent:
+            connection.execute(text("SELECT 2"))
+
+    db_span, report_span = spans
+    assert report_span is parent
+    assert db_span.name == "SELECT"
+    assert db_span.parent_span_id == parent.span_id
+    assert db_span.trace_id == parent.trace_id
+    assert db_span.attributes["db.statement"] == "SELECT 2"
+
+
+def test_server_span_continues_incoming_trace(client, spans):
+    client.get("/", headers={"traceparent": f"00-{TRACE_ID}-00f067aa0ba902b7-01"})
+
+    server_span = spans[-1]
+    assert server_span.kind == "server"
+    assert server_span.trace_id == TRACE_ID
+    assert server_span.parent_span_id == "00f067aa0ba902b7"
+    assert server_span.attributes["http.status_code"] == 200
+
+
+def test_invalid_traceparent_starts_new_trace():
+    assert tracing.parse_traceparent("00-" + "0" * 32 + "-00f067aa0ba902b7-01") is None
+    assert tracing.parse_traceparent("garbage") is None
+    assert tracing.parse_traceparent(f"00-{TRACE_ID}-00f067aa0ba902b7-00") == (TRACE_ID, "00f067aa0ba902b7", False)
+
+
+def test_jsonl_exporter_writes_spans_from_background_thread(tmp_path):
+    path = tmp_path / "traces" / "svc_defects.jsonl"
+    exporter = tracing.JsonLinesExporter(str(path))
+    try:
+        for name in ("first", "second"):
+            exporter.export(tracing.Span(TRACE_ID, "00f067aa0ba902b7", None, name, "internal", "svc_defects"))
+        exporter.flush()
+
+        lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        assert [line["name"] for line in lines] == ["first", "second"]
+    finally:
+        exporter.close()
+
+    exporter.export(tracing.Span(TRACE_ID, "00f067aa0ba902b7", None, "late", "internal", "svc_defects"))
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 2
@@ -0,0 +1,181 @@
+import asyncio
+import json
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import httpx
+from fastapi import HTTPException, status
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import compile_path
+
+from api.proxy import _admit_and_forward
+from core.proxy import HOP_BY_HOP_HEADERS, ProxyRoute, forward
+from schemas.batch import BatchSubRequest, BatchSubResponse
+
+logger = logging.getLogger(__name__)
+
+# Set by the gateway for every sub-request; the batch caller cannot override them.
+# Authorization is always the (already validated) token of the batch itself, and
+# responses are requested unencoded so they can be embedded into the JSON result.
+_CONTROLLED_HEADERS = frozenset(
+    {"authorization", "accept-encoding", "content-length", "content-type", "host", "x-forwarded-for"}
+)
+_INHERITED_HEADERS = ("authorization", "user-agent", "accept-language", "x-forwarded-for", "x-request-deadline")
+
+
+class RouteMatcher:
+    """
+    Resolves a gateway path to its route table row, the way the router does:
+    the first row whose path matches wins, a path known only for other
+    methods is a 405, anything else a 404.
+    """
+
+    def __init__(self, tables: Iterable[Tuple[str, Iterable[ProxyRoute]]]):
+        """tables: (path prefix, route table) pairs, in registration order."""
+        self._routes = [
+            (route, compile_path(prefix + route.path)) for prefix, routes in tables for route in routes
+        ]
+
+    def match(self, method: str, path: str) -> Tuple[ProxyRoute, Dict[str, str]]:
+        """
+        Raises:
+            HTTPException 404: If no route has this path
+            HTTPException 405: If the path exists but not for this method
+        """
+        path_exists = False
+        for route, (regex, _, convertors) in self._routes:
+            match = regex.match(path)
+            if match is None:
+                continue
+            if route.method != method:
+                path_exists = True
+                continue
+            params = {name: convertors[name].convert(value) for name, value in match.groupdict().items()}
+            return route, params
+
+        if path_exists:
+            raise HTTPException(status_code=status.HTTP_405_METHOD_NOT_ALLOWED, detail="Method Not Allowed")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+
+def _sub_request(parent: Request, sub: BatchSubRequest, path: str, query: str, path_params: dict) -> Request:
+    """Build an in-process request for a sub-request, inheriting client and auth from the batch."""
+    headers = {
+        name.lower(): value
+        for name, value in sub.headers.items()
+        if name.lower() not in _CONTROLLED_HEADERS and name.lower() not in HOP_BY_HOP_HEADERS
+    }
+    for name in _INHERITED_HEADERS:
+        if name in parent.headers:
+            headers[name] = parent.headers[name]
+    headers["accept-encoding"] = "identity"
+
+    body = b""
+    if sub.body is not None:
+        body = json.dumps(sub.body).encode()
+        headers["content-type"] = "application/json"
+        headers["content-length"] = str(len(body))
+
+    scope = {
+        "type": "http",
+        "http_version": parent.scope.get("http_version", "1.1"),
+        "method": sub.method.upper(),
+        "scheme": parent.url.scheme,
+        "server": parent.scope.get("server"),
+        "client": parent.scope.get("client"),
+        "root_path": "",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": [(name.encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()],
+        "path_params": path_params,
+        "state": dict(parent.scope.get("state", {})),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive() -> dict:
+        return messages.pop() if messages else {"type": "http.disconnect"}
+
+    return Request(scope, receive)
+
+
+async def _read_body(response: Response) -> bytes:
+    if not isinstance(response, StreamingResponse):
+        return response.body
+    try:
+        return b"".join([chunk async for chunk in response.body_iterator])
+    finally:
+        if response.background is not None:
+            await response.background()
+
+
+def _decode_body(body: bytes, content_type: str):
+    if not body:
+        return None
+    if "json" in content_type:
+        try:
+            return json.loads(body)
+        except ValueError:
+            pass
+    return body.decode("utf-8", errors="replace")
+
+
+def _error(status_code: int, message: str, headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], dict]:
+    body = {"success": False, "error": {"code": "HTTP_ERROR", "message": message}}
+    return status_code, dict(headers or {}), body
+
+
+async def run_sub_request(
+    parent: Request,
+    sub: BatchSubRequest,
+    matcher: RouteMatcher,
+    current_user: dict,
+    admit: bool = True,
+) -> BatchSubResponse:
+    """
+    Run one sub-request through the regular proxy path (admission control,
+    cache, coalescing, resilience). Failures become the result of this
+    sub-request only; they never fail the batch.
+
+    With admit=False admission control is skipped (the caller already
+    admitted the request the sub-request belongs to).
+    """
+    path, _, query = sub.path.partition("?")
+    try:
+        route, path_params = matcher.match(sub.method.upper(), path)
+        if route.stream:
+            # an event stream never completes, so it cannot be part of a batch answer
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Streaming routes cannot be batched")
+        request = _sub_request(parent, sub, path, query, path_params)
+        user = current_user if route.auth_required else None
+        if admit:
+            response = await _admit_and_forward(request, route, user)
+        else:
+            response = await forward(request, route, user)
+        body = await _read_body(response)
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name not in ("content-length", "content-encoding")
+        }
+        result = response.status_code, headers, _decode_body(body, response.headers.get("content-type", ""))
+    except HTTPException as exc:
+        result = _error(exc.status_code, exc.detail, exc.headers)
+    except httpx.TimeoutException:
+        result = _error(status.HTTP_504_GATEWAY_TIMEOUT, "Upstream timeout")
+    except httpx.RequestError:
+        result = _error(status.HTTP_503_SERVICE_UNAVAILABLE, "Upstream unavailable")
+    except Exception:
+        logger.exception("Batch sub-request %s %s failed", sub.method, sub.path)
+        result = _error(status.HTTP_500_INTERNAL_SERVER_ERROR, "Internal server error")
+
+    status_code, headers, body = result
+    return BatchSubResponse(id=sub.id, status=status_code, headers=headers, body=body)
+
+
+async def run_batch(
+    parent: Request, subs: List[BatchSubRequest], matcher: RouteMatcher, current_user: dict
+) -> List[BatchSubResponse]:
+    """Run all sub-requests concurrently; results keep the order of the batch."""
+    return await asyncio.gather(*(run_sub_request(parent, sub, matcher, current_user) for sub in subs))
@@ -1,9 +1,11 @@
+import hmac
 from uuid import UUID
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from core.auth import decode_access_token
+from core.config import settings
 
 security = HTTPBearer()
 
@@ -19,6 +21,7 @@ def get_current_user_from_token(
             - user_id: UUID of the user
             - role: str user role (ENGINEER, MANAGER, SUPERVISOR, CUSTOMER, ADMIN)
             - token: str JWT token (for forwarding to downstream services)
+            - exp: int token expiry (Unix time, bounds the forwarded verified identity)
 
     Raises:
         HTTPException 401: If token is invalid
@@ -29,4 +32,37 @@ def get_current_user_from_token(
     user_id = UUID(payload.get("sub"))
     role = payload.get("role")
 
-    return {"user_id": user_id, "role": role, "token": token}
+    return {"user_id": user_id, "role": role, "token": token, "exp": payload.get("exp")}
+
+
+def require_admin(current_user: dict = Depends(get_current_user_from_token)) -> dict:
+    """
+    Allow only ADMIN users (gateway internals: runtime stats, metrics).
+
+    Raises:
+        HTTPException 401: If token is invalid
+        HTTPException 403: If the user is not an ADMIN
+    """
+    if current_user["role"] != "ADMIN":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied. Required role: ADMIN",
+        )
+    return current_user
+
+
+def require_metrics_access(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> None:
+    """
+    Allow the Prometheus scraper (bearer METRICS_TOKEN) or an ADMIN user.
+
+    Raises:
+        HTTPException 401: If token is invalid
+        HTTPException 403: If the user is not an ADMIN
+    """
+    if settings.METRICS_TOKEN and hmac.compare_digest(
+        credentials.credentials.encode(), settings.METRICS_TOKEN.encode()
+    ):
+        return
+    require_admin(get_current_user_from_token(credentials))
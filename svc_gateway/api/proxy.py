@@ -0,0 +1,56 @@
+from typing import Iterable, Optional
+
+from fastapi import APIRouter, Depends, Request
+
+from api.deps import get_current_user_from_token
+from core.admission import admission, client_key
+from core.config import settings
+from core.proxy import ProxyRoute, forward
+
+
+async def _admit_and_forward(request: Request, route: ProxyRoute, current_user: Optional[dict] = None):
+    """Apply admission control (rate limits, concurrency caps), then proxy the request."""
+    if not settings.ADMISSION_ENABLED:
+        return await forward(request, route, current_user)
+
+    role = current_user["role"] if current_user is not None else None
+    async with admission.admit(route.route_class, client_key(request, current_user), role):
+        return await forward(request, route, current_user)
+
+
+def _make_endpoint(route: ProxyRoute):
+    """Create the FastAPI endpoint for a single route table row."""
+    if route.auth_required:
+
+        async def protected_endpoint(
+            request: Request,
+            current_user: dict = Depends(get_current_user_from_token),
+        ):
+            return await _admit_and_forward(request, route, current_user)
+
+        return protected_endpoint
+
+    async def public_endpoint(request: Request):
+        return await _admit_and_forward(request, route)
+
+    return public_endpoint
+
+
+def register_proxy_routes(router: APIRouter, routes: Iterable[ProxyRoute]) -> None:
+    """
+    Register every row of a route table on the router.
+
+    Protected routes validate the JWT in the gateway before proxying, then
+    every route passes admission control; the rest of the request (query,
+    body, headers) is streamed to the upstream as is.
+    """
+    for route in routes:
+        endpoint = _make_endpoint(route)
+        endpoint.__name__ = f"{route.method.lower()}_{route.service}_proxy"
+        router.add_api_route(
+            route.path,
+            endpoint,
+            methods=[route.method],
+            summary=route.summary,
+            description=f"Proxy for {route.method} {route.upstream_path}",
+        )
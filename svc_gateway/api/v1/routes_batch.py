@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+
+from api.batch import RouteMatcher, run_batch
+from api.deps import get_current_user_from_token
+from api.v1 import routes_auth_proxy, routes_defects_proxy, routes_projects_proxy, routes_reports_proxy
+from core.config import settings
+from schemas.batch import BatchRequest
+
+router = APIRouter(tags=["Batch"])
+
+# Sub-requests can address every proxied route (paths include the /api/v1 prefix)
+matcher = RouteMatcher(
+    (f"/api/v1{module.router.prefix}", module.ROUTES)
+    for module in (routes_auth_proxy, routes_projects_proxy, routes_defects_proxy, routes_reports_proxy)
+)
+
+
+@router.post("/batch", summary="Run several gateway requests in one round trip")
+async def batch(
+    payload: BatchRequest,
+    request: Request,
+    current_user: dict = Depends(get_current_user_from_token),
+):
+    """
+    Execute up to BATCH_MAX_REQUESTS sub-requests concurrently.
+
+    The JWT is validated once for the whole batch and forwarded with every
+    sub-request. Each sub-request passes admission control, the response
+    cache and coalescing like a standalone call; results come back in the
+    order of the batch, each with its own status, headers and JSON body.
+
+    Raises:
+        HTTPException 400: If the batch has more than BATCH_MAX_REQUESTS sub-requests
+    """
+    if len(payload.requests) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batch exceeds maximum of {settings.BATCH_MAX_REQUESTS} requests",
+        )
+
+    results = await run_batch(request, payload.requests, matcher, current_user)
+    return {"success": True, "data": [result.model_dump() for result in results]}
@@ -0,0 +1,124 @@
+import asyncio
+from contextlib import nullcontext
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+
+from api.batch import run_sub_request
+from api.deps import get_current_user_from_token
+from api.v1.routes_batch import matcher
+from core.admission import admission, client_key
+from core.config import settings
+from schemas.batch import BatchSubRequest, BatchSubResponse
+
+router = APIRouter(prefix="/views", tags=["Views"])
+
+# Optional sections of the defect view, all included by default
+DEFECT_VIEW_SECTIONS = ("comments", "attachments", "history", "project")
+
+
+def _parse_include(include: Optional[str]) -> Tuple[str, ...]:
+    """
+    Raises:
+        HTTPException 400: If an unknown section is requested
+    """
+    if include is None:
+        return DEFECT_VIEW_SECTIONS
+    sections = tuple(name.strip() for name in include.split(",") if name.strip())
+    unknown = [name for name in sections if name not in DEFECT_VIEW_SECTIONS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown sections: {', '.join(unknown)}. Allowed: {', '.join(DEFECT_VIEW_SECTIONS)}",
+        )
+    return sections
+
+
+def _error_message(result: BatchSubResponse) -> str:
+    if isinstance(result.body, dict) and isinstance(result.body.get("error"), dict):
+        return result.body["error"].get("message", "")
+    if isinstance(result.body, dict) and "detail" in result.body:
+        return str(result.body["detail"])
+    return f"Upstream returned {result.status}"
+
+
+@router.get("/defects/{defect_id}", summary="Defect screen: defect with comments, attachments, history and project")
+async def defect_view(
+    defect_id: UUID,
+    request: Request,
+    include: Optional[str] = Query(
+        None, description="Comma-separated sections: comments, attachments, history, project (default: all)"
+    ),
+    current_user: dict = Depends(get_current_user_from_token),
+):
+    """
+    Aggregated defect view (backend for frontend).
+
+    The defect, the first page of comments, attachment metadata and recent
+    history are fetched from svc_defects in parallel; the project is fetched
+    from svc_projects as soon as the defect (and so its project_id) arrives.
+    Every section goes through the regular proxy path, so cached defect and
+    project responses are reused. The view counts as one request for
+    admission control.
+
+    A failing optional section is returned as null with its status in
+    "errors"; if the defect itself cannot be read, the view fails with the
+    defect's status so no section is shown without access to the defect.
+
+    Returns:
+        {"success": True, "data": {"defect": ..., "<section>": ..., "errors": {...}}}
+
+    Raises:
+        HTTPException 400: If include names an unknown section
+        HTTPException 4xx/5xx: Status of the defect request if it failed
+    """
+    sections = _parse_include(include)
+    paths = {
+        "comments": f"/api/v1/comments/defects/{defect_id}/comments?limit={settings.VIEW_COMMENTS_LIMIT}",
+        "attachments": f"/api/v1/attachments/defects/{defect_id}/attachments",
+        "history": f"/api/v1/defects/{defect_id}/history?limit={settings.VIEW_HISTORY_LIMIT}",
+    }
+
+    async def fetch(path: str) -> BatchSubResponse:
+        return await run_sub_request(request, BatchSubRequest(path=path), matcher, current_user, admit=False)
+
+    async def fetch_defect_and_project() -> Tuple[BatchSubResponse, Optional[BatchSubResponse]]:
+        defect = await fetch(f"/api/v1/defects/{defect_id}")
+        if "project" not in sections or defect.status != status.HTTP_200_OK:
+            return defect, None
+        return defect, await fetch(f"/api/v1/projects/{defect.body['data']['project_id']}")
+
+    parallel = [name for name in sections if name in paths]
+    admitted = (
+        admission.admit("default", client_key(request, current_user), current_user["role"])
+        if settings.ADMISSION_ENABLED
+        else nullcontext()
+    )
+    async with admitted:
+        (defect, project), *results = await asyncio.gather(
+            fetch_defect_and_project(), *(fetch(paths[name]) for name in parallel)
+        )
+
+    if defect.status != status.HTTP_200_OK:
+        raise HTTPException(
+            status_code=defect.status,
+            detail=_error_message(defect),
+            headers={"Retry-After": defect.headers["retry-after"]} if "retry-after" in defect.headers else None,
+        )
+
+    section_results: Dict[str, Optional[BatchSubResponse]] = dict(zip(parallel, results))
+    if "project" in sections:
+        section_results["project"] = project
+
+    data = {"defect": defect.body["data"]}
+    errors = {}
+    for name in sections:
+        result = section_results[name]
+        if result is not None and result.status == status.HTTP_200_OK:
+            data[name] = result.body["data"]
+        else:
+            data[name] = None
+            errors[name] = {"status": result.status, "message": _error_message(result)}
+    data["errors"] = errors
+    return {"success": True, "data": data}
@@ -1,14 +1,29 @@
 from contextlib import asynccontextmanager
 
 import uvicorn
-from fastapi import FastAPI, HTTPException, Request, status
+from fastapi import Depends, FastAPI, HTTPException, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-
-from api.v1 import routes_auth_proxy, routes_projects_proxy, routes_defects_proxy, routes_reports_proxy
+from fastapi.responses import JSONResponse, Response
+
+from api.deps import require_admin, require_metrics_access
+from api.v1 import (
+    routes_auth_proxy,
+    routes_projects_proxy,
+    routes_defects_proxy,
+    routes_reports_proxy,
+    routes_batch,
+    routes_views,
+)
+from core.admission import admission
+from core.balancer import balancer_stats, start_health_checks, stop_health_checks
 from core.config import settings
-from core.middleware import RequestIDMiddleware
+from core.http import SERVICES, close_upstream_clients, get_client, pool_stats, start_upstream_clients
+from core.metrics import mark_process_dead, render_metrics
+from core.middleware import MetricsMiddleware, RequestIDMiddleware, TracingMiddleware
+from core.proxy import response_cache, single_flight
+from core.resilience import resilience_stats
+from core.tracing import configure_tracing
 
 
 @asynccontextmanager
@@ -21,9 +36,15 @@ async def lifespan(app: FastAPI):
     print(f"  - PROJECTS: {settings.PROJECTS_SERVICE_URL}")
     print(f"  - DEFECTS: {settings.DEFECTS_SERVICE_URL}")
     print(f"  - REPORTS: {settings.REPORTS_SERVICE_URL}")
+    configure_tracing("svc_gateway")
+    await start_upstream_clients()
+    start_health_checks(SERVICES, get_client)
     yield
     # Shutdown
     print("Shutting down svc_gateway")
+    await stop_health_checks()
+    await close_upstream_clients()
+    mark_process_dead()
 
 
 app = FastAPI(
@@ -46,6 +67,12 @@ app.add_middleware(
 # Request ID middleware
 app.add_middleware(RequestIDMiddleware)
 
+# Prometheus metrics middleware (measures the whole request)
+app.add_middleware(MetricsMiddleware)
+
+# Tracing middleware (outermost, the server span covers everything else)
+app.add_middleware(TracingMiddleware)
+
 
 # Exception handlers for unified response format
 @app.exception_handler(RequestValidationError)
@@ -73,6 +100,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
             "success": False,
             "error": {"code": "HTTP_ERROR", "message": exc.detail},
         },
+        headers=exc.headers,
     )
 
 
@@ -96,6 +124,8 @@ app.include_router(routes_auth_proxy.router, prefix="/api/v1")
 app.include_router(routes_projects_proxy.router, prefix="/api/v1")
 app.include_router(routes_defects_proxy.router, prefix="/api/v1")
 app.include_router(routes_reports_proxy.router, prefix="/api/v1")
+app.include_router(routes_batch.router, prefix="/api/v1")
+app.include_router(routes_views.router, prefix="/api/v1")
 
 
 @app.get("/")
@@ -111,6 +141,38 @@ async def root():
     }
 
 
+@app.get("/internal/stats")
+async def internal_stats(_admin: dict = Depends(require_admin)):
+    """
+    Runtime counters of the gateway (pools, instances, breakers, retry budgets, coalescing, cache, admission).
+
+    ADMIN only: the payload names internal upstream instance URLs.
+    """
+    return {
+        "success": True,
+        "data": {
+            "pools": pool_stats(),
+            "instances": balancer_stats(SERVICES),
+            "upstreams": resilience_stats(SERVICES),
+            "single_flight": single_flight.stats(),
+            "response_cache": response_cache.stats(),
+            "admission": admission.stats(),
+        },
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(_access: None = Depends(require_metrics_access)):
+    """
+    Prometheus metrics (aggregated over all workers in multiprocess mode).
+
+    Scraper with METRICS_TOKEN or ADMIN only: per-route traffic and upstream
+    errors are not for anonymous clients of the edge.
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 if __name__ == "__main__":
     uvicorn.run(
         "app.main:app", host=settings.APP_HOST, port=settings.APP_PORT, reload=True
@@ -0,0 +1 @@
+# Gateway Benchmark: stub upstreams + load generator (python -m benchmark)
@@ -0,0 +1,148 @@
+"""
+Gateway benchmark: stub upstreams + the real gateway app + a load generator.
+
+    cd svc_gateway
+    python -m benchmark --concurrency 50 --duration 20 --latency-ms 5 --payload-bytes 4096
+
+Four stub upstreams (auth, projects, defects, reports) and the gateway run
+under uvicorn on local ports in this process; the gateway is configured
+through environment variables before it is imported (--env KEY=VALUE for
+overrides, e.g. --env CACHE_TTL_DEFECTS=0). To keep the load generator off
+the gateway's CPU, start the stubs with --stubs-only, run the gateway with
+uvicorn pointing at them and benchmark it with --gateway-url.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+from uuid import uuid4
+
+import httpx
+import jwt
+
+from benchmark.loadgen import DEFAULT_MIX, format_report, parse_mix, run_load
+from benchmark.stubs import StubConfig, StubUpstream, free_port, serve, shutdown
+
+UPSTREAMS = ("auth", "projects", "defects", "reports")
+
+# Defaults for the gateway under test: per-user rate limits would cap a single
+# benchmark user at RATE_LIMIT_RPS, so admission control is off unless asked for
+GATEWAY_ENV = {
+    "JWT_SECRET_KEY": "benchmark-secret-key-with-at-least-32-bytes",
+    "ADMISSION_ENABLED": "false",
+    "TRACING_EXPORTER": "none",
+}
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmark", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--concurrency", type=int, default=20, help="concurrent closed-loop clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds of unmeasured load first")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"route mix as name=weight,... (default {DEFAULT_MIX})")
+    parser.add_argument("--ids", type=int, default=100, help="distinct ids used for {id} routes")
+    parser.add_argument("--role", default="MANAGER", help="role of the benchmark user's token")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="stub upstream latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="random extra stub latency")
+    parser.add_argument("--payload-bytes", type=int, default=1024, help="size of stub JSON answers")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="gateway setting override")
+    parser.add_argument("--gateway-url", help="benchmark a running gateway instead of starting one")
+    parser.add_argument("--stubs-only", action="store_true", help="only run the stub upstreams")
+    parser.add_argument("--seed", type=int, help="seed of the route/id choice")
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    return parser.parse_args(argv)
+
+
+def _env_overrides(items: List[str]) -> Dict[str, str]:
+    overrides = {}
+    for item in items:
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise SystemExit(f"--env expects KEY=VALUE, got {item!r}")
+        overrides[key] = value
+    return overrides
+
+
+def _token(secret: str, algorithm: str, role: str) -> str:
+    payload = {"sub": str(uuid4()), "role": role, "exp": datetime.now(timezone.utc) + timedelta(hours=1)}
+    return jwt.encode(payload, secret, algorithm=algorithm)
+
+
+async def _start_stubs(config: StubConfig, seed) -> Dict[str, tuple]:
+    servers = {}
+    for name in UPSTREAMS:
+        port = free_port()
+        servers[name] = (f"http://127.0.0.1:{port}", *await serve(StubUpstream(name, config, seed), "127.0.0.1", port))
+    return servers
+
+
+async def main(argv=None) -> None:
+    args = parse_args(argv)
+    mix = parse_mix(args.mix)
+    overrides = _env_overrides(args.env)
+    stub_config = StubConfig(args.latency_ms, args.jitter_ms, args.payload_bytes)
+
+    running = []
+    try:
+        if args.gateway_url is None or args.stubs_only:
+            stubs = await _start_stubs(stub_config, args.seed)
+            running.extend((server, task) for _, server, task in stubs.values())
+            for name, (url, _, _) in stubs.items():
+                os.environ[f"{name.upper()}_SERVICE_URL"] = url
+            if args.stubs_only:
+                for name, (url, _, _) in stubs.items():
+                    print(f"{name.upper()}_SERVICE_URL={url}")
+                await asyncio.gather(*(task for _, task in running))
+                return
+
+        for key, value in GATEWAY_ENV.items():
+            os.environ.setdefault(key, value)
+        os.environ.update(overrides)
+
+        gateway_url = args.gateway_url
+        if gateway_url is None:
+            # imported only now: the gateway reads its settings at import time
+            from app.main import app
+
+            port = free_port()
+            running.append(await serve(app, "127.0.0.1", port))
+            gateway_url = f"http://127.0.0.1:{port}"
+
+        token = _token(os.environ["JWT_SECRET_KEY"], os.environ.get("JWT_ALGORITHM", "HS256"), args.role)
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=gateway_url, limits=limits, timeout=60.0) as client:
+            started = time.perf_counter()
+            result = await run_load(
+                client,
+                mix,
+                concurrency=args.concurrency,
+                duration=args.duration,
+                warmup=args.warmup,
+                headers={"Authorization": f"Bearer {token}"},
+                ids=args.ids,
+                seed=args.seed,
+            )
+            wall = time.perf_counter() - started
+
+        report = result.to_dict()
+        report["config"] = {
+            "concurrency": args.concurrency,
+            "mix": dict(mix),
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "payload_bytes": args.payload_bytes,
+            "env": overrides,
+            "wall_s": round(wall, 3),
+        }
+        print(json.dumps(report, indent=2) if args.json else format_report(report))
+    finally:
+        for server, task in reversed(running):
+            await shutdown(server, task)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
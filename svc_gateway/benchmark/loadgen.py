@@ -0,0 +1,178 @@
+import asyncio
+import math
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import httpx
+
+# Routes the load generator can hit: name -> (method, gateway path).
+# {id} is replaced with one of `ids` distinct UUIDs per request, so the share
+# of response cache hits can be steered with --ids.
+ROUTES: Dict[str, Tuple[str, str]] = {
+    "defects": ("GET", "/api/v1/defects/"),
+    "defect": ("GET", "/api/v1/defects/{id}"),
+    "history": ("GET", "/api/v1/defects/{id}/history"),
+    "comments": ("GET", "/api/v1/comments/defects/{id}/comments"),
+    "projects": ("GET", "/api/v1/projects/"),
+    "project": ("GET", "/api/v1/projects/{id}"),
+    "me": ("GET", "/api/v1/users/me"),
+    "report": ("GET", "/api/v1/reports/summary"),
+    "create_defect": ("POST", "/api/v1/defects/"),
+    "health": ("GET", "/"),
+}
+
+DEFAULT_MIX = "defects=4,defect=3,comments=1,projects=1,me=1"
+
+_CREATE_DEFECT_BODY = {
+    "title": "Benchmark defect",
+    "description": "Created by the gateway benchmark",
+    "priority": "MEDIUM",
+}
+
+
+def parse_mix(value: str) -> List[Tuple[str, float]]:
+    """
+    Route mix from "name=weight,name=weight" (a bare name has weight 1).
+
+    Raises:
+        ValueError: On unknown routes or non-positive weights
+    """
+    mix = []
+    for item in value.split(","):
+        name, _, weight = item.strip().partition("=")
+        if not name:
+            continue
+        if name not in ROUTES:
+            raise ValueError(f"Unknown route {name!r}, expected one of: {', '.join(sorted(ROUTES))}")
+        parsed = float(weight) if weight else 1.0
+        if parsed <= 0:
+            raise ValueError(f"Weight of {name!r} must be positive")
+        mix.append((name, parsed))
+    if not mix:
+        raise ValueError("Route mix is empty")
+    return mix
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100) of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+@dataclass
+class RouteStats:
+    """Latencies (seconds) and outcomes of one route over the measured window."""
+
+    latencies: List[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    errors: int = 0
+
+    def record(self, latency: float, status: str, ok: bool) -> None:
+        self.latencies.append(latency)
+        self.statuses[status] += 1
+        if not ok:
+            self.errors += 1
+
+    def summary(self, elapsed: float) -> dict:
+        latencies = sorted(self.latencies)
+        to_ms = 1000
+        return {
+            "requests": len(latencies),
+            "errors": self.errors,
+            "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+            "p50_ms": round(percentile(latencies, 50) * to_ms, 2),
+            "p95_ms": round(percentile(latencies, 95) * to_ms, 2),
+            "p99_ms": round(percentile(latencies, 99) * to_ms, 2),
+            "max_ms": round((latencies[-1] if latencies else 0.0) * to_ms, 2),
+            "statuses": dict(sorted(self.statuses.items())),
+        }
+
+
+@dataclass
+class LoadResult:
+    elapsed: float
+    routes: Dict[str, RouteStats]
+
+    def to_dict(self) -> dict:
+        total = RouteStats()
+        for stats in self.routes.values():
+            total.latencies.extend(stats.latencies)
+            total.statuses.update(stats.statuses)
+            total.errors += stats.errors
+        return {
+            "elapsed_s": round(self.elapsed, 3),
+            "routes": {name: stats.summary(self.elapsed) for name, stats in sorted(self.routes.items())},
+            "total": total.summary(self.elapsed),
+        }
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    mix: List[Tuple[str, float]],
+    concurrency: int,
+    duration: float,
+    warmup: float = 0.0,
+    headers: Optional[Dict[str, str]] = None,
+    ids: int = 100,
+    seed: Optional[int] = None,
+) -> LoadResult:
+    """
+    Drive the gateway with `concurrency` closed-loop workers.
+
+    Each worker picks a route from the weighted mix, sends the request and
+    immediately sends the next one when the answer arrives. Requests started
+    during the warmup are sent but not measured; the measured window lasts
+    `duration` seconds after it.
+    """
+    names = [name for name, _ in mix]
+    weights = [weight for _, weight in mix]
+    id_pool = [str(UUID(int=index + 1)) for index in range(max(ids, 1))]
+    routes = {name: RouteStats() for name in names}
+    rng = random.Random(seed)
+
+    loop = asyncio.get_running_loop()
+    measure_from = loop.time() + warmup
+    stop_at = measure_from + duration
+
+    async def worker() -> None:
+        while True:
+            started = loop.time()
+            if started >= stop_at:
+                return
+            name = rng.choices(names, weights)[0]
+            method, path = ROUTES[name]
+            url = path.replace("{id}", rng.choice(id_pool))
+            body = _CREATE_DEFECT_BODY if method == "POST" else None
+
+            wall_started = time.perf_counter()
+            try:
+                response = await client.request(method, url, headers=headers, json=body)
+                await response.aread()
+                status, ok = str(response.status_code), response.status_code < 400
+            except httpx.HTTPError as exc:
+                status, ok = type(exc).__name__, False
+            if started >= measure_from:
+                routes[name].record(time.perf_counter() - wall_started, status, ok)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return LoadResult(elapsed=duration, routes=routes)
+
+
+def format_report(result: dict) -> str:
+    """Plain-text table of LoadResult.to_dict()."""
+    header = f"{'route':<16}{'requests':>10}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+    lines = [header, "-" * len(header)]
+    rows = list(result["routes"].items()) + [("TOTAL", result["total"])]
+    for name, row in rows:
+        lines.append(
+            f"{name:<16}{row['requests']:>10}{row['errors']:>8}{row['rps']:>10}"
+            f"{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}{row['max_ms']:>10}"
+        )
+    lines.append(f"measured for {result['elapsed_s']} s; statuses: {result['total']['statuses']}")
+    return "\n".join(lines)
@@ -0,0 +1,125 @@
+import asyncio
+import json
+import random
+import socket
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import uvicorn
+from starlette.types import Receive, Scope, Send
+
+
+@dataclass(frozen=True)
+class StubConfig:
+    """
+    Behaviour of a stub upstream.
+
+    Attributes:
+        latency_ms: time the stub "works" on each request before answering
+        jitter_ms: random extra latency, uniform in [0, jitter_ms]
+        payload_bytes: approximate size of the JSON body of every answer
+    """
+
+    latency_ms: float = 5.0
+    jitter_ms: float = 0.0
+    payload_bytes: int = 1024
+
+
+def stub_payload(size: int) -> bytes:
+    """Success envelope like the real services return, with a list padded to about `size` bytes."""
+    item = {
+        "id": "00000000-0000-0000-0000-000000000001",
+        "title": "Benchmark item",
+        "status": "NEW",
+        "priority": "MEDIUM",
+        "description": "x" * 64,
+    }
+    items = [item]
+    while len(json.dumps({"success": True, "data": items})) < size:
+        items.append(item)
+    return json.dumps({"success": True, "data": items}, separators=(",", ":")).encode()
+
+
+_HEALTH_BODY = b'{"status":"running"}'
+
+
+class StubUpstream:
+    """
+    Raw ASGI app standing in for one upstream service.
+
+    Every request is answered with the same JSON body after the configured
+    latency; GET / answers at once, so gateway health checks keep the stub
+    in rotation. Kept as small as possible so the measured time is the
+    gateway's, not the stub's.
+    """
+
+    def __init__(self, name: str, config: StubConfig, seed: Optional[int] = None):
+        self.name = name
+        self.config = config
+        self.body = stub_payload(config.payload_bytes)
+        self.requests = 0
+        self._random = random.Random(seed)
+
+    def _latency(self) -> float:
+        jitter = self._random.uniform(0, self.config.jitter_ms) if self.config.jitter_ms else 0.0
+        return (self.config.latency_ms + jitter) / 1000
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        # drain the request body (uploads, POST/PATCH payloads)
+        message = await receive()
+        while message.get("more_body"):
+            message = await receive()
+
+        if scope["path"] == "/":
+            body, status = _HEALTH_BODY, 200
+        else:
+            self.requests += 1
+            await asyncio.sleep(self._latency())
+            body, status = self.body, 201 if scope["method"] == "POST" else 200
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+def free_port(host: str = "127.0.0.1") -> int:
+    """A currently unused TCP port on the host."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+async def serve(app, host: str, port: int) -> Tuple[uvicorn.Server, asyncio.Task]:
+    """Run an ASGI app with uvicorn in the current event loop; returns once it accepts connections."""
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning", access_log=False))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()
+            raise RuntimeError(f"Server on {host}:{port} exited during startup")
+        await asyncio.sleep(0.01)
+    return server, task
+
+
+async def shutdown(server: uvicorn.Server, task: asyncio.Task) -> None:
+    server.should_exit = True
+    await task
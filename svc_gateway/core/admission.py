@@ -0,0 +1,172 @@
+import math
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Hashable, Optional, Tuple
+
+from fastapi import HTTPException, status
+from starlette.requests import Request
+
+from core.config import settings
+from core.metrics import ADMISSION_REJECTED
+
+# Route classes with their own per-user rate and gateway-wide concurrency cap;
+# every other route is "default" and only subject to the per-user limit
+LIMITED_ROUTE_CLASSES = ("reports", "export", "upload")
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, at most `burst` tokens."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated_at = time.monotonic()
+
+    def try_take(self) -> Tuple[bool, float]:
+        """
+        Take one token.
+
+        Returns:
+            (True, 0) if admitted, otherwise (False, seconds until a token is available)
+        """
+        now = time.monotonic()
+        self._tokens = min(self._tokens + (now - self._updated_at) * self.rate, self.burst)
+        self._updated_at = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True, 0.0
+        return False, (1.0 - self._tokens) / self.rate if self.rate > 0 else 60.0
+
+
+class AdmissionController:
+    """
+    Load shedding at the gateway entrance.
+
+    Checks, in order: the per-user bucket (RATE_LIMIT_RPS, per-role override;
+    keyed by user and role, so a changed role gets a bucket at its own rate),
+    the per-user bucket of the route class (same rate for every role) and the
+    route class concurrency cap. Over-limit requests are rejected immediately (429 for rate limits,
+    503 for concurrency) with Retry-After instead of queueing. Buckets of
+    idle clients are dropped LRU-wise past ADMISSION_MAX_TRACKED_KEYS.
+    """
+
+    def __init__(self):
+        self._buckets: "OrderedDict[Hashable, TokenBucket]" = OrderedDict()
+        self._in_flight: Dict[str, int] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def _class_counters(self, route_class: str) -> Dict[str, int]:
+        if route_class not in self._counters:
+            self._counters[route_class] = {
+                "admitted_total": 0,
+                "rate_limited_total": 0,
+                "shed_total": 0,
+            }
+        return self._counters[route_class]
+
+    def _bucket(self, key: Hashable, rate: float, burst: float) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(rate, burst)
+            while len(self._buckets) > settings.ADMISSION_MAX_TRACKED_KEYS:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def _reject(
+        self, route_class: str, status_code: int, counter: str, detail: str, retry_after: float
+    ) -> None:
+        self._class_counters(route_class)[counter] += 1
+        ADMISSION_REJECTED.labels(route_class, counter.removesuffix("_total")).inc()
+        raise HTTPException(
+            status_code=status_code,
+            detail=detail,
+            headers={"Retry-After": str(max(math.ceil(retry_after), 1))},
+        )
+
+    @asynccontextmanager
+    async def admit(self, route_class: str, client_key: str, role: Optional[str]) -> AsyncIterator[None]:
+        """
+        Hold an admission slot for the duration of the block.
+
+        Raises:
+            HTTPException 429: If the client exceeded its rate limit
+            HTTPException 503: If the route class is at its concurrency cap
+        """
+        rps = settings.role_rate_limit(role)
+        burst = settings.RATE_LIMIT_BURST * rps / settings.RATE_LIMIT_RPS
+        ok, wait = self._bucket((client_key, role, None), rps, burst).try_take()
+        if not ok:
+            self._reject(
+                route_class,
+                status.HTTP_429_TOO_MANY_REQUESTS,
+                "rate_limited_total",
+                "Rate limit exceeded",
+                wait,
+            )
+
+        if route_class not in LIMITED_ROUTE_CLASSES:
+            self._class_counters(route_class)["admitted_total"] += 1
+            yield
+            return
+
+        limits = settings.route_class_limits(route_class)
+        # Burst: ten seconds worth of the class rate, at least one request
+        class_bucket = self._bucket(
+            (client_key, route_class),
+            limits["rate_per_minute"] / 60.0,
+            max(limits["rate_per_minute"] / 6.0, 1.0),
+        )
+        ok, wait = class_bucket.try_take()
+        if not ok:
+            self._reject(
+                route_class,
+                status.HTTP_429_TOO_MANY_REQUESTS,
+                "rate_limited_total",
+                f"Rate limit exceeded for {route_class} requests",
+                wait,
+            )
+
+        if self._in_flight.get(route_class, 0) >= limits["max_concurrency"]:
+            self._reject(
+                route_class,
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                "shed_total",
+                f"Too many concurrent {route_class} requests, try again later",
+                1.0,
+            )
+
+        self._class_counters(route_class)["admitted_total"] += 1
+        self._in_flight[route_class] = self._in_flight.get(route_class, 0) + 1
+        try:
+            yield
+        finally:
+            self._in_flight[route_class] -= 1
+
+    def reset(self) -> None:
+        self._buckets.clear()
+        self._in_flight.clear()
+        self._counters.clear()
+
+    def stats(self) -> dict:
+        classes = {}
+        for route_class in ("default",) + LIMITED_ROUTE_CLASSES:
+            entry = {"in_flight": self._in_flight.get(route_class, 0), **self._class_counters(route_class)}
+            if route_class in LIMITED_ROUTE_CLASSES:
+                entry.update(settings.route_class_limits(route_class))
+            classes[route_class] = entry
+        return {"tracked_clients": len(self._buckets), "classes": classes}
+
+
+admission = AdmissionController()
+
+
+def client_key(request: Request, current_user: Optional[dict]) -> str:
+    """Rate limit key: JWT sub for authenticated requests, client IP otherwise."""
+    if current_user is not None:
+        return f"user:{current_user['user_id']}"
+    host = request.client.host if request.client is not None else "unknown"
+    return f"ip:{host}"
@@ -2,6 +2,7 @@ import jwt
 from fastapi import HTTPException, status
 
 from core.config import settings
+from core.timing import timed
 
 
 def decode_access_token(token: str) -> dict:
@@ -18,9 +19,10 @@ def decode_access_token(token: str) -> dict:
         HTTPException 401: If token is invalid or expired
     """
     try:
-        payload = jwt.decode(
-            token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
-        )
+        with timed("auth"):
+            payload = jwt.decode(
+                token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
+            )
         return payload
     except jwt.ExpiredSignatureError:
         raise HTTPException(
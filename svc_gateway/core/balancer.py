@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import random
+from typing import Dict, List, Optional
+
+import httpx
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Instance:
+    """One instance of an upstream service and its load/health state."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.healthy = True
+        self.outstanding = 0
+        self.requests_total = 0
+        self.ejections_total = 0
+        self._failures = 0
+        self._successes = 0
+
+    def record_check(self, ok: bool) -> None:
+        """
+        Account a health check (or a connection failure of a real request).
+
+        An instance is ejected after HEALTH_CHECK_UNHEALTHY_THRESHOLD failures
+        in a row and readmitted after HEALTH_CHECK_HEALTHY_THRESHOLD successes.
+        """
+        if ok:
+            self._failures = 0
+            self._successes += 1
+            if not self.healthy and self._successes >= settings.HEALTH_CHECK_HEALTHY_THRESHOLD:
+                self.healthy = True
+                logger.info("Upstream instance %s readmitted", self.url)
+            return
+
+        self._successes = 0
+        self._failures += 1
+        if self.healthy and self._failures >= settings.HEALTH_CHECK_UNHEALTHY_THRESHOLD:
+            self.healthy = False
+            self.ejections_total += 1
+            logger.warning("Upstream instance %s ejected", self.url)
+
+    def stats(self) -> dict:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "outstanding": self.outstanding,
+            "requests_total": self.requests_total,
+            "ejections_total": self.ejections_total,
+        }
+
+
+class Balancer:
+    """
+    Power-of-two-choices balancer over the instances of one upstream.
+
+    Two random healthy instances are sampled and the one with fewer
+    outstanding requests wins. If every instance is ejected, all of them are
+    used again (panic mode) rather than failing every request.
+    """
+
+    def __init__(self, service: str, urls: List[str]):
+        self.service = service
+        self.instances = [Instance(url) for url in urls]
+
+    def pick(self) -> Instance:
+        candidates = [instance for instance in self.instances if instance.healthy] or self.instances
+        if len(candidates) == 1:
+            return candidates[0]
+        first, second = random.sample(candidates, 2)
+        return first if first.outstanding <= second.outstanding else second
+
+    def acquire(self) -> Instance:
+        instance = self.pick()
+        instance.outstanding += 1
+        instance.requests_total += 1
+        return instance
+
+    @staticmethod
+    def release(instance: Instance) -> None:
+        instance.outstanding -= 1
+
+    def stats(self) -> List[dict]:
+        return [instance.stats() for instance in self.instances]
+
+
+_balancers: Dict[str, Balancer] = {}
+_health_task: Optional[asyncio.Task] = None
+
+
+def balancer_for(service: str) -> Balancer:
+    """Balancer of an upstream service, built from its (comma-separated) URL setting."""
+    balancer = _balancers.get(service)
+    if balancer is None:
+        balancer = _balancers[service] = Balancer(service, settings.service_urls(service))
+    return balancer
+
+
+def reset() -> None:
+    """Forget all instance state (the next request rebuilds it from settings)."""
+    _balancers.clear()
+
+
+def balancer_stats(services) -> Dict[str, List[dict]]:
+    return {service: balancer_for(service).stats() for service in services}
+
+
+async def check_instance(client: httpx.AsyncClient, instance: Instance) -> None:
+    """Probe the instance health endpoint (GET /); any 2xx answer is healthy."""
+    try:
+        response = await client.get(f"{instance.url}/", timeout=settings.HEALTH_CHECK_TIMEOUT)
+        ok = response.is_success
+    except httpx.HTTPError:
+        ok = False
+    instance.record_check(ok)
+
+
+async def _health_loop(services, get_client) -> None:
+    while True:
+        await asyncio.sleep(settings.HEALTH_CHECK_INTERVAL)
+        checks = [
+            check_instance(get_client(service), instance)
+            for service in services
+            for instance in balancer_for(service).instances
+        ]
+        await asyncio.gather(*checks)
+
+
+def start_health_checks(services, get_client) -> None:
+    """Start the background health probes (called from the lifespan)."""
+    global _health_task
+    if settings.HEALTH_CHECK_ENABLED and _health_task is None:
+        _health_task = asyncio.create_task(_health_loop(services, get_client))
+
+
+async def stop_health_checks() -> None:
+    global _health_task
+    task, _health_task = _health_task, None
+    if task is not None:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,118 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float
+    tags: Tuple[str, ...]
+
+
+class ResponseCache:
+    """
+    Bounded in-process LRU cache with per-entry TTL and tag invalidation.
+
+    Entries are tagged (e.g. "defect:<id>", "reports") when stored; a write
+    invalidates every entry carrying one of its tags. Tags hash into a fixed
+    number of generation counters: a value fetched before an invalidation of
+    one of its tags is not stored, so a slow read racing a write cannot put
+    stale data back into the cache. Tags sharing a slot only cost a skipped
+    store, and memory stays bounded however many ids get invalidated.
+    """
+
+    def __init__(self, max_entries: int, generation_slots: int = 4096):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._by_tag: Dict[str, Set[Hashable]] = {}
+        self._generations: List[int] = [0] * generation_slots
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._counters["misses"] += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self._counters["expirations"] += 1
+            self._counters["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self._counters["hits"] += 1
+        return entry.value
+
+    def generation(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        """Current generations of the tags; pass the result to set()."""
+        return tuple(self._generations[self._slot(tag)] for tag in tags)
+
+    def _slot(self, tag: str) -> int:
+        return hash(tag) % len(self._generations)
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: float,
+        tags: Tuple[str, ...] = (),
+        generation: Optional[Tuple[int, ...]] = None,
+    ) -> bool:
+        """
+        Store a value; returns False if one of its tags was invalidated
+        after `generation` was taken.
+        """
+        if generation is not None and generation != self.generation(tags):
+            return False
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = _Entry(value, time.monotonic() + ttl, tags)
+        for tag in tags:
+            self._by_tag.setdefault(tag, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._counters["evictions"] += 1
+        return True
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        """Drop every entry with one of the tags; returns the number of entries dropped."""
+        dropped = 0
+        for tag in tags:
+            self._generations[self._slot(tag)] += 1
+            for key in list(self._by_tag.get(tag, ())):
+                self._remove(key)
+                dropped += 1
+        self._counters["invalidations"] += dropped
+        return dropped
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_tag.clear()
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            **self._counters,
+        }
@@ -1,5 +1,7 @@
 from pathlib import Path
+from typing import List, Optional
 
+from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -16,12 +18,111 @@ class Settings(BaseSettings):
     APP_HOST: str = "0.0.0.0"
     APP_PORT: int = 8000
 
-    # External Services
+    # External Services (one URL or a comma-separated list of instances)
     AUTH_SERVICE_URL: str
     PROJECTS_SERVICE_URL: str
     DEFECTS_SERVICE_URL: str
     REPORTS_SERVICE_URL: str
 
+    # Upstream connection pools (one long-lived httpx.AsyncClient per service)
+    AUTH_POOL_MAX_CONNECTIONS: int = 50
+    AUTH_POOL_MAX_KEEPALIVE: int = 20
+    AUTH_POOL_KEEPALIVE_EXPIRY: float = 30.0
+    AUTH_HTTP2: bool = False
+
+    PROJECTS_POOL_MAX_CONNECTIONS: int = 50
+    PROJECTS_POOL_MAX_KEEPALIVE: int = 20
+    PROJECTS_POOL_KEEPALIVE_EXPIRY: float = 30.0
+    PROJECTS_HTTP2: bool = False
+
+    DEFECTS_POOL_MAX_CONNECTIONS: int = 100
+    DEFECTS_POOL_MAX_KEEPALIVE: int = 40
+    DEFECTS_POOL_KEEPALIVE_EXPIRY: float = 30.0
+    DEFECTS_HTTP2: bool = False
+
+    REPORTS_POOL_MAX_CONNECTIONS: int = 20
+    REPORTS_POOL_MAX_KEEPALIVE: int = 10
+    REPORTS_POOL_KEEPALIVE_EXPIRY: float = 30.0
+    REPORTS_HTTP2: bool = False
+
+    # Max time to wait for a free pooled connection before failing
+    UPSTREAM_POOL_TIMEOUT: float = 2.0
+
+    # Circuit breaker per upstream: opens after N consecutive failures
+    # (network errors, timeouts, 5xx) and lets a probe through after the reset timeout
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RESET_TIMEOUT: float = 10.0
+    CIRCUIT_HALF_OPEN_MAX_CALLS: int = 1
+
+    # Retry budget per upstream: retries are capped at RATIO of the requests,
+    # plus MIN_PER_SECOND so low-traffic upstreams can still be retried
+    RETRY_BUDGET_RATIO: float = 0.1
+    RETRY_BUDGET_MIN_PER_SECOND: float = 1.0
+    RETRY_BUDGET_MAX_TOKENS: float = 10.0
+
+    # Active health checks of upstream instances (GET / of each instance)
+    HEALTH_CHECK_ENABLED: bool = True
+    HEALTH_CHECK_INTERVAL: float = 5.0
+    HEALTH_CHECK_TIMEOUT: float = 1.0
+    HEALTH_CHECK_UNHEALTHY_THRESHOLD: int = 2
+    HEALTH_CHECK_HEALTHY_THRESHOLD: int = 2
+
+    # Response cache for read endpoints (per user/role scope, in-process LRU + TTL).
+    # A TTL of 0 disables caching of the route group
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1000
+    RESPONSE_CACHE_MAX_ENTRY_BYTES: int = 1024 * 1024
+    CACHE_TTL_PROJECTS: float = 30.0
+    CACHE_TTL_DEFECTS: float = 15.0
+    CACHE_TTL_REPORTS: float = 60.0
+
+    # Attachment uploads are streamed to svc_defects; the limit is enforced on the
+    # raw multipart body (file size + room for the form boundaries and fields)
+    ATTACHMENT_MAX_SIZE: int = 10 * 1024 * 1024
+    ATTACHMENT_MULTIPART_OVERHEAD: int = 64 * 1024
+    ATTACHMENT_UPLOAD_TIMEOUT: float = 30.0
+
+    # Defect change stream (SSE): longest gap between upstream chunks; svc_defects
+    # sends heartbeats well within it (SSE_HEARTBEAT_INTERVAL)
+    SSE_READ_TIMEOUT: float = 60.0
+
+    # Admission control: per-user token buckets (keyed by JWT sub, by client IP for
+    # public routes) and per-route-class limits. Over-limit requests get 429/503 + Retry-After
+    ADMISSION_ENABLED: bool = True
+    RATE_LIMIT_RPS: float = 20.0
+    RATE_LIMIT_BURST: int = 40
+    # Per-role overrides of RATE_LIMIT_RPS, e.g. "ADMIN:50,MANAGER:30" (burst scales with it)
+    RATE_LIMIT_ROLE_RPS: str = "ADMIN:50,MANAGER:30"
+    ADMISSION_MAX_TRACKED_KEYS: int = 10000
+
+    # Route classes: requests per minute per user and concurrent requests for the whole gateway
+    ADMISSION_REPORTS_RATE_PER_MINUTE: float = 60.0
+    ADMISSION_REPORTS_MAX_CONCURRENCY: int = 20
+    ADMISSION_EXPORT_RATE_PER_MINUTE: float = 6.0
+    ADMISSION_EXPORT_MAX_CONCURRENCY: int = 4
+    ADMISSION_UPLOAD_RATE_PER_MINUTE: float = 60.0
+    ADMISSION_UPLOAD_MAX_CONCURRENCY: int = 50
+
+    # POST /api/v1/batch: maximum number of sub-requests in one batch
+    BATCH_MAX_REQUESTS: int = 20
+
+    # GET /api/v1/views/defects/{id}: size of the comments page and of the recent history
+    VIEW_COMMENTS_LIMIT: int = 20
+    VIEW_HISTORY_LIMIT: int = 10
+
+    # GET /metrics: Prometheus scrapes with "Authorization: Bearer <METRICS_TOKEN>";
+    # without it (or with another token) only ADMIN users get the metrics
+    METRICS_TOKEN: Optional[str] = None
+
+    # Tracing (W3C traceparent): "none", "jsonl" (one JSON span per line in
+    # TRACING_JSONL_PATH) or a custom exporter class as "package.module:ClassName"
+    TRACING_EXPORTER: str = "none"
+    TRACING_JSONL_PATH: str = "/tmp/traces/svc_gateway.jsonl"
+
+    # Trusted-internal mode: forward the user verified here in a signed
+    # X-Verified-Identity header so services skip decoding the JWT again.
+    # Enable only when services are reachable from the gateway alone
+    TRUSTED_IDENTITY_ENABLED: bool = False
+
     # CORS
     ALLOWED_ORIGINS: str = "*"
 
@@ -29,5 +130,53 @@ class Settings(BaseSettings):
         env_file=str(BASE_DIR / ".env"), case_sensitive=True, extra="ignore"
     )
 
+    @field_validator("RATE_LIMIT_RPS")
+    @classmethod
+    def _positive_rate_limit(cls, value: float) -> float:
+        # The per-user burst scales by rps / RATE_LIMIT_RPS; a limit cannot be switched off with 0
+        if value <= 0:
+            raise ValueError("RATE_LIMIT_RPS must be greater than 0")
+        return value
+
+    @field_validator("RATE_LIMIT_ROLE_RPS")
+    @classmethod
+    def _positive_role_rate_limits(cls, value: str) -> str:
+        for item in value.split(","):
+            name, _, rps = item.partition(":")
+            if rps.strip() and float(rps) <= 0:
+                raise ValueError(f"RATE_LIMIT_ROLE_RPS for {name.strip()} must be greater than 0")
+        return value
+
+    def service_urls(self, service: str) -> List[str]:
+        """Base URLs of all instances of an upstream service (auth, projects, defects, reports)."""
+        value = getattr(self, f"{service.upper()}_SERVICE_URL")
+        return [url.strip().rstrip("/") for url in value.split(",") if url.strip()]
+
+    def role_rate_limit(self, role: Optional[str]) -> float:
+        """Requests per second allowed for one user of the role."""
+        for item in self.RATE_LIMIT_ROLE_RPS.split(","):
+            name, _, rps = item.partition(":")
+            if role and name.strip() == role and rps.strip():
+                return float(rps)
+        return self.RATE_LIMIT_RPS
+
+    def route_class_limits(self, route_class: str) -> dict:
+        """Per-user rate and gateway-wide concurrency of a route class (reports, export, upload)."""
+        prefix = f"ADMISSION_{route_class.upper()}"
+        return {
+            "rate_per_minute": getattr(self, f"{prefix}_RATE_PER_MINUTE"),
+            "max_concurrency": getattr(self, f"{prefix}_MAX_CONCURRENCY"),
+        }
+
+    def upstream_pool(self, service: str) -> dict:
+        """Connection pool options of an upstream service."""
+        prefix = service.upper()
+        return {
+            "max_connections": getattr(self, f"{prefix}_POOL_MAX_CONNECTIONS"),
+            "max_keepalive_connections": getattr(self, f"{prefix}_POOL_MAX_KEEPALIVE"),
+            "keepalive_expiry": getattr(self, f"{prefix}_POOL_KEEPALIVE_EXPIRY"),
+            "http2": getattr(self, f"{prefix}_HTTP2"),
+        }
+
 
 settings = Settings()
@@ -0,0 +1,47 @@
+import time
+from typing import Optional
+
+from fastapi import HTTPException, status
+from starlette.requests import Request
+
+# Absolute deadline of a request as Unix time in seconds ("1760000000.250").
+# Set by the gateway on every upstream call and honoured by all services:
+# outgoing calls shrink their timeouts to the remaining budget and the
+# request is rejected with 504 once the deadline has passed.
+DEADLINE_HEADER = "X-Request-Deadline"
+
+
+def parse_deadline(value: Optional[str]) -> Optional[float]:
+    """Deadline from the header value; None if absent or malformed."""
+    if not value:
+        return None
+    try:
+        deadline = float(value)
+    except ValueError:
+        return None
+    return deadline if deadline > 0 else None
+
+
+def format_deadline(deadline: float) -> str:
+    return f"{deadline:.3f}"
+
+
+def request_deadline(request: Request, timeout: float) -> float:
+    """
+    Deadline of an upstream call: now + timeout, or the client's own
+    X-Request-Deadline if that comes first.
+    """
+    deadline = time.time() + timeout
+    client_deadline = parse_deadline(request.headers.get(DEADLINE_HEADER))
+    if client_deadline is not None:
+        deadline = min(deadline, client_deadline)
+    return deadline
+
+
+def remaining(deadline: float) -> float:
+    """Seconds left until the deadline (negative once it has passed)."""
+    return deadline - time.time()
+
+
+def deadline_exceeded() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="Request deadline exceeded")
@@ -1,13 +1,215 @@
 import asyncio
-from typing import Any, Dict, Optional
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 import httpx
 
+from core.balancer import Balancer, Instance, balancer_for
+from core.config import settings
+from core.deadline import remaining
+from core.metrics import UPSTREAM_ERRORS, UPSTREAM_LATENCY, UPSTREAM_RETRIES
+from core.resilience import IDEMPOTENT_METHODS, CircuitOpenError, breaker_for, retry_budget_for
+from core.tracing import span, trace_headers
+
+# Upstream-сервисы, к которым gateway держит собственные пулы соединений
+SERVICES = ("auth", "projects", "defects", "reports")
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+_pool_stats: Dict[str, Dict[str, int]] = {}
+
+
+def _create_client(service: str) -> httpx.AsyncClient:
+    """Создаёт долгоживущий клиент с keep-alive пулом для upstream-сервиса."""
+    pool = settings.upstream_pool(service)
+    limits = httpx.Limits(
+        max_connections=pool["max_connections"],
+        max_keepalive_connections=pool["max_keepalive_connections"],
+        keepalive_expiry=pool["keepalive_expiry"],
+    )
+    return httpx.AsyncClient(
+        limits=limits,
+        http2=pool["http2"],
+        timeout=httpx.Timeout(5.0, pool=settings.UPSTREAM_POOL_TIMEOUT),
+    )
+
+
+def _stats_for(service: str) -> Dict[str, int]:
+    if service not in _pool_stats:
+        _pool_stats[service] = {
+            "max_connections": settings.upstream_pool(service)["max_connections"],
+            "requests_total": 0,
+            "in_flight": 0,
+            "peak_in_flight": 0,
+            "saturated_total": 0,
+            "pool_timeouts_total": 0,
+        }
+    return _pool_stats[service]
+
+
+async def start_upstream_clients() -> None:
+    """Создаёт пулы для всех upstream-сервисов (вызывается из lifespan)."""
+    for service in SERVICES:
+        if service not in _clients:
+            _clients[service] = _create_client(service)
+        _stats_for(service)
+
+
+async def close_upstream_clients() -> None:
+    """Закрывает все пулы соединений (вызывается из lifespan при остановке)."""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
+def get_client(service: str) -> httpx.AsyncClient:
+    """
+    Возвращает пул соединений upstream-сервиса.
+
+    Если lifespan ещё не отработал (например, в unit-тестах), клиент
+    создаётся лениво.
+    """
+    client = _clients.get(service)
+    if client is None:
+        client = _clients[service] = _create_client(service)
+    return client
+
+
+def pool_stats() -> Dict[str, Dict[str, int]]:
+    """Счётчики загрузки пулов по каждому upstream-сервису."""
+    return {service: dict(_stats_for(service)) for service in SERVICES}
+
+
+def acquire_slot(service: str) -> None:
+    """Отмечает начало запроса к upstream и фиксирует насыщение пула."""
+    stats = _stats_for(service)
+    stats["requests_total"] += 1
+    if stats["in_flight"] >= stats["max_connections"]:
+        stats["saturated_total"] += 1
+    stats["in_flight"] += 1
+    stats["peak_in_flight"] = max(stats["peak_in_flight"], stats["in_flight"])
+
+
+def release_slot(service: str) -> None:
+    """Отмечает завершение запроса к upstream."""
+    _stats_for(service)["in_flight"] -= 1
+
+
+async def _send_with_resilience(
+    service: str,
+    method: str,
+    url: str,
+    send: Callable[[str], Awaitable[httpx.Response]],
+    *,
+    retryable: bool,
+    retries: int,
+    retry_delay: float,
+    deadline: Optional[float] = None,
+) -> httpx.Response:
+    """
+    Отправляет запрос через balancer, circuit breaker и retry budget upstream-сервиса.
+
+    Относительный url ("/api/v1/...") дополняется адресом инстанса, который
+    выбирает balancer, при каждой попытке заново; абсолютный url
+    отправляется как есть. Повторная попытка делается только если запрос
+    можно повторять (retryable), попытки не исчерпаны, в retry budget есть
+    токен и до deadline (Unix time) остаётся время после паузы. Каждая
+    попытка записывается client-span'ом трассировки; send() должен передать
+    его traceparent (trace_headers()) в upstream. Слот пула и инстанс остаются занятыми при успешном ответе:
+    освобождает их вызывающая сторона через _release_response().
+
+    Raises:
+        CircuitOpenError: если breaker upstream-сервиса открыт
+        httpx.TimeoutException | httpx.RequestError при исчерпании попыток
+    """
+    breaker = breaker_for(service)
+    budget = retry_budget_for(service)
+    balancer = balancer_for(service) if url.startswith("/") else None
+    budget.deposit()
+
+    attempt = 0
+    while True:
+        try:
+            breaker.before_call()
+        except CircuitOpenError:
+            UPSTREAM_ERRORS.labels(service, "circuit_open").inc()
+            raise
+        instance = balancer.acquire() if balancer is not None else None
+        acquire_slot(service)
+        started = time.perf_counter()
+        target = f"{instance.url}{url}" if instance is not None else url
+        try:
+            with span(
+                f"{method.upper()} {service}",
+                kind="client",
+                attributes={"peer.service": service, "http.url": target, "retry.attempt": attempt},
+            ) as client_span:
+                response = await send(target)
+                client_span.set_attribute("http.status_code", response.status_code)
+        except (httpx.TimeoutException, httpx.RequestError) as exc:
+            _release(service, instance)
+            breaker.record_failure()
+            UPSTREAM_LATENCY.labels(service, "error").observe(time.perf_counter() - started)
+            UPSTREAM_ERRORS.labels(service, _error_reason(exc)).inc()
+            if isinstance(exc, httpx.PoolTimeout):
+                _stats_for(service)["pool_timeouts_total"] += 1
+            if isinstance(exc, httpx.ConnectError) and instance is not None:
+                instance.record_check(False)
+            if not retryable or attempt >= retries:
+                raise
+            if deadline is not None and remaining(deadline) <= retry_delay * (attempt + 1):
+                raise
+            if not budget.try_withdraw():
+                raise
+            attempt += 1
+            UPSTREAM_RETRIES.labels(service).inc()
+            await asyncio.sleep(retry_delay * attempt)
+            continue
+        except BaseException:
+            _release(service, instance)
+            breaker.abandon_call()
+            raise
+
+        UPSTREAM_LATENCY.labels(service, f"{response.status_code // 100}xx").observe(
+            time.perf_counter() - started
+        )
+        if response.status_code >= 500:
+            UPSTREAM_ERRORS.labels(service, "5xx").inc()
+        breaker.record_response(response)
+        response.extensions["gateway_instance"] = instance
+        return response
+
+
+def _error_reason(exc: httpx.RequestError) -> str:
+    if isinstance(exc, httpx.TimeoutException):
+        return "timeout"
+    if isinstance(exc, httpx.ConnectError):
+        return "connect"
+    return "network"
+
+
+def _release(service: str, instance: Optional[Instance]) -> None:
+    release_slot(service)
+    if instance is not None:
+        Balancer.release(instance)
+
+
+def _release_response(service: str, response: httpx.Response) -> None:
+    _release(service, response.extensions.get("gateway_instance"))
+
+
+def _attempt_timeout(timeout: float, deadline: Optional[float]) -> httpx.Timeout:
+    """Таймаут попытки: timeout, урезанный до оставшегося до deadline времени."""
+    if deadline is not None:
+        timeout = max(min(timeout, remaining(deadline)), 0.001)
+    return httpx.Timeout(timeout, pool=settings.UPSTREAM_POOL_TIMEOUT)
+
 
 async def request_with_retry(
     method: str,
     url: str,
     *,
+    service: str,
     headers: Optional[Dict[str, str]] = None,
     params: Optional[Dict[str, Any]] = None,
     json: Any = None,
@@ -15,44 +217,119 @@ async def request_with_retry(
     timeout: float = 5.0,
     retries: int = 2,
     retry_delay: float = 0.2,
+    deadline: Optional[float] = None,
 ) -> httpx.Response:
     """
-    Выполняет HTTP запрос с простым механизмом retry.
+    Выполняет HTTP запрос через пул upstream-сервиса с retry и circuit breaker.
+
+    Повторяются только идемпотентные методы (GET, HEAD, OPTIONS, PUT, DELETE)
+    и только пока это позволяет retry budget upstream-сервиса.
 
     Args:
         method: HTTP метод
-        url: целевой URL
+        url: путь в upstream-сервисе ("/api/v1/...", инстанс выбирает balancer)
+            или абсолютный URL
+        service: upstream-сервис (auth, projects, defects, reports), чей пул используется
         headers/params/json/files: параметры httpx.request
         timeout: таймаут одного запроса
-        retries: количество повторных попыток
+        retries: максимальное количество повторных попыток
         retry_delay: базовая задержка между попытками
+        deadline: абсолютный срок запроса (Unix time); таймаут каждой попытки
+            урезается до оставшегося времени
 
     Returns:
         httpx.Response
 
     Raises:
+        CircuitOpenError: если breaker upstream-сервиса открыт
         httpx.TimeoutException | httpx.RequestError при исчерпании попыток
     """
-    last_exception: Optional[Exception] = None
+    client = get_client(service)
+
+    async def send(target: str) -> httpx.Response:
+        return await client.request(
+            method=method,
+            url=target,
+            headers={**(headers or {}), **trace_headers()},
+            params=params,
+            json=json,
+            files=files,
+            timeout=_attempt_timeout(timeout, deadline),
+        )
+
+    response = await _send_with_resilience(
+        service,
+        method,
+        url,
+        send,
+        retryable=method.upper() in IDEMPOTENT_METHODS,
+        retries=retries,
+        retry_delay=retry_delay,
+        deadline=deadline,
+    )
+    _release_response(service, response)
+    return response
+
+
+async def send_streaming(
+    method: str,
+    url: str,
+    *,
+    service: str,
+    headers: Optional[Dict[str, str]] = None,
+    content: Any = None,
+    timeout: float = 5.0,
+    retries: int = 2,
+    retry_delay: float = 0.2,
+    deadline: Optional[float] = None,
+) -> httpx.Response:
+    """
+    Отправляет запрос в upstream без буферизации ответа.
+
+    Тело запроса (content) передаётся как есть, в том числе async-итератором,
+    тело ответа читается вызывающей стороной через aiter_raw(). Повторные
+    попытки выполняются только для идемпотентных запросов без тела:
+    потоковое тело нельзя отправить второй раз. Таймауты попыток урезаются
+    до оставшегося до deadline времени, как в request_with_retry.
+
+    Returns:
+        httpx.Response с неоткрытым телом; после чтения обязательно вызвать
+        close_streaming(service, response)
+
+    Raises:
+        CircuitOpenError: если breaker upstream-сервиса открыт
+        httpx.TimeoutException | httpx.RequestError при исчерпании попыток
+    """
+    client = get_client(service)
+
+    async def send(target: str) -> httpx.Response:
+        request = client.build_request(
+            method,
+            target,
+            headers={**(headers or {}), **trace_headers()},
+            content=content,
+            timeout=_attempt_timeout(timeout, deadline),
+        )
+        return await client.send(request, stream=True)
+
+    return await _send_with_resilience(
+        service,
+        method,
+        url,
+        send,
+        retryable=content is None and method.upper() in IDEMPOTENT_METHODS,
+        retries=retries,
+        retry_delay=retry_delay,
+        deadline=deadline,
+    )
 
-    for attempt in range(retries + 1):
-        try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    params=params,
-                    json=json,
-                    files=files,
-                )
-                return response
-        except (httpx.TimeoutException, httpx.RequestError) as exc:
-            last_exception = exc
-            if attempt == retries:
-                raise
-            await asyncio.sleep(retry_delay * (attempt + 1))
 
-    if last_exception:
-        raise last_exception
-    raise RuntimeError("request_with_retry failed without exception")
+async def close_streaming(service: str, response: httpx.Response) -> None:
+    """Закрывает потоковый ответ и возвращает соединение в пул (идемпотентно)."""
+    if response.extensions.get("gateway_released"):
+        return
+    response.extensions["gateway_released"] = True
+    try:
+        await response.aclose()
+    finally:
+        _release_response(service, response)
@@ -0,0 +1,80 @@
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+# With several uvicorn workers every process writes its samples to
+# PROMETHEUS_MULTIPROC_DIR and /metrics merges them (prometheus_client
+# multiprocess mode); the directory must be emptied before the workers start.
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+REQUEST_LATENCY = Histogram(
+    "gateway_request_duration_seconds",
+    "Time to serve a gateway request, by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    "gateway_response_size_bytes",
+    "Size of the response body sent to the client, by route template",
+    ["method", "route"],
+    buckets=SIZE_BUCKETS,
+)
+IN_FLIGHT = Gauge(
+    "gateway_requests_in_flight",
+    "Requests currently being served by the gateway",
+    multiprocess_mode="livesum",
+)
+UPSTREAM_LATENCY = Histogram(
+    "gateway_upstream_duration_seconds",
+    "Time until an upstream answered (response headers), per attempt",
+    ["service", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+UPSTREAM_ERRORS = Counter(
+    "gateway_upstream_errors_total",
+    "Failed upstream attempts: timeout, connect, other network errors, circuit_open, 5xx",
+    ["service", "reason"],
+)
+UPSTREAM_RETRIES = Counter(
+    "gateway_upstream_retries_total",
+    "Retried upstream attempts",
+    ["service"],
+)
+ADMISSION_REJECTED = Counter(
+    "gateway_admission_rejected_total",
+    "Requests shed by admission control",
+    ["route_class", "reason"],
+)
+CACHE_LOOKUPS = Counter(
+    "gateway_cache_lookups_total",
+    "Response cache lookups",
+    ["result"],
+)
+
+
+def render_metrics() -> tuple:
+    """Metrics in the Prometheus text format: (body, content type)."""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Drop the live gauges of this worker on shutdown (multiprocess mode only)."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
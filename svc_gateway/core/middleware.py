@@ -1,27 +1,149 @@
+import time
 import uuid
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
 
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
+from core.config import settings
+from core.metrics import IN_FLIGHT, REQUEST_LATENCY, RESPONSE_SIZE
+from core.timing import server_timing_header, start_request_timings
+from core.tracing import TRACEPARENT_HEADER, span
+
+
+class RequestIDMiddleware:
     """
-    Middleware to generate and attach X-Request-ID to each request.
+    Pure ASGI middleware to generate and attach X-Request-ID to each request.
 
     If the client provides X-Request-ID header, it will be preserved.
     Otherwise, a new UUID will be generated.
+
+    Also adds a Server-Timing header (auth, upstream wait, gateway processing,
+    total) measured up to the moment the response headers are sent, with
+    Timing-Allow-Origin for the CORS origins so the frontend can read it. Unlike
+    BaseHTTPMiddleware, no extra task or body wrapping is involved, so
+    streamed responses pass through untouched.
     """
 
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.timing_allow_origin = ", ".join(
+            origin.strip() for origin in settings.ALLOWED_ORIGINS.split(",") if origin.strip()
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Get existing request ID from header or generate new one
-        request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
+        request_id = Headers(scope=scope).get("x-request-id") or str(uuid.uuid4())
 
         # Store request_id in request state for access in routes
-        request.state.request_id = request_id
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        timings = start_request_timings()
+        started = time.perf_counter()
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = request_id
+                headers.append("Server-Timing", server_timing_header(timings, time.perf_counter() - started))
+                headers["Timing-Allow-Origin"] = self.timing_allow_origin
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+def _route_template(scope: Scope) -> str:
+    """
+    Full route template of a matched request, e.g. /api/v1/defects/{defect_id}.
+
+    Rebuilt from the path and the path params set by the router, so it does
+    not depend on how included routers store their prefixes.
+    """
+    if scope.get("route") is None:
+        return "unmatched"
+    names = {str(value): name for name, value in scope.get("path_params", {}).items()}
+    return "/".join(
+        f"{{{names[segment]}}}" if segment in names else segment
+        for segment in scope["path"].split("/")
+    )
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording Prometheus request metrics.
+
+    Latency and response size are labelled with the route template
+    (e.g. /api/v1/defects/{defect_id}) rather than the raw path, so the
+    number of series stays bounded; unmatched paths share one label.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+        size = 0
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            IN_FLIGHT.dec()
+            route = _route_template(scope)
+            method = scope["method"]
+            REQUEST_LATENCY.labels(method, route, str(status_code)).observe(time.perf_counter() - started)
+            RESPONSE_SIZE.labels(method, route).observe(size)
+
+
+class TracingMiddleware:
+    """
+    Pure ASGI middleware opening the server span of every request.
+
+    A valid incoming traceparent is continued, otherwise a new trace starts
+    here; upstream calls made while handling the request become child spans
+    and carry their traceparent to the services (see core.http). The span
+    is named after the route template and records the response status.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Process the request
-        response = await call_next(request)
+        traceparent = Headers(scope=scope).get(TRACEPARENT_HEADER)
+        with span(scope["method"], kind="server", traceparent=traceparent) as server_span:
+            server_span.set_attribute("http.method", scope["method"])
+            server_span.set_attribute("http.target", scope["path"])
 
-        # Add request ID to response headers
-        response.headers["X-Request-ID"] = request_id
+            async def send_with_status(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    server_span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        server_span.status = "error"
+                await send(message)
 
-        return response
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = _route_template(scope)
+                server_span.name = f"{scope['method']} {route}"
+                server_span.set_attribute("http.route", route)
@@ -0,0 +1,472 @@
+import hashlib
+import math
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+import httpx
+from fastapi import HTTPException, status
+from starlette.background import BackgroundTask
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+
+from core.config import settings
+from core.deadline import DEADLINE_HEADER, deadline_exceeded, format_deadline, remaining, request_deadline
+from core.metrics import CACHE_LOOKUPS
+from core.http import close_streaming, send_streaming
+from core.identity import IDENTITY_HEADER, sign_identity
+from core.cache import ResponseCache
+from core.resilience import CircuitOpenError
+from core.singleflight import SingleFlight
+from core.timing import timed
+
+# Hop-by-hop headers (RFC 7230, section 6.1) are connection-specific and never forwarded
+HOP_BY_HOP_HEADERS = frozenset(
+    {
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "te",
+        "trailer",
+        "transfer-encoding",
+        "upgrade",
+    }
+)
+
+# Human-readable upstream names used in gateway error messages
+SERVICE_LABELS = {
+    "auth": "Auth service",
+    "projects": "Projects service",
+    "defects": "Defects service",
+    "reports": "Reports service",
+}
+
+# Shared by all routes marked with coalesce or cache_ttl
+single_flight = SingleFlight()
+response_cache = ResponseCache(max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES)
+
+# Default per-service timeouts (seconds)
+SERVICE_TIMEOUTS = {
+    "auth": 5.0,
+    "projects": 5.0,
+    "defects": 5.0,
+    "reports": 30.0,
+}
+
+
+@dataclass(frozen=True)
+class ProxyRoute:
+    """
+    One row of a gateway route table.
+
+    Attributes:
+        method: HTTP method accepted by the gateway
+        path: gateway path, relative to the router prefix (may contain {params})
+        service: upstream service key (auth, projects, defects, reports)
+        upstream_path: upstream path template, formatted with the path params
+        auth_required: whether the gateway validates the JWT before proxying
+        timeout: upstream timeout override (defaults to SERVICE_TIMEOUTS)
+        summary: short description shown in the OpenAPI docs
+        max_body_size: request body limit in bytes, enforced while streaming
+        coalesce: share one upstream call between identical concurrent GETs
+        cache_ttl: cache successful GET responses for this many seconds (None/0: off)
+        cache_tags: tags of cached responses, formatted with the path params
+        invalidates: tags invalidated by a successful (2xx/3xx) write through this route
+        route_class: admission control class (default, reports, export, upload)
+        etag: tag JSON GET responses with a strong ETag and answer If-None-Match with 304
+        stream: long-lived response (SSE) relayed as it arrives: no deadline,
+            timeout is the longest allowed gap between chunks
+    """
+
+    method: str
+    path: str
+    service: str
+    upstream_path: str
+    auth_required: bool = True
+    timeout: Optional[float] = None
+    summary: Optional[str] = None
+    max_body_size: Optional[int] = None
+    coalesce: bool = False
+    cache_ttl: Optional[float] = None
+    cache_tags: Tuple[str, ...] = ()
+    invalidates: Tuple[str, ...] = ()
+    route_class: str = "default"
+    etag: bool = False
+    stream: bool = False
+
+    @property
+    def upstream_timeout(self) -> float:
+        return self.timeout if self.timeout is not None else SERVICE_TIMEOUTS[self.service]
+
+
+def upstream_headers(request: Request) -> Dict[str, str]:
+    """
+    Build headers for the upstream request.
+
+    End-to-end headers are forwarded unchanged; hop-by-hop headers and Host
+    are dropped, X-Request-ID is set from the request state.
+    """
+    headers = {
+        name: value
+        for name, value in request.headers.items()
+        if name not in HOP_BY_HOP_HEADERS and name != "host"
+    }
+
+    if hasattr(request.state, "request_id"):
+        headers["x-request-id"] = request.state.request_id
+
+    if request.client is not None:
+        forwarded_for = request.headers.get("x-forwarded-for")
+        headers["x-forwarded-for"] = (
+            f"{forwarded_for}, {request.client.host}" if forwarded_for else request.client.host
+        )
+
+    return headers
+
+
+def downstream_headers(response: httpx.Response) -> List[Tuple[bytes, bytes]]:
+    """Raw headers of the upstream response that are passed back to the client."""
+    return [
+        (name.lower(), value)
+        for name, value in response.headers.raw
+        if name.lower().decode("latin-1") not in HOP_BY_HOP_HEADERS
+    ]
+
+
+def upstream_url(request: Request, route: ProxyRoute) -> str:
+    """
+    Upstream path with the original (undecoded) query string; the instance
+    base URL is added by the balancer in core.http.
+    """
+    url = route.upstream_path.format(**request.path_params)
+    if request.url.query:
+        url = f"{url}?{request.url.query}"
+    return url
+
+
+class RequestBodyTooLarge(Exception):
+    """Raised from the body stream once more than max_body_size bytes arrived."""
+
+
+def _body_too_large(limit: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Request body exceeds maximum allowed size {limit} bytes",
+    )
+
+
+async def _limited_stream(request: Request, limit: int) -> AsyncIterator[bytes]:
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > limit:
+            raise RequestBodyTooLarge()
+        yield chunk
+
+
+def _request_body(request: Request, route: ProxyRoute) -> Optional[AsyncIterator[bytes]]:
+    """
+    Request body as an async stream (None for bodiless requests).
+
+    With max_body_size set, a declared Content-Length above the limit is
+    rejected before any byte is read; chunked bodies are counted as they flow.
+
+    Raises:
+        HTTPException 413: If Content-Length exceeds max_body_size
+    """
+    if not _has_body(request):
+        return None
+    if route.max_body_size is None:
+        return request.stream()
+
+    content_length = request.headers.get("content-length")
+    if content_length is not None and content_length.isdigit():
+        if int(content_length) > route.max_body_size:
+            raise _body_too_large(route.max_body_size)
+    return _limited_stream(request, route.max_body_size)
+
+
+def _has_body(request: Request) -> bool:
+    content_length = request.headers.get("content-length")
+    if content_length is not None:
+        return content_length != "0"
+    return "transfer-encoding" in request.headers
+
+
+async def open_upstream(
+    request: Request, route: ProxyRoute, current_user: Optional[dict] = None
+) -> httpx.Response:
+    """
+    Send the request to the upstream and return the response with an unread body.
+
+    The caller must release it with close_streaming(route.service, response).
+
+    The call gets an absolute deadline (route timeout, or the client's own
+    X-Request-Deadline if earlier) that is passed on in X-Request-Deadline,
+    so the upstream and everything it calls stop working once it passes.
+    Stream routes get no deadline: the upstream keeps the response open
+    until the client goes away.
+
+    In trusted-internal mode the user authenticated by the gateway is passed
+    on in a signed X-Verified-Identity header; a client-supplied one is
+    always dropped.
+
+    Raises:
+        HTTPException 413: If the body exceeds route.max_body_size
+        HTTPException 504: If the upstream does not respond in time or the deadline has passed
+        HTTPException 503: If the upstream is unavailable or its circuit is open
+    """
+    label = SERVICE_LABELS[route.service]
+    deadline = None
+    if not route.stream:
+        deadline = request_deadline(request, route.upstream_timeout)
+        if remaining(deadline) <= 0:
+            raise deadline_exceeded()
+    content = _request_body(request, route)
+    headers = upstream_headers(request)
+    if deadline is not None:
+        headers[DEADLINE_HEADER.lower()] = format_deadline(deadline)
+    else:
+        headers.pop(DEADLINE_HEADER.lower(), None)
+    headers.pop(IDENTITY_HEADER.lower(), None)
+    if settings.TRUSTED_IDENTITY_ENABLED and current_user is not None:
+        identity = sign_identity(current_user)
+        if identity is not None:
+            headers[IDENTITY_HEADER.lower()] = identity
+    if route.etag:
+        # the gateway answers If-None-Match itself, the upstream always sends the body
+        headers.pop("if-none-match", None)
+
+    try:
+        with timed("upstream"):
+            return await send_streaming(
+                route.method,
+                upstream_url(request, route),
+                service=route.service,
+                headers=headers,
+                content=content,
+                timeout=route.upstream_timeout,
+                deadline=deadline,
+            )
+    except RequestBodyTooLarge:
+        raise _body_too_large(route.max_body_size)
+    except CircuitOpenError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"{label} unavailable",
+            headers={"Retry-After": str(math.ceil(exc.retry_after))},
+        )
+    except httpx.TimeoutException:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=f"{label} timeout",
+        )
+    except httpx.RequestError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"{label} unavailable",
+        )
+
+
+async def forward(request: Request, route: ProxyRoute, current_user: Optional[dict] = None) -> Response:
+    """
+    Proxy the request to the upstream service as a byte stream.
+
+    The request body is streamed to the upstream as it arrives, the response
+    body is streamed back chunk by chunk (raw, without decompressing or JSON
+    decoding). Upstream status code and headers are preserved.
+
+    Routes marked with coalesce share one upstream call between identical
+    concurrent GETs (see coalesce_key); their response is buffered. Routes
+    with cache_ttl are also served from the response cache, and successful
+    writes drop the cache entries tagged with route.invalidates. GETs of
+    routes marked with etag are buffered too, carry a strong ETag and get a
+    bodiless 304 when If-None-Match matches it.
+
+    Raises:
+        HTTPException 413: If the body exceeds route.max_body_size
+        HTTPException 504: If the upstream does not respond in time
+        HTTPException 503: If the upstream is unavailable or its circuit is open
+    """
+    cache_status = None
+    if route.cache_ttl and _is_shareable(request, route):
+        upstream, cache_status = await _cached(request, route, current_user)
+    elif route.coalesce and _is_shareable(request, route):
+        with timed("upstream"):
+            upstream = await single_flight.do(
+                coalesce_key(request, current_user), lambda: fetch_buffered(request, route, current_user)
+            )
+    elif route.etag and _is_shareable(request, route):
+        upstream = await fetch_buffered(request, route, current_user)
+    else:
+        response = await open_upstream(request, route, current_user)
+        if route.invalidates and response.status_code < 400:
+            response_cache.invalidate(_format_tags(route.invalidates, request))
+        return stream_response(route.service, response)
+
+    if upstream.etag is not None and _etag_matches(request.headers.get("if-none-match"), upstream.etag):
+        return not_modified_response(upstream, cache_status)
+    return buffered_response(upstream, cache_status)
+
+
+async def _cached(
+    request: Request, route: ProxyRoute, current_user: Optional[dict]
+) -> Tuple["BufferedUpstream", str]:
+    """Upstream response from the cache or, on a miss, fetched and stored: (response, HIT|MISS)."""
+    key = coalesce_key(request, current_user)
+    tags = _format_tags(route.cache_tags, request)
+
+    if "no-cache" not in request.headers.get("cache-control", ""):
+        cached = response_cache.get(key)
+        CACHE_LOOKUPS.labels("hit" if cached is not None else "miss").inc()
+        if cached is not None:
+            return cached, "HIT"
+
+    async def fetch_and_store() -> BufferedUpstream:
+        generation = response_cache.generation(tags)
+        upstream = await fetch_buffered(request, route, current_user)
+        if upstream.status_code == 200 and len(upstream.body) <= settings.RESPONSE_CACHE_MAX_ENTRY_BYTES:
+            response_cache.set(key, upstream, route.cache_ttl, tags, generation)
+        return upstream
+
+    with timed("upstream"):
+        upstream = await single_flight.do(key, fetch_and_store)
+    return upstream, "MISS"
+
+
+def _format_tags(tags: Tuple[str, ...], request: Request) -> Tuple[str, ...]:
+    return tuple(tag.format(**request.path_params) for tag in tags)
+
+
+@dataclass(frozen=True)
+class BufferedUpstream:
+    """Fully read upstream response that can be handed to several clients."""
+
+    status_code: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+    etag: Optional[str] = None
+
+
+async def fetch_buffered(
+    request: Request, route: ProxyRoute, current_user: Optional[dict] = None
+) -> BufferedUpstream:
+    """
+    Proxy the request and read the whole (raw) upstream body.
+
+    Raises:
+        HTTPException 504 / 503: As open_upstream, also when the body read times out
+    """
+    response = await open_upstream(request, route, current_user)
+    try:
+        with timed("upstream"):
+            body = b"".join([chunk async for chunk in response.aiter_raw()])
+    except httpx.TimeoutException:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=f"{SERVICE_LABELS[route.service]} timeout",
+        )
+    except httpx.RequestError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"{SERVICE_LABELS[route.service]} unavailable",
+        )
+    finally:
+        await close_streaming(route.service, response)
+
+    headers = [(name, value) for name, value in downstream_headers(response) if name != b"content-length"]
+    etag = None
+    if route.etag and response.status_code == 200:
+        etag = response.headers.get("etag")
+        if etag is None and "json" in response.headers.get("content-type", ""):
+            etag = json_etag(body)
+            headers.append((b"etag", etag.encode()))
+    return BufferedUpstream(response.status_code, headers, body, etag)
+
+
+def json_etag(body: bytes) -> str:
+    """Strong ETag of a raw upstream body (changes whenever any byte changes)."""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses the weak comparison: W/ prefixes are ignored."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in candidates
+
+
+def buffered_response(upstream: BufferedUpstream, cache_status: Optional[str] = None) -> Response:
+    response = Response(content=upstream.body, status_code=upstream.status_code)
+    response.raw_headers = upstream.headers + [(b"content-length", str(len(upstream.body)).encode())]
+    if cache_status is not None:
+        response.raw_headers.append((b"x-cache", cache_status.encode()))
+    return response
+
+
+# Headers a 304 repeats from the full response (RFC 9110, section 15.4.5)
+_NOT_MODIFIED_HEADERS = (b"etag", b"cache-control", b"content-location", b"date", b"expires", b"vary")
+
+
+def not_modified_response(upstream: BufferedUpstream, cache_status: Optional[str] = None) -> Response:
+    """Bodiless 304 for a client that already has this representation."""
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    response.raw_headers = [(name, value) for name, value in upstream.headers if name in _NOT_MODIFIED_HEADERS]
+    if cache_status is not None:
+        response.raw_headers.append((b"x-cache", cache_status.encode()))
+    return response
+
+
+# Requests with these headers get a client-specific answer (206/304) and are
+# never coalesced or served from the cache; on etag routes If-None-Match is
+# evaluated by the gateway itself and does not prevent sharing
+_UNSHAREABLE_HEADERS = ("range", "if-range", "if-none-match", "if-modified-since")
+
+
+def _is_shareable(request: Request, route: ProxyRoute) -> bool:
+    return (
+        request.method == "GET"
+        and not _has_body(request)
+        and not any(
+            name in request.headers
+            for name in _UNSHAREABLE_HEADERS
+            if not (route.etag and name == "if-none-match")
+        )
+    )
+
+
+def coalesce_key(request: Request, current_user: Optional[dict]) -> Tuple:
+    """
+    Single-flight and cache key: method + path + normalized query + authorization scope.
+
+    The query is parsed and sorted so parameter order does not matter. The
+    scope (user id and role) keeps users from receiving each other's data,
+    because upstreams filter results by the caller.
+    """
+    query = tuple(sorted(parse_qsl(request.url.query, keep_blank_values=True)))
+    scope = f"{current_user['user_id']}:{current_user['role']}" if current_user else "anonymous"
+    accept_encoding = request.headers.get("accept-encoding", "")
+    return request.method, request.url.path, query, scope, accept_encoding
+
+
+async def _relay(service: str, response: httpx.Response) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in response.aiter_raw():
+            yield chunk
+    finally:
+        await close_streaming(service, response)
+
+
+def stream_response(service: str, response: httpx.Response) -> StreamingResponse:
+    """Relay an open upstream response to the client unchanged."""
+    streaming = StreamingResponse(
+        _relay(service, response),
+        status_code=response.status_code,
+        background=BackgroundTask(close_streaming, service, response),
+    )
+    streaming.raw_headers = downstream_headers(response)
+    return streaming
@@ -0,0 +1,209 @@
+import time
+from typing import Dict
+
+import httpx
+
+from core.config import settings
+
+# Methods that may be safely repeated (RFC 9110, section 9.2.2)
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(httpx.RequestError):
+    """Raised instead of calling an upstream whose circuit breaker is open."""
+
+    def __init__(self, service: str, retry_after: float):
+        super().__init__(f"Circuit breaker for {service} is open")
+        self.service = service
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of one upstream service.
+
+    closed: requests pass, consecutive failures are counted; after
+        failure_threshold failures in a row the circuit opens.
+    open: requests fail fast with CircuitOpenError for reset_timeout seconds.
+    half_open: up to half_open_max_calls probe requests pass; a successful
+        probe closes the circuit, a failed one opens it again.
+
+    Network errors, timeouts and 5xx responses count as failures.
+    """
+
+    def __init__(
+        self,
+        service: str,
+        failure_threshold: int,
+        reset_timeout: float,
+        half_open_max_calls: int = 1,
+    ):
+        self.service = service
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._counters = {
+            "opened_total": 0,
+            "rejected_total": 0,
+            "failures_total": 0,
+            "successes_total": 0,
+        }
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._half_open_calls = 0
+        return self._state
+
+    def before_call(self) -> None:
+        """
+        Reserve a call through the breaker.
+
+        Raises:
+            CircuitOpenError: If the circuit is open or the half-open probe slots are taken
+        """
+        state = self.state
+        if state == CLOSED:
+            return
+        if state == HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+            self._half_open_calls += 1
+            return
+
+        self._counters["rejected_total"] += 1
+        retry_after = max(self.reset_timeout - (time.monotonic() - self._opened_at), 0.0)
+        raise CircuitOpenError(self.service, retry_after)
+
+    def record_success(self) -> None:
+        self._counters["successes_total"] += 1
+        self._consecutive_failures = 0
+        if self._state == HALF_OPEN:
+            self._state = CLOSED
+
+    def record_failure(self) -> None:
+        self._counters["failures_total"] += 1
+        self._consecutive_failures += 1
+        if self._state == HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+            self._open()
+
+    def abandon_call(self) -> None:
+        """Give back a reserved call that ended without an outcome (e.g. cancelled)."""
+        if self._state == HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    def record_response(self, response: httpx.Response) -> None:
+        if response.status_code >= 500:
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def _open(self) -> None:
+        if self._state != OPEN:
+            self._counters["opened_total"] += 1
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            **self._counters,
+        }
+
+
+class RetryBudget:
+    """
+    Token bucket that caps retries at a share of the upstream traffic.
+
+    Every original request deposits `ratio` tokens, a retry withdraws one.
+    The bucket also refills at `min_per_second` so a low-traffic upstream can
+    still be retried, and never holds more than `max_tokens`.
+    """
+
+    def __init__(self, ratio: float, min_per_second: float, max_tokens: float):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+
+        self._tokens = max_tokens
+        self._updated_at = time.monotonic()
+        self._counters = {"retries_total": 0, "retries_denied_total": 0}
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._tokens + (now - self._updated_at) * self.min_per_second, self.max_tokens)
+        self._updated_at = now
+
+    def deposit(self) -> None:
+        """Account one original (non-retry) request."""
+        self._refill()
+        self._tokens = min(self._tokens + self.ratio, self.max_tokens)
+
+    def try_withdraw(self) -> bool:
+        """Take a token for one retry; False means the retry must be skipped."""
+        self._refill()
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            self._counters["retries_total"] += 1
+            return True
+        self._counters["retries_denied_total"] += 1
+        return False
+
+    def stats(self) -> dict:
+        self._refill()
+        return {"tokens": round(self._tokens, 2), **self._counters}
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_budgets: Dict[str, RetryBudget] = {}
+
+
+def breaker_for(service: str) -> CircuitBreaker:
+    """Circuit breaker of an upstream service (created on first use)."""
+    breaker = _breakers.get(service)
+    if breaker is None:
+        breaker = _breakers[service] = CircuitBreaker(
+            service,
+            failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=settings.CIRCUIT_RESET_TIMEOUT,
+            half_open_max_calls=settings.CIRCUIT_HALF_OPEN_MAX_CALLS,
+        )
+    return breaker
+
+
+def retry_budget_for(service: str) -> RetryBudget:
+    """Retry budget of an upstream service (created on first use)."""
+    budget = _budgets.get(service)
+    if budget is None:
+        budget = _budgets[service] = RetryBudget(
+            ratio=settings.RETRY_BUDGET_RATIO,
+            min_per_second=settings.RETRY_BUDGET_MIN_PER_SECOND,
+            max_tokens=settings.RETRY_BUDGET_MAX_TOKENS,
+        )
+    return budget
+
+
+def reset() -> None:
+    """Forget all breaker and budget state."""
+    _breakers.clear()
+    _budgets.clear()
+
+
+def resilience_stats(services) -> Dict[str, dict]:
+    """Breaker state and retry budget of every upstream service."""
+    return {
+        service: {
+            "circuit": breaker_for(service).stats(),
+            "retry_budget": retry_budget_for(service).stats(),
+        }
+        for service in services
+    }
@@ -0,0 +1,57 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, FrozenSet, Iterator, Optional
+
+# Durations (seconds) recorded for the current request, by Server-Timing metric name
+_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("gateway_timings", default=None)
+# Metrics currently being measured; nested blocks of the same metric are not counted twice
+_active: ContextVar[FrozenSet[str]] = ContextVar("gateway_active_timings", default=frozenset())
+
+# Server-Timing descriptions shown in the browser dev tools
+TIMING_DESCRIPTIONS = {
+    "auth": "JWT validation",
+    "upstream": "Upstream wait",
+    "app": "Gateway processing",
+    "total": "Total",
+}
+
+
+def start_request_timings() -> Dict[str, float]:
+    """Start collecting timings for the current request (called by the middleware)."""
+    timings: Dict[str, float] = {}
+    _timings.set(timings)
+    return timings
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Add the duration of the block to the `name` timing of the current request."""
+    timings = _timings.get()
+    active = _active.get()
+    if timings is None or name in active:
+        yield
+        return
+    token = _active.set(active | {name})
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - started
+        _active.reset(token)
+
+
+def server_timing_header(timings: Dict[str, float], total: float) -> str:
+    """
+    Format the Server-Timing header value.
+
+    "app" is the time spent in the gateway itself: total minus auth and
+    upstream wait (routing, admission control, serialization).
+    """
+    metrics = dict(timings)
+    metrics["app"] = max(total - metrics.get("auth", 0.0) - metrics.get("upstream", 0.0), 0.0)
+    metrics["total"] = total
+    return ", ".join(
+        f'{name};desc="{TIMING_DESCRIPTIONS.get(name, name)}";dur={duration * 1000:.1f}'
+        for name, duration in metrics.items()
+    )
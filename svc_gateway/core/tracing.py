@@ -0,0 +1,242 @@
+import atexit
+import importlib
+import json
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from core.config import settings
+
+# W3C Trace Context (https://www.w3.org/TR/trace-context/):
+# traceparent = version "-" trace-id (32 hex) "-" parent-id (16 hex) "-" trace-flags (2 hex)
+TRACEPARENT_HEADER = "traceparent"
+_SAMPLED = 0x01
+
+
+@dataclass
+class Span:
+    """One timed operation of a trace."""
+
+    trace_id: str
+    span_id: str
+    parent_span_id: Optional[str]
+    name: str
+    kind: str
+    service: str
+    sampled: bool = True
+    start_time: float = field(default_factory=time.time)
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = "ok"
+    duration_ms: Optional[float] = None
+    _started: float = field(default_factory=time.perf_counter, repr=False)
+
+    def set_attribute(self, name: str, value: Any) -> None:
+        self.attributes[name] = value
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{_SAMPLED if self.sampled else 0:02x}"
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        """Finish the span and hand it to the exporter (once)."""
+        if self.duration_ms is not None:
+            return
+        self.duration_ms = (time.perf_counter() - self._started) * 1000
+        if error is not None:
+            self.status = "error"
+            self.attributes["error.type"] = type(error).__name__
+        if self.sampled:
+            _exporter.export(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "service": self.service,
+            "start_time": self.start_time,
+            "duration_ms": round(self.duration_ms or 0.0, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class SpanExporter:
+    """Receives finished spans; subclass it to ship spans elsewhere (TRACING_EXPORTER=module:Class)."""
+
+    def export(self, span: Span) -> None:
+        raise NotImplementedError
+
+
+class NoopExporter(SpanExporter):
+    def export(self, span: Span) -> None:
+        pass
+
+
+class JsonLinesExporter(SpanExporter):
+    """
+    Appends every span as one JSON object per line to a local file (no collector needed).
+
+    export() only enqueues the span: a daemon thread serializes and writes it
+    through one open file handle, so the event loop never blocks on file I/O.
+    Spans beyond max_queue pending ones are dropped (counted in `dropped`).
+    """
+
+    def __init__(self, path: str, max_queue: int = 10000):
+        self.path = path
+        self.dropped = 0
+        self._closed = False
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=max_queue)
+        self._writer = threading.Thread(target=self._write_loop, name="jsonl-span-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def export(self, span: Span) -> None:
+        if self._closed:
+            return
+        try:
+            self._queue.put_nowait(span.to_dict())
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self) -> None:
+        """Block until every span exported so far is written."""
+        self._queue.join()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+        self._file.close()
+
+    def _write_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._file.write(json.dumps(item, default=str) + "\n")
+                if self._queue.empty():
+                    self._file.flush()
+            finally:
+                self._queue.task_done()
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+_service_name = "unknown"
+_exporter: SpanExporter = NoopExporter()
+
+
+def load_exporter(name: str, path: str) -> SpanExporter:
+    """Exporter from a setting value: "none", "jsonl" or "package.module:ClassName"."""
+    if name == "none":
+        return NoopExporter()
+    if name == "jsonl":
+        return JsonLinesExporter(path)
+    module_name, _, class_name = name.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+def configure_tracing(service: str) -> None:
+    """Set the service name and the exporter from TRACING_EXPORTER (called at startup)."""
+    global _service_name
+    _service_name = service
+    set_exporter(load_exporter(settings.TRACING_EXPORTER, settings.TRACING_JSONL_PATH))
+
+
+def set_exporter(exporter: SpanExporter) -> None:
+    global _exporter
+    previous, _exporter = _exporter, exporter
+    if isinstance(previous, JsonLinesExporter) and previous is not exporter:
+        previous.close()
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """(trace_id, parent span id, sampled) from a traceparent header; None if invalid."""
+    if not value:
+        return None
+    parts = value.strip().lower().split("-")
+    if len(parts) < 4 or parts[0] == "ff" or len(parts[1]) != 32 or len(parts[2]) != 16 or len(parts[3]) != 2:
+        return None
+    try:
+        flags = int(parts[3], 16)
+        int(parts[1], 16), int(parts[2], 16)
+    except ValueError:
+        return None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None
+    return parts[1], parts[2], bool(flags & _SAMPLED)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def start_span(
+    name: str,
+    kind: str = "internal",
+    attributes: Optional[Dict[str, Any]] = None,
+    traceparent: Optional[str] = None,
+) -> Span:
+    """
+    Create a span without making it current (the caller ends it).
+
+    The parent is the current span, or the remote parent from `traceparent`
+    for server spans; without either a new trace is started.
+    """
+    parent = _current_span.get()
+    remote = parse_traceparent(traceparent) if parent is None else None
+    if parent is not None:
+        trace_id, parent_id, sampled = parent.trace_id, parent.span_id, parent.sampled
+    elif remote is not None:
+        trace_id, parent_id, sampled = remote
+    else:
+        trace_id, parent_id, sampled = os.urandom(16).hex(), None, True
+    return Span(
+        trace_id=trace_id,
+        span_id=os.urandom(8).hex(),
+        parent_span_id=parent_id,
+        name=name,
+        kind=kind,
+        service=_service_name,
+        sampled=sampled,
+        attributes=dict(attributes or {}),
+    )
+
+
+@contextmanager
+def span(
+    name: str,
+    kind: str = "internal",
+    attributes: Optional[Dict[str, Any]] = None,
+    traceparent: Optional[str] = None,
+) -> Iterator[Span]:
+    """Run the block in a new current span; exceptions mark it as failed."""
+    new_span = start_span(name, kind, attributes, traceparent)
+    token = _current_span.set(new_span)
+    try:
+        yield new_span
+    except BaseException as exc:
+        new_span.end(error=exc)
+        raise
+    finally:
+        _current_span.reset(token)
+        new_span.end()
+
+
+def trace_headers() -> Dict[str, str]:
+    """traceparent of the current span for an outgoing request (empty outside a trace)."""
+    current = _current_span.get()
+    return {} if current is None else {TRACEPARENT_HEADER: current.traceparent()}
@@ -0,0 +1,28 @@
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class BatchSubRequest(BaseModel):
+    """One request inside a batch, addressed like a normal gateway call."""
+
+    id: Optional[str] = Field(None, description="Client-chosen id echoed back in the result")
+    method: str = "GET"
+    path: str = Field(..., description="Gateway path with query, e.g. /api/v1/defects/<id>?x=1")
+    headers: Dict[str, str] = Field(default_factory=dict)
+    body: Optional[Any] = Field(None, description="JSON body (sent as application/json)")
+
+
+class BatchRequest(BaseModel):
+    """Body of POST /api/v1/batch."""
+
+    requests: List[BatchSubRequest]
+
+
+class BatchSubResponse(BaseModel):
+    """Result of one sub-request, in the order of the batch."""
+
+    id: Optional[str] = None
+    status: int
+    headers: Dict[str, str]
+    body: Optional[Any] = None
@@ -1,6 +1,8 @@
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 import sys
 
+import jwt
 import pytest
 from fastapi.testclient import TestClient
 
@@ -10,11 +12,46 @@ if str(SERVICE_ROOT) not in sys.path:
 
 try:
     from svc_gateway.app.main import app  # type: ignore
+    from svc_gateway.core import balancer, resilience  # type: ignore
+    from svc_gateway.core.config import settings  # type: ignore
+    from svc_gateway.core.admission import admission  # type: ignore
+    from svc_gateway.core.proxy import response_cache  # type: ignore
 except ModuleNotFoundError:
     from app.main import app
+    from core import balancer, resilience
+    from core.config import settings
+    from core.admission import admission
+    from core.proxy import response_cache
 
 
 @pytest.fixture(scope="function")
 def client():
     with TestClient(app) as test_client:
         yield test_client
+
+
+@pytest.fixture
+def admin_headers():
+    """Authorization of an ADMIN (gateway internals: /internal/stats, /metrics)."""
+    payload = {
+        "sub": "99999999-9999-9999-9999-999999999999",
+        "role": "ADMIN",
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=5),
+    }
+    token = jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _reset_shared_state():
+    balancer.reset()
+    resilience.reset()
+    response_cache.clear()
+    admission.reset()
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_state():
+    """Gateway in-process state (instances, breakers, cache, rate limits) must not leak between tests."""
+    _reset_shared_state()
+    yield
+    _reset_shared_state()
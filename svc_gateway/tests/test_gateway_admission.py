@@ -0,0 +1,147 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import jwt
+import pytest
+from fastapi import HTTPException
+
+try:
+    from svc_gateway.core import http as gateway_http  # type: ignore
+    from svc_gateway.core.admission import AdmissionController, TokenBucket  # type: ignore
+    from svc_gateway.core.config import settings  # type: ignore
+except ModuleNotFoundError:
+    from core import http as gateway_http
+    from core.admission import AdmissionController, TokenBucket
+    from core.config import settings
+
+
+class _BodyStream(httpx.AsyncByteStream):
+    async def __aiter__(self):
+        yield b"id,title\n"
+
+
+def test_token_bucket_reports_wait_time():
+    bucket = TokenBucket(rate=0.5, burst=2)
+
+    assert bucket.try_take() == (True, 0.0)
+    assert bucket.try_take() == (True, 0.0)
+    ok, wait = bucket.try_take()
+
+    assert not ok
+    assert 1.9 < wait <= 2.0
+
+
+@pytest.mark.asyncio
+async def test_per_user_rate_limit_returns_429_with_retry_after(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_RPS", 1.0)
+    monkeypatch.setattr(settings, "RATE_LIMIT_BURST", 2)
+    monkeypatch.setattr(settings, "RATE_LIMIT_ROLE_RPS", "")
+    controller = AdmissionController()
+
+    for _ in range(2):
+        async with controller.admit("default", "user:a", "ENGINEER"):
+            pass
+    with pytest.raises(HTTPException) as exc:
+        async with controller.admit("default", "user:a", "ENGINEER"):
+            pass
+
+    assert exc.value.status_code == 429
+    assert exc.value.headers["Retry-After"] == "1"
+    # another user has its own bucket
+    async with controller.admit("default", "user:b", "ENGINEER"):
+        pass
+    assert controller.stats()["classes"]["default"]["rate_limited_total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_route_class_concurrency_cap_sheds_with_503(monkeypatch):
+    monkeypatch.setattr(settings, "ADMISSION_EXPORT_MAX_CONCURRENCY", 1)
+    monkeypatch.setattr(settings, "ADMISSION_EXPORT_RATE_PER_MINUTE", 600.0)
+    controller = AdmissionController()
+    release = asyncio.Event()
+
+    async def slow_export():
+        async with controller.admit("export", "user:a", "MANAGER"):
+            await release.wait()
+
+    running = asyncio.create_task(slow_export())
+    await asyncio.sleep(0)
+
+    with pytest.raises(HTTPException) as exc:
+        async with controller.admit("export", "user:b", "MANAGER"):
+            pass
+    assert exc.value.status_code == 503
+    assert "Retry-After" in exc.value.headers
+
+    release.set()
+    await running
+    stats = controller.stats()["classes"]["export"]
+    assert stats == {
+        "in_flight": 0,
+        "admitted_total": 1,
+        "rate_limited_total": 0,
+        "shed_total": 1,
+        "rate_per_minute": 600.0,
+        "max_concurrency": 1,
+    }
+
+
+def test_export_rate_limit_through_gateway(client, monkeypatch, admin_headers):
+    monkeypatch.setattr(settings, "ADMISSION_EXPORT_RATE_PER_MINUTE", 1.0)
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(200, headers={"content-type": "text/csv"}, stream=_BodyStream())
+
+    monkeypatch.setitem(
+        gateway_http._clients, "reports", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    token = jwt.encode(
+        {
+            "sub": "77777777-7777-7777-7777-777777777777",
+            "role": "MANAGER",
+            "exp": datetime.now(timezone.utc) + timedelta(minutes=5),
+        },
+        settings.JWT_SECRET_KEY,
+        algorithm=settings.JWT_ALGORITHM,
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+
+    first = client.get("/api/v1/reports/export?format=csv", headers=headers)
+    second = client.get("/api/v1/reports/export?format=csv", headers=headers)
+
+    assert first.status_code == 200
+    assert second.status_code == 429
+    assert len(calls) == 1
+    assert int(second.headers["retry-after"]) >= 1
+    stats = client.get("/internal/stats", headers=admin_headers).json()["data"]["admission"]
+    assert stats["classes"]["export"]["rate_limited_total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_per_user_bucket_follows_role_rate(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_RPS", 1.0)
+    monkeypatch.setattr(settings, "RATE_LIMIT_BURST", 1)
+    monkeypatch.setattr(settings, "RATE_LIMIT_ROLE_RPS", "MANAGER:3")
+    controller = AdmissionController()
+
+    async with controller.admit("default", "user:a", "ENGINEER"):
+        pass
+    # promoted user: the engineer bucket is spent, the manager one allows a burst of 3
+    for _ in range(3):
+        async with controller.admit("default", "user:a", "MANAGER"):
+            pass
+    with pytest.raises(HTTPException):
+        async with controller.admit("default", "user:a", "MANAGER"):
+            pass
+
+
+@pytest.mark.parametrize("env", [{"RATE_LIMIT_RPS": "0"}, {"RATE_LIMIT_ROLE_RPS": "ADMIN:0"}])
+def test_rate_limits_must_be_positive(monkeypatch, env):
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+
+    with pytest.raises(ValueError, match="greater than 0"):
+        type(settings)()
@@ -0,0 +1,78 @@
+import httpx
+import pytest
+
+try:
+    from svc_gateway.core import balancer  # type: ignore
+    from svc_gateway.core import http as gateway_http  # type: ignore
+    from svc_gateway.core.config import settings  # type: ignore
+except ModuleNotFoundError:
+    from core import balancer
+    from core import http as gateway_http
+    from core.config import settings
+
+
+def test_power_of_two_choices_prefers_less_loaded_healthy_instance():
+    lb = balancer.Balancer("defects", ["http://d1", "http://d2"])
+    busy, idle = lb.instances
+    busy.outstanding = 5
+
+    assert all(lb.pick() is idle for _ in range(20))
+
+    for _ in range(settings.HEALTH_CHECK_UNHEALTHY_THRESHOLD):
+        idle.record_check(False)
+    assert not idle.healthy
+    assert all(lb.pick() is busy for _ in range(20))
+
+    # every instance ejected: fall back to all of them instead of failing
+    for _ in range(settings.HEALTH_CHECK_UNHEALTHY_THRESHOLD):
+        busy.record_check(False)
+    assert lb.pick() in (busy, idle)
+
+
+@pytest.mark.asyncio
+async def test_health_probes_eject_and_readmit_instance():
+    up = False
+
+    def handler(request):
+        assert request.url.path == "/"
+        return httpx.Response(200 if up else 503)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    instance = balancer.Instance("http://d1:8003")
+
+    for _ in range(settings.HEALTH_CHECK_UNHEALTHY_THRESHOLD):
+        await balancer.check_instance(client, instance)
+    assert not instance.healthy
+    assert instance.ejections_total == 1
+
+    up = True
+    for _ in range(settings.HEALTH_CHECK_HEALTHY_THRESHOLD):
+        await balancer.check_instance(client, instance)
+    assert instance.healthy
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_requests_are_spread_over_configured_instances(monkeypatch):
+    monkeypatch.setattr(settings, "DEFECTS_SERVICE_URL", "http://d1:8003, http://d2:8003/")
+    balancer.reset()
+    hosts = []
+
+    def handler(request):
+        hosts.append(request.url.host)
+        return httpx.Response(200, json={"success": True})
+
+    monkeypatch.setitem(
+        gateway_http._clients, "defects", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    d1, d2 = balancer.balancer_for("defects").instances
+    assert (d1.url, d2.url) == ("http://d1:8003", "http://d2:8003")
+
+    for _ in range(settings.HEALTH_CHECK_UNHEALTHY_THRESHOLD):
+        d1.record_check(False)
+    for _ in range(5):
+        await gateway_http.request_with_retry("GET", "/api/v1/defects/", service="defects")
+
+    assert hosts == ["d2"] * 5
+    assert d2.requests_total == 5
+    assert d1.outstanding == d2.outstanding == 0
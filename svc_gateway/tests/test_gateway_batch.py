@@ -0,0 +1,94 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import jwt
+
+try:
+    from svc_gateway.core import http as gateway_http  # type: ignore
+    from svc_gateway.core.config import settings  # type: ignore
+except ModuleNotFoundError:
+    from core import http as gateway_http
+    from core.config import settings
+
+DEFECT_ID = "77777777-7777-7777-7777-777777777777"
+USER_ID = "11111111-1111-1111-1111-111111111111"
+
+
+class _BodyStream(httpx.AsyncByteStream):
+    def __init__(self, body: bytes):
+        self._body = body
+
+    async def __aiter__(self):
+        yield self._body
+
+
+def _auth(role: str = "MANAGER") -> dict:
+    payload = {"sub": USER_ID, "role": role, "exp": datetime.now(timezone.utc) + timedelta(minutes=5)}
+    token = jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_batch_runs_sub_requests_concurrently_and_keeps_order(client, monkeypatch):
+    seen = []
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        seen.append((request.method, request.url.path, request.headers.get("authorization")))
+        body = b'{"success":true,"data":{"path":"%s","body":%s}}' % (
+            request.url.path.encode(),
+            request.content or b"null",
+        )
+        return httpx.Response(200, headers={"content-type": "application/json"}, stream=_BodyStream(body))
+
+    monkeypatch.setitem(
+        gateway_http._clients, "defects", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    headers = _auth()
+
+    response = client.post(
+        "/api/v1/batch",
+        headers=headers,
+        json={
+            "requests": [
+                {"id": "defect", "path": f"/api/v1/defects/{DEFECT_ID}"},
+                {"id": "comments", "path": f"/api/v1/comments/defects/{DEFECT_ID}/comments?limit=5"},
+                {"id": "comment", "method": "POST", "path": "/api/v1/comments/", "body": {"text": "hi"}},
+                {"id": "missing", "path": "/api/v1/nowhere"},
+                {"id": "wrong-method", "method": "PUT", "path": f"/api/v1/defects/{DEFECT_ID}"},
+                {"id": "stream", "path": "/api/v1/defects/stream"},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    results = response.json()["data"]
+    assert [result["id"] for result in results] == ["defect", "comments", "comment", "missing", "wrong-method", "stream"]
+    assert [result["status"] for result in results] == [200, 200, 200, 404, 405, 400]
+    assert results[0]["body"]["data"]["path"] == f"/api/v1/defects/{DEFECT_ID}"
+    assert results[2]["body"]["data"]["body"] == {"text": "hi"}
+    assert results[3]["body"]["success"] is False
+
+    # authenticated once, the batch token is forwarded with every sub-request
+    assert len(seen) == 3
+    assert all(authorization == headers["Authorization"] for _, _, authorization in seen)
+    assert peak == 3
+
+
+def test_batch_rejects_too_many_sub_requests(client, monkeypatch):
+    monkeypatch.setattr(settings, "BATCH_MAX_REQUESTS", 2)
+
+    response = client.post(
+        "/api/v1/batch",
+        headers=_auth(),
+        json={"requests": [{"path": "/api/v1/defects/"}] * 3},
+    )
+
+    assert response.status_code == 400
+    assert response.json()["success"] is False
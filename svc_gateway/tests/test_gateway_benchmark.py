@@ -0,0 +1,36 @@
+import httpx
+import pytest
+
+try:
+    from svc_gateway.benchmark.loadgen import parse_mix, percentile, run_load  # type: ignore
+    from svc_gateway.benchmark.stubs import StubConfig, StubUpstream  # type: ignore
+except ModuleNotFoundError:
+    from benchmark.loadgen import parse_mix, percentile, run_load
+    from benchmark.stubs import StubConfig, StubUpstream
+
+
+def test_parse_mix_and_percentiles():
+    assert parse_mix("defects=3, me") == [("defects", 3.0), ("me", 1.0)]
+    with pytest.raises(ValueError):
+        parse_mix("nowhere=1")
+
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_run_load_reports_per_route_latencies_against_stub():
+    stub = StubUpstream("defects", StubConfig(latency_ms=1.0, payload_bytes=2048))
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=stub), base_url="http://stub")
+
+    async with client:
+        result = await run_load(client, parse_mix("defects=1,create_defect=1"), concurrency=4, duration=0.3, seed=1)
+
+    report = result.to_dict()
+    assert report["total"]["requests"] == stub.requests > 0
+    assert report["total"]["errors"] == 0
+    assert set(report["routes"]["create_defect"]["statuses"]) == {"201"}
+    assert 1.0 <= report["routes"]["defects"]["p50_ms"] <= report["routes"]["defects"]["p99_ms"]
+    assert len(stub.body) >= 2048
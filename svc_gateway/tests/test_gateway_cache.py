@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import jwt
+import pytest
+
+try:
+    from svc_gateway.core import http as gateway_http  # type: ignore
+    from svc_gateway.core.cache import ResponseCache  # type: ignore
+    from svc_gateway.core.config import settings  # type: ignore
+    from svc_gateway.core.proxy import response_cache  # type: ignore
+except ModuleNotFoundError:
+    from core import http as gateway_http
+    from core.cache import ResponseCache
+    from core.config import settings
+    from core.proxy import response_cache
+
+DEFECT_ID = "66666666-6666-6666-6666-666666666666"
+
+
+class _BodyStream(httpx.AsyncByteStream):
+    def __init__(self, body: bytes):
+        self._body = body
+
+    async def __aiter__(self):
+        yield self._body
+
+
+def _auth(sub: str, role: str = "MANAGER") -> dict:
+    payload = {"sub": sub, "role": role, "exp": datetime.now(timezone.utc) + timedelta(minutes=5)}
+    token = jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def upstream_calls(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append((request.method, request.url.path))
+        body = b'{"success":true,"data":{"version":%d}}' % len(calls)
+        return httpx.Response(200, headers={"content-type": "application/json"}, stream=_BodyStream(body))
+
+    for service in ("defects", "reports"):
+        monkeypatch.setitem(
+            gateway_http._clients, service, httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+    return calls
+
+
+def test_response_cache_evicts_lru_expires_and_invalidates_by_tag(monkeypatch):
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", 1, ttl=60, tags=("defect:1",))
+    cache.set("b", 2, ttl=60, tags=("reports",))
+    assert cache.get("a") == 1
+    cache.set("c", 3, ttl=60, tags=("reports",))
+
+    assert cache.get("b") is None  # least recently used
+    assert cache.invalidate(["reports"]) == 1
+    assert cache.get("c") is None
+
+    stale_generation = cache.generation(("defect:1",))
+    cache.invalidate(["defect:1"])
+    assert cache.set("a", 1, ttl=60, tags=("defect:1",), generation=stale_generation) is False
+
+    cache.set("d", 4, ttl=0)
+    assert cache.get("d") is None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["expirations"] == 1
+
+
+def test_response_cache_generations_stay_bounded_and_reject_stale_stores():
+    cache = ResponseCache(max_entries=10, generation_slots=8)
+    stale_generation = cache.generation(("defect:0",))
+
+    for defect_id in range(1000):
+        cache.invalidate([f"defect:{defect_id}"])
+
+    assert len(cache._generations) == 8
+    assert cache.set("a", 1, ttl=60, tags=("defect:0",), generation=stale_generation) is False
+    assert cache.set("a", 1, ttl=60, tags=("defect:0",), generation=cache.generation(("defect:0",))) is True
+
+
+def test_get_is_cached_per_scope_and_invalidated_by_write(client, upstream_calls, admin_headers):
+    alice = _auth("11111111-1111-1111-1111-111111111111")
+    bob = _auth("22222222-2222-2222-2222-222222222222", role="ENGINEER")
+    url = f"/api/v1/defects/{DEFECT_ID}"
+
+    first = client.get(url, headers=alice)
+    second = client.get(url, headers=alice)
+    client.get(url, headers=bob)
+    client.get("/api/v1/reports/summary", headers=alice)
+
+    assert first.headers["x-cache"] == "MISS"
+    assert second.headers["x-cache"] == "HIT"
+    assert second.json() == first.json()
+    assert upstream_calls.count(("GET", f"/api/v1/defects/{DEFECT_ID}")) == 2
+
+    patched = client.patch(url, json={"title": "Updated"}, headers=alice)
+    assert patched.status_code == 200
+
+    after_write = client.get(url, headers=alice)
+    summary = client.get("/api/v1/reports/summary", headers=alice)
+    assert after_write.headers["x-cache"] == "MISS"
+    assert after_write.json() != first.json()
+    assert summary.headers["x-cache"] == "MISS"
+
+    stats = client.get("/internal/stats", headers=admin_headers).json()["data"]["response_cache"]
+    assert stats["hits"] == 1
+    assert stats["invalidations"] == 3
@@ -1,15 +1,22 @@
+from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
 from uuid import uuid4
 
+import httpx
+import jwt
 import pytest
 from fastapi import HTTPException
 
 try:
     from svc_gateway.api import deps  # type: ignore
     from svc_gateway.core import auth as gateway_auth  # type: ignore
+    from svc_gateway.core import http as gateway_http  # type: ignore
+    from svc_gateway.core.config import settings  # type: ignore
 except ModuleNotFoundError:
     from api import deps
     from core import auth as gateway_auth
+    from core import http as gateway_http
+    from core.config import settings
 
 
 def test_request_id_middleware_sets_header(client):
@@ -33,3 +40,74 @@ def test_get_current_user_from_token_propagates_invalid_token(monkeypatch):
         deps.get_current_user_from_token(credentials=creds)
 
     assert exc.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_request_with_retry_reuses_pooled_client(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(200, json={"success": True})
+
+    pooled = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setitem(gateway_http._clients, "defects", pooled)
+
+    for _ in range(3):
+        response = await gateway_http.request_with_retry(
+            "GET", "http://defects/api/v1/defects/", service="defects"
+        )
+        assert response.status_code == 200
+
+    assert gateway_http.get_client("defects") is pooled
+    assert calls == ["/api/v1/defects/"] * 3
+    stats = gateway_http.pool_stats()["defects"]
+    assert stats["in_flight"] == 0
+    assert stats["requests_total"] >= 3
+    await pooled.aclose()
+
+
+def test_internal_stats_exposes_pool_counters(client, admin_headers):
+    response = client.get("/internal/stats", headers=admin_headers)
+
+    assert response.status_code == 200
+    pools = response.json()["data"]["pools"]
+    assert set(pools) == {"auth", "projects", "defects", "reports"}
+    assert "saturated_total" in pools["reports"]
+
+
+def test_internal_stats_requires_admin(client):
+    assert client.get("/internal/stats").status_code == 401
+
+    token = jwt.encode(
+        {"sub": str(uuid4()), "role": "MANAGER", "exp": datetime.now(timezone.utc) + timedelta(minutes=5)},
+        settings.JWT_SECRET_KEY,
+        algorithm=settings.JWT_ALGORITHM,
+    )
+    response = client.get("/internal/stats", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 403
+
+
+def test_metrics_endpoint_reports_route_templates(client, admin_headers):
+    client.get("/")
+    client.get("/api/v1/defects/2f1c3d6e-0000-0000-0000-000000000000")
+
+    response = client.get("/metrics", headers=admin_headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'gateway_request_duration_seconds_count{method="GET",route="/",status="200"}' in body
+    assert 'route="/api/v1/defects/{defect_id}"' in body
+    assert "gateway_requests_in_flight" in body
+    assert "gateway_upstream_retries_total" in body
+
+
+def test_metrics_require_scrape_token_or_admin(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200
+    assert "gateway_requests_in_flight" in response.text
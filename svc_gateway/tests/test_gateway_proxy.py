@@ -0,0 +1,343 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import jwt
+import pytest
+
+try:
+    from svc_gateway.core import http as gateway_http  # type: ignore
+    from svc_gateway.core import identity  # type: ignore
+    from svc_gateway.core import tracing  # type: ignore
+    from svc_gateway.core.config import settings  # type: ignore
+except ModuleNotFoundError:
+    from core import http as gateway_http
+    from core import identity
+    from core import tracing
+    from core.config import settings
+
+
+def _auth_headers(role: str = "ENGINEER") -> dict:
+    payload = {
+        "sub": "11111111-1111-1111-1111-111111111111",
+        "role": role,
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=5),
+    }
+    token = jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    return {"Authorization": f"Bearer {token}"}
+
+
+class _ChunkedStream(httpx.AsyncByteStream):
+    """Unread response body, like the one a network transport returns."""
+
+    def __init__(self, *chunks: bytes):
+        self._chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self._chunks:
+            yield chunk
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Replace the pooled defects client with a mock transport and record requests."""
+    seen = []
+    responses = {}
+
+    def handler(request):
+        seen.append(request)
+        factory = responses.get((request.method, request.url.path))
+        if factory is None:
+            return httpx.Response(404, json={"detail": "not found"})
+        return factory(request)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setitem(gateway_http._clients, "defects", client)
+    return seen, responses
+
+
+def test_proxy_preserves_upstream_status_headers_and_query(client, upstream):
+    seen, responses = upstream
+    responses[("GET", "/api/v1/defects/")] = lambda request: httpx.Response(
+        200,
+        stream=_ChunkedStream(b'{"success":true,', b'"data":[]}'),
+        headers=[
+            ("content-type", "application/json"),
+            ("x-total-count", "0"),
+            ("set-cookie", "a=1"),
+            ("set-cookie", "b=2"),
+        ],
+    )
+
+    response = client.get(
+        "/api/v1/defects/?status=NEW&status=IN_PROGRESS&limit=10", headers=_auth_headers()
+    )
+
+    assert response.status_code == 200
+    assert response.content == b'{"success":true,"data":[]}'
+    assert response.headers["x-total-count"] == "0"
+    assert response.headers.get_list("set-cookie") == ["a=1", "b=2"]
+
+    forwarded = seen[0]
+    assert forwarded.url.query == b"status=NEW&status=IN_PROGRESS&limit=10"
+    assert forwarded.headers["authorization"].startswith("Bearer ")
+    assert "x-request-id" in forwarded.headers
+    assert gateway_http.pool_stats()["defects"]["in_flight"] == 0
+
+
+def test_proxy_streams_request_body_and_error_status(client, upstream):
+    seen, responses = upstream
+    responses[("POST", "/api/v1/defects/")] = lambda request: httpx.Response(
+        422,
+        headers={"content-type": "application/json"},
+        stream=_ChunkedStream(b'{"detail":"validation error"}'),
+    )
+
+    response = client.post("/api/v1/defects/", json={"title": "Crack"}, headers=_auth_headers())
+
+    assert response.status_code == 422
+    assert response.json() == {"detail": "validation error"}
+    assert seen[0].content == b'{"title":"Crack"}'
+
+
+def test_proxy_requires_token_for_protected_routes(client, upstream):
+    seen, _ = upstream
+
+    response = client.get("/api/v1/defects/")
+
+    assert response.status_code in (401, 403)
+    assert seen == []
+
+
+def test_proxy_maps_upstream_timeout_to_504(client, monkeypatch):
+    def handler(request):
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    monkeypatch.setitem(
+        gateway_http._clients, "defects", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+
+    response = client.delete(
+        "/api/v1/defects/22222222-2222-2222-2222-222222222222", headers=_auth_headers()
+    )
+
+    assert response.status_code == 504
+    assert response.json()["error"]["message"] == "Defects service timeout"
+    assert gateway_http.pool_stats()["defects"]["in_flight"] == 0
+
+
+def test_upload_streams_multipart_body_unchanged(client, upstream):
+    seen, responses = upstream
+    responses[("POST", "/api/v1/attachments/")] = lambda request: httpx.Response(
+        201,
+        headers={"content-type": "application/json"},
+        stream=_ChunkedStream(b'{"success":true}'),
+    )
+
+    response = client.post(
+        "/api/v1/attachments/",
+        data={"defect_id": "33333333-3333-3333-3333-333333333333"},
+        files={"file": ("crack.png", b"\x89PNG" * 1000, "image/png")},
+        headers=_auth_headers(),
+    )
+
+    assert response.status_code == 201
+    forwarded = seen[0]
+    assert forwarded.headers["content-type"].startswith("multipart/form-data; boundary=")
+    assert b"\x89PNG" * 1000 in forwarded.content
+    assert b'name="defect_id"' in forwarded.content
+
+
+def test_upload_rejects_declared_oversized_body_before_upstream(client, upstream):
+    seen, _ = upstream
+    too_big = b"0" * (settings.ATTACHMENT_MAX_SIZE + settings.ATTACHMENT_MULTIPART_OVERHEAD + 1)
+
+    response = client.post(
+        "/api/v1/attachments/",
+        content=too_big,
+        headers={**_auth_headers(), "Content-Type": "multipart/form-data; boundary=x"},
+    )
+
+    assert response.status_code == 413
+    assert seen == []
+
+
+def test_upload_enforces_limit_on_chunked_body(client, upstream):
+    limit = settings.ATTACHMENT_MAX_SIZE + settings.ATTACHMENT_MULTIPART_OVERHEAD
+
+    def body():
+        chunk = b"0" * (1024 * 1024)
+        for _ in range(limit // len(chunk) + 1):
+            yield chunk
+
+    response = client.post(
+        "/api/v1/attachments/",
+        content=body(),
+        headers={**_auth_headers(), "Content-Type": "multipart/form-data; boundary=x"},
+    )
+
+    assert response.status_code == 413
+    assert gateway_http.pool_stats()["defects"]["in_flight"] == 0
+
+
+def test_download_passes_range_and_returns_partial_content(client, upstream):
+    seen, responses = upstream
+    attachment_id = "44444444-4444-4444-4444-444444444444"
+    responses[("GET", f"/api/v1/attachments/{attachment_id}/download")] = lambda request: httpx.Response(
+        206,
+        headers={
+            "content-type": "application/pdf",
+            "content-length": "4",
+            "content-range": "bytes 0-3/1000",
+            "accept-ranges": "bytes",
+            "etag": '"abc-1000"',
+        },
+        stream=_ChunkedStream(b"%P", b"DF"),
+    )
+
+    response = client.get(
+        f"/api/v1/attachments/{attachment_id}/download",
+        headers={**_auth_headers(), "Range": "bytes=0-3", "If-Range": '"abc-1000"'},
+    )
+
+    assert response.status_code == 206
+    assert response.content == b"%PDF"
+    assert response.headers["content-range"] == "bytes 0-3/1000"
+    assert response.headers["content-length"] == "4"
+    assert response.headers["etag"] == '"abc-1000"'
+    assert seen[0].headers["range"] == "bytes=0-3"
+    assert seen[0].headers["if-range"] == '"abc-1000"'
+
+
+def test_server_timing_splits_auth_upstream_and_gateway_time(client, upstream):
+    _, responses = upstream
+    responses[("GET", "/api/v1/defects/")] = lambda request: httpx.Response(
+        200, headers={"content-type": "application/json"}, stream=_ChunkedStream(b"[]")
+    )
+
+    response = client.get(
+        "/api/v1/defects/", headers={**_auth_headers(), "X-Request-ID": "trace-me"}
+    )
+
+    assert response.headers["x-request-id"] == "trace-me"
+    metrics = {
+        part.split(";")[0].strip(): float(part.rsplit("dur=", 1)[1])
+        for part in response.headers["server-timing"].split(",")
+    }
+    assert set(metrics) == {"auth", "upstream", "app", "total"}
+    assert metrics["total"] >= metrics["auth"] + metrics["upstream"] - 0.2
+
+
+def test_proxy_stamps_deadline_and_rejects_expired_requests(client, upstream):
+    seen, responses = upstream
+    responses[("GET", "/api/v1/defects/")] = lambda request: httpx.Response(200, stream=_ChunkedStream(b"[]"))
+
+    started = time.time()
+    assert client.get("/api/v1/defects/", headers=_auth_headers()).status_code == 200
+    deadline = float(seen[-1].headers["x-request-deadline"])
+    assert started + 4 < deadline <= time.time() + 5.0  # defects route timeout
+
+    client_deadline = f"{time.time() + 1.0:.3f}"
+    client.get("/api/v1/defects/", headers={**_auth_headers(), "X-Request-Deadline": client_deadline})
+    assert seen[-1].headers["x-request-deadline"] == client_deadline
+
+    expired = client.get(
+        "/api/v1/defects/", headers={**_auth_headers(), "X-Request-Deadline": f"{time.time() - 1:.3f}"}
+    )
+    assert expired.status_code == 504
+    assert len(seen) == 2
+
+
+def test_json_get_gets_etag_and_304_on_unchanged_poll(client, upstream):
+    seen, responses = upstream
+    page = {"body": b'{"success":true,"data":[1]}'}
+    responses[("GET", "/api/v1/defects/")] = lambda request: httpx.Response(
+        200, headers={"content-type": "application/json"}, stream=_ChunkedStream(page["body"])
+    )
+
+    first = client.get("/api/v1/defects/", headers=_auth_headers())
+    etag = first.headers["etag"]
+    assert etag.startswith('"')
+
+    unchanged = client.get("/api/v1/defects/", headers={**_auth_headers(), "If-None-Match": f"W/{etag}"})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert unchanged.headers["etag"] == etag
+    assert "if-none-match" not in seen[-1].headers
+
+    page["body"] = b'{"success":true,"data":[1,2]}'
+    changed = client.get("/api/v1/defects/", headers={**_auth_headers(), "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["data"] == [1, 2]
+
+
+def test_trace_context_is_continued_and_propagated_upstream(client, upstream, monkeypatch):
+    seen, responses = upstream
+    responses[("GET", "/api/v1/defects/")] = lambda request: httpx.Response(200, stream=_ChunkedStream(b"[]"))
+    spans = []
+
+    class _Collector(tracing.SpanExporter):
+        def export(self, span):
+            spans.append(span)
+
+    monkeypatch.setattr(tracing, "_exporter", _Collector())
+    trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+    client.get(
+        "/api/v1/defects/",
+        headers={**_auth_headers(), "traceparent": f"00-{trace_id}-00f067aa0ba902b7-01"},
+    )
+
+    upstream_trace = tracing.parse_traceparent(seen[-1].headers["traceparent"])
+    server_span = next(span for span in spans if span.kind == "server")
+    client_span = next(span for span in spans if span.kind == "client")
+    assert server_span.name == "GET /api/v1/defects/"
+    assert server_span.parent_span_id == "00f067aa0ba902b7"
+    assert client_span.parent_span_id == server_span.span_id
+    assert upstream_trace == (trace_id, client_span.span_id, True)
+    assert client_span.attributes["http.status_code"] == 200
+
+
+def test_verified_identity_is_signed_by_gateway_and_never_taken_from_client(client, upstream, monkeypatch):
+    seen, responses = upstream
+    responses[("GET", "/api/v1/defects/")] = lambda request: httpx.Response(200, stream=_ChunkedStream(b"[]"))
+    headers = {**_auth_headers("MANAGER"), "X-Verified-Identity": "v1.forged.ADMIN.9999999999.sig"}
+
+    client.get("/api/v1/defects/", headers=headers)
+    assert "x-verified-identity" not in seen[-1].headers
+
+    monkeypatch.setattr(settings, "TRUSTED_IDENTITY_ENABLED", True)
+    client.get("/api/v1/defects/", headers=headers)
+
+    token = headers["Authorization"].removeprefix("Bearer ")
+    payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+    forwarded = seen[-1].headers["x-verified-identity"]
+    assert forwarded.startswith(f"v1.{payload['sub']}.MANAGER.{payload['exp']}.")
+    assert forwarded == identity.sign_identity(
+        {"user_id": payload["sub"], "role": "MANAGER", "exp": payload["exp"], "token": token}
+    )
+    assert seen[-1].headers["authorization"] == headers["Authorization"]
+
+
+def test_defect_stream_is_relayed_without_deadline(client, upstream):
+    seen, responses = upstream
+    responses[("GET", "/api/v1/defects/stream")] = lambda request: httpx.Response(
+        200,
+        headers={"content-type": "text/event-stream", "cache-control": "no-cache"},
+        stream=_ChunkedStream(b"retry: 3000\n\n", b'id: 7\nevent: defect.created\ndata: {}\n\n'),
+    )
+
+    response = client.get(
+        "/api/v1/defects/stream?project_id=p1",
+        headers={**_auth_headers(), "Last-Event-ID": "6", "X-Request-Deadline": f"{time.time() + 1:.3f}"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/event-stream"
+    assert "etag" not in response.headers
+    assert response.text == 'retry: 3000\n\nid: 7\nevent: defect.created\ndata: {}\n\n'
+    forwarded = seen[0]
+    assert forwarded.url.query == b"project_id=p1"
+    assert forwarded.headers["last-event-id"] == "6"
+    assert "x-request-deadline" not in forwarded.headers
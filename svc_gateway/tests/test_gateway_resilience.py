@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import jwt
+import pytest
+
+try:
+    from svc_gateway.core import http as gateway_http  # type: ignore
+    from svc_gateway.core import resilience  # type: ignore
+    from svc_gateway.core.config import settings  # type: ignore
+except ModuleNotFoundError:
+    from core import http as gateway_http
+    from core import resilience
+    from core.config import settings
+
+
+@pytest.fixture
+def failing_upstream(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        raise httpx.ConnectError("connection refused", request=request)
+
+    monkeypatch.setitem(
+        gateway_http._clients, "reports", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_only_idempotent_methods_are_retried(failing_upstream):
+    with pytest.raises(httpx.ConnectError):
+        await gateway_http.request_with_retry(
+            "POST", "http://reports/api/v1/reports/export", service="reports", retry_delay=0
+        )
+    assert failing_upstream == ["POST"]
+
+    with pytest.raises(httpx.ConnectError):
+        await gateway_http.request_with_retry(
+            "GET", "http://reports/api/v1/reports/summary", service="reports", retry_delay=0
+        )
+    assert failing_upstream == ["POST", "GET", "GET", "GET"]
+
+
+@pytest.mark.asyncio
+async def test_retry_budget_caps_retries(failing_upstream):
+    budget = resilience.retry_budget_for("reports")
+    budget.max_tokens = budget._tokens = 1.0
+    budget.min_per_second = 0.0
+
+    with pytest.raises(httpx.ConnectError):
+        await gateway_http.request_with_retry(
+            "GET", "http://reports/api/v1/reports/summary", service="reports", retry_delay=0
+        )
+
+    assert len(failing_upstream) == 2
+    assert budget.stats()["retries_denied_total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_fails_fast_and_recovers(monkeypatch):
+    healthy = False
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        if healthy:
+            return httpx.Response(200, json={"success": True})
+        return httpx.Response(503, json={"detail": "overloaded"})
+
+    monkeypatch.setitem(
+        gateway_http._clients, "reports", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    breaker = resilience.breaker_for("reports")
+    url = "http://reports/api/v1/reports/summary"
+
+    for _ in range(breaker.failure_threshold):
+        response = await gateway_http.request_with_retry("GET", url, service="reports")
+        assert response.status_code == 503
+    assert breaker.state == resilience.OPEN
+
+    with pytest.raises(resilience.CircuitOpenError):
+        await gateway_http.request_with_retry("GET", url, service="reports")
+    assert len(calls) == breaker.failure_threshold
+
+    breaker.reset_timeout = 0
+    healthy = True
+    assert breaker.state == resilience.HALF_OPEN
+    response = await gateway_http.request_with_retry("GET", url, service="reports")
+
+    assert response.status_code == 200
+    assert breaker.state == resilience.CLOSED
+    assert gateway_http.pool_stats()["reports"]["in_flight"] == 0
+
+
+def test_open_circuit_returns_503_with_retry_after(client, failing_upstream, admin_headers):
+    resilience.breaker_for("reports")._open()
+
+    token = jwt.encode(
+        {
+            "sub": "55555555-5555-5555-5555-555555555555",
+            "role": "MANAGER",
+            "exp": datetime.now(timezone.utc) + timedelta(minutes=5),
+        },
+        settings.JWT_SECRET_KEY,
+        algorithm=settings.JWT_ALGORITHM,
+    )
+
+    response = client.get("/api/v1/reports/summary", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 503
+    assert int(response.headers["retry-after"]) > 0
+    assert failing_upstream == []
+
+    stats = client.get("/internal/stats", headers=admin_headers).json()["data"]["upstreams"]
+    assert stats["reports"]["circuit"]["state"] == "open"
+    assert stats["auth"]["circuit"]["state"] == "closed"
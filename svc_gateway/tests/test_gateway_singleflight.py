@@ -0,0 +1,93 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import jwt
+import pytest
+
+try:
+    from svc_gateway.app.main import app  # type: ignore
+    from svc_gateway.core import http as gateway_http  # type: ignore
+    from svc_gateway.core.config import settings  # type: ignore
+    from svc_gateway.core.singleflight import SingleFlight  # type: ignore
+except ModuleNotFoundError:
+    from app.main import app
+    from core import http as gateway_http
+    from core.config import settings
+    from core.singleflight import SingleFlight
+
+
+class _BodyStream(httpx.AsyncByteStream):
+    def __init__(self, body: bytes):
+        self._body = body
+
+    async def __aiter__(self):
+        yield self._body
+
+
+def _token(sub: str, role: str = "MANAGER") -> str:
+    payload = {"sub": sub, "role": role, "exp": datetime.now(timezone.utc) + timedelta(minutes=5)}
+    return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+
+
+@pytest.mark.asyncio
+async def test_single_flight_survives_leader_cancellation():
+    flight = SingleFlight()
+    release = asyncio.Event()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await release.wait()
+        return "report"
+
+    leader = asyncio.create_task(flight.do("key", fetch))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("key", fetch))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    release.set()
+
+    assert await follower == "report"
+    assert calls == [1]
+    assert flight.stats() == {"in_flight": 0, "leaders_total": 1, "coalesced_total": 1}
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_gets_share_one_upstream_call(monkeypatch):
+    release = asyncio.Event()
+    seen = []
+
+    async def handler(request):
+        seen.append(request.url.query)
+        await release.wait()
+        return httpx.Response(
+            200,
+            headers={"content-type": "application/json"},
+            stream=_BodyStream(b'{"success":true,"data":{"total":3}}'),
+        )
+
+    monkeypatch.setitem(
+        gateway_http._clients, "reports", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    alice = {"Authorization": f"Bearer {_token('11111111-1111-1111-1111-111111111111')}"}
+    bob = {"Authorization": f"Bearer {_token('22222222-2222-2222-2222-222222222222')}"}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://gw") as client:
+        requests = [
+            client.get("/api/v1/reports/summary?project_id=p1&status=NEW", headers=alice),
+            client.get("/api/v1/reports/summary?status=NEW&project_id=p1", headers=alice),
+            client.get("/api/v1/reports/summary?project_id=p1&status=NEW", headers=alice),
+            client.get("/api/v1/reports/summary?project_id=p1&status=NEW", headers=bob),
+        ]
+        pending = asyncio.gather(*requests)
+        await asyncio.sleep(0.05)
+        release.set()
+        responses = await pending
+
+    assert [r.status_code for r in responses] == [200] * 4
+    assert all(r.json()["data"]["total"] == 3 for r in responses)
+    # alice's three requests were coalesced, bob has his own authorization scope
+    assert len(seen) == 2
+    assert gateway_http.pool_stats()["reports"]["in_flight"] == 0
@@ -0,0 +1,106 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import jwt
+
+try:
+    from svc_gateway.core import http as gateway_http  # type: ignore
+    from svc_gateway.core.config import settings  # type: ignore
+    from svc_gateway.core.proxy import response_cache  # type: ignore
+except ModuleNotFoundError:
+    from core import http as gateway_http
+    from core.config import settings
+    from core.proxy import response_cache
+
+DEFECT_ID = "88888888-8888-8888-8888-888888888888"
+PROJECT_ID = "99999999-9999-9999-9999-999999999999"
+
+
+class _BodyStream(httpx.AsyncByteStream):
+    def __init__(self, body: bytes):
+        self._body = body
+
+    async def __aiter__(self):
+        yield self._body
+
+
+def _auth() -> dict:
+    payload = {
+        "sub": "11111111-1111-1111-1111-111111111111",
+        "role": "MANAGER",
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=5),
+    }
+    token = jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _json(status_code: int, payload: dict) -> httpx.Response:
+    return httpx.Response(
+        status_code, headers={"content-type": "application/json"}, stream=_BodyStream(json.dumps(payload).encode())
+    )
+
+
+def _mock_upstreams(monkeypatch, defect_status: int = 200, attachments_status: int = 200):
+    calls = []
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        calls.append(str(request.url.path) + ("?" + request.url.query.decode() if request.url.query else ""))
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        path = request.url.path
+        if path == f"/api/v1/defects/{DEFECT_ID}":
+            if defect_status != 200:
+                return _json(defect_status, {"success": False, "error": {"code": "HTTP_ERROR", "message": "Denied"}})
+            return _json(200, {"success": True, "data": {"id": DEFECT_ID, "project_id": PROJECT_ID}})
+        if path.startswith("/api/v1/attachments/") and attachments_status != 200:
+            return _json(attachments_status, {"success": False, "error": {"code": "HTTP_ERROR", "message": "Broken"}})
+        if path == f"/api/v1/projects/{PROJECT_ID}":
+            return _json(200, {"success": True, "data": {"id": PROJECT_ID, "name": "Tower"}})
+        return _json(200, {"success": True, "data": [path]})
+
+    for service in ("defects", "projects"):
+        monkeypatch.setitem(
+            gateway_http._clients, service, httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+    return calls, lambda: peak
+
+
+def test_defect_view_fetches_sections_in_parallel(client, monkeypatch):
+    calls, peak = _mock_upstreams(monkeypatch, attachments_status=500)
+
+    response = client.get(f"/api/v1/views/defects/{DEFECT_ID}", headers=_auth())
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["defect"]["id"] == DEFECT_ID
+    assert data["project"]["name"] == "Tower"
+    assert data["comments"] == [f"/api/v1/comments/defects/{DEFECT_ID}/comments"]
+    assert data["attachments"] is None
+    assert data["errors"] == {"attachments": {"status": 500, "message": "Broken"}}
+    assert f"/api/v1/comments/defects/{DEFECT_ID}/comments?limit={settings.VIEW_COMMENTS_LIMIT}" in calls
+    # defect, comments, attachments and history are in flight together; the project follows the defect
+    assert peak() == 4
+    assert calls[-1] == f"/api/v1/projects/{PROJECT_ID}"
+
+
+def test_defect_view_selects_sections_and_fails_with_defect(client, monkeypatch):
+    calls, _ = _mock_upstreams(monkeypatch)
+
+    response = client.get(f"/api/v1/views/defects/{DEFECT_ID}?include=history", headers=_auth())
+    assert set(response.json()["data"]) == {"defect", "history", "errors"}
+    assert len(calls) == 2
+
+    assert client.get(f"/api/v1/views/defects/{DEFECT_ID}?include=votes", headers=_auth()).status_code == 400
+
+    response_cache.clear()  # the defect read above is cached
+    _mock_upstreams(monkeypatch, defect_status=403)
+    denied = client.get(f"/api/v1/views/defects/{DEFECT_ID}", headers=_auth())
+    assert denied.status_code == 403
+    assert denied.json()["error"]["message"] == "Denied"
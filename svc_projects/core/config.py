@@ -40,6 +40,17 @@ class Settings(BaseSettings):
     # External Services
     AUTH_SERVICE_URL: str
 
+    # Трассировка (W3C traceparent): "none", "jsonl" (span'ы JSON-строками в
+    # TRACING_JSONL_PATH) или свой экспортёр "package.module:ClassName"
+    TRACING_EXPORTER: str = "none"
+    TRACING_JSONL_PATH: str = "/tmp/traces/svc_projects.jsonl"
+
+    # Доверенная внутренняя сеть: пользователь, уже проверенный gateway, принимается
+    # из подписанного X-Verified-Identity без повторного декодирования JWT, а
+    # проверенные токены кэшируются (LRU по дайджесту токена, до exp)
+    TRUSTED_IDENTITY_ENABLED: bool = False
+    VERIFIED_TOKEN_CACHE_SIZE: int = 10000
+
     model_config = SettingsConfigDict(
         env_file=str(BASE_DIR / ".env"), case_sensitive=True, extra="ignore"
     )
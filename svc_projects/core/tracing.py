@@ -0,0 +1,330 @@
+import atexit
+import importlib
+import json
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.config import settings
+
+# W3C Trace Context (https://www.w3.org/TR/trace-context/):
+# traceparent = version "-" trace-id (32 hex) "-" parent-id (16 hex) "-" trace-flags (2 hex)
+TRACEPARENT_HEADER = "traceparent"
+_SAMPLED = 0x01
+
+# Максимальная длина текста SQL запроса в span
+_MAX_STATEMENT_LENGTH = 1000
+
+
+@dataclass
+class Span:
+    """Одна измеренная операция трассировки."""
+
+    trace_id: str
+    span_id: str
+    parent_span_id: Optional[str]
+    name: str
+    kind: str
+    service: str
+    sampled: bool = True
+    start_time: float = field(default_factory=time.time)
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = "ok"
+    duration_ms: Optional[float] = None
+    _started: float = field(default_factory=time.perf_counter, repr=False)
+
+    def set_attribute(self, name: str, value: Any) -> None:
+        self.attributes[name] = value
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{_SAMPLED if self.sampled else 0:02x}"
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        """Завершает span и передаёт его экспортёру (один раз)."""
+        if self.duration_ms is not None:
+            return
+        self.duration_ms = (time.perf_counter() - self._started) * 1000
+        if error is not None:
+            self.status = "error"
+            self.attributes["error.type"] = type(error).__name__
+        if self.sampled:
+            _exporter.export(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "service": self.service,
+            "start_time": self.start_time,
+            "duration_ms": round(self.duration_ms or 0.0, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class SpanExporter:
+    """Получает завершённые span'ы; свой экспортёр подключается через TRACING_EXPORTER=module:Class."""
+
+    def export(self, span: Span) -> None:
+        raise NotImplementedError
+
+
+class NoopExporter(SpanExporter):
+    def export(self, span: Span) -> None:
+        pass
+
+
+class JsonLinesExporter(SpanExporter):
+    """
+    Дописывает каждый span JSON-строкой в локальный файл (коллектор не нужен).
+
+    export() только ставит span в очередь: сериализует и пишет его фоновый
+    поток через один открытый файл, так что event loop не блокируется на
+    файловом вводе-выводе. Сверх max_queue ожидающих span'ы отбрасываются
+    (счётчик dropped).
+    """
+
+    def __init__(self, path: str, max_queue: int = 10000):
+        self.path = path
+        self.dropped = 0
+        self._closed = False
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=max_queue)
+        self._writer = threading.Thread(target=self._write_loop, name="jsonl-span-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def export(self, span: Span) -> None:
+        if self._closed:
+            return
+        try:
+            self._queue.put_nowait(span.to_dict())
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self) -> None:
+        """Ждёт, пока все уже экспортированные span'ы будут записаны."""
+        self._queue.join()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+        self._file.close()
+
+    def _write_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._file.write(json.dumps(item, default=str) + "\n")
+                if self._queue.empty():
+                    self._file.flush()
+            finally:
+                self._queue.task_done()
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+_service_name = "unknown"
+_exporter: SpanExporter = NoopExporter()
+
+
+def load_exporter(name: str, path: str) -> SpanExporter:
+    """Экспортёр по значению настройки: "none", "jsonl" или "package.module:ClassName"."""
+    if name == "none":
+        return NoopExporter()
+    if name == "jsonl":
+        return JsonLinesExporter(path)
+    module_name, _, class_name = name.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+def configure_tracing(service: str) -> None:
+    """Задаёт имя сервиса и экспортёр из TRACING_EXPORTER (вызывается при старте)."""
+    global _service_name
+    _service_name = service
+    set_exporter(load_exporter(settings.TRACING_EXPORTER, settings.TRACING_JSONL_PATH))
+
+
+def set_exporter(exporter: SpanExporter) -> None:
+    global _exporter
+    previous, _exporter = _exporter, exporter
+    if isinstance(previous, JsonLinesExporter) and previous is not exporter:
+        previous.close()
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """(trace_id, id родительского span, sampled) из заголовка traceparent; None, если он некорректен."""
+    if not value:
+        return None
+    parts = value.strip().lower().split("-")
+    if len(parts) < 4 or parts[0] == "ff" or len(parts[1]) != 32 or len(parts[2]) != 16 or len(parts[3]) != 2:
+        return None
+    try:
+        flags = int(parts[3], 16)
+        int(parts[1], 16), int(parts[2], 16)
+    except ValueError:
+        return None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None
+    return parts[1], parts[2], bool(flags & _SAMPLED)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def start_span(
+    name: str,
+    kind: str = "internal",
+    attributes: Optional[Dict[str, Any]] = None,
+    traceparent: Optional[str] = None,
+) -> Span:
+    """
+    Создаёт span, не делая его текущим (завершает его вызывающая сторона).
+
+    Родитель — текущий span или, для серверных span'ов, удалённый родитель
+    из traceparent; без них начинается новая трасса.
+    """
+    parent = _current_span.get()
+    remote = parse_traceparent(traceparent) if parent is None else None
+    if parent is not None:
+        trace_id, parent_id, sampled = parent.trace_id, parent.span_id, parent.sampled
+    elif remote is not None:
+        trace_id, parent_id, sampled = remote
+    else:
+        trace_id, parent_id, sampled = os.urandom(16).hex(), None, True
+    return Span(
+        trace_id=trace_id,
+        span_id=os.urandom(8).hex(),
+        parent_span_id=parent_id,
+        name=name,
+        kind=kind,
+        service=_service_name,
+        sampled=sampled,
+        attributes=dict(attributes or {}),
+    )
+
+
+@contextmanager
+def span(
+    name: str,
+    kind: str = "internal",
+    attributes: Optional[Dict[str, Any]] = None,
+    traceparent: Optional[str] = None,
+) -> Iterator[Span]:
+    """Выполняет блок в новом текущем span; исключение помечает span ошибкой."""
+    new_span = start_span(name, kind, attributes, traceparent)
+    token = _current_span.set(new_span)
+    try:
+        yield new_span
+    except BaseException as exc:
+        new_span.end(error=exc)
+        raise
+    finally:
+        _current_span.reset(token)
+        new_span.end()
+
+
+def trace_headers() -> Dict[str, str]:
+    """traceparent текущего span для исходящего запроса (пусто вне трассировки)."""
+    current = _current_span.get()
+    return {} if current is None else {TRACEPARENT_HEADER: current.traceparent()}
+
+
+def _route_template(scope: Scope) -> str:
+    """Шаблон маршрута запроса (например, /api/v1/projects/{project_id})."""
+    if scope.get("route") is None:
+        return "unmatched"
+    names = {str(value): name for name, value in scope.get("path_params", {}).items()}
+    return "/".join(
+        f"{{{names[segment]}}}" if segment in names else segment
+        for segment in scope["path"].split("/")
+    )
+
+
+class TracingMiddleware:
+    """
+    Открывает серверный span каждого запроса, продолжая трассу вызывающего
+    сервиса из traceparent. Исходящие HTTP вызовы и SQL запросы, выполненные
+    при обработке, становятся его дочерними span'ами.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = Headers(scope=scope).get(TRACEPARENT_HEADER)
+        with span(scope["method"], kind="server", traceparent=traceparent) as server_span:
+            server_span.set_attribute("http.method", scope["method"])
+            server_span.set_attribute("http.target", scope["path"])
+
+            async def send_with_status(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    server_span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        server_span.status = "error"
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = _route_template(scope)
+                server_span.name = f"{scope['method']} {route}"
+                server_span.set_attribute("http.route", route)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Записывает каждый SQL запрос движка дочерним span'ом текущего span."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current_span.get() is None:
+            return
+        db_span = start_span(
+            statement.split(None, 1)[0].upper() if statement.strip() else "SQL",
+            kind="client",
+            attributes={
+                "db.system": engine.dialect.name,
+                "db.statement": statement[:_MAX_STATEMENT_LENGTH],
+            },
+        )
+        conn.info.setdefault("tracing_spans", []).append(db_span)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get("tracing_spans")
+        if spans:
+            db_span = spans.pop()
+            db_span.set_attribute("db.rows", cursor.rowcount)
+            db_span.end()
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        connection = exception_context.connection
+        spans = connection.info.get("tracing_spans") if connection is not None else None
+        if spans:
+            spans.pop().end(error=exception_context.original_exception)
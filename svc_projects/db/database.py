@@ -1,9 +1,11 @@
 from typing import Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from core.config import settings
+from core.deadline import statement_timeout_ms
+from core.tracing import instrument_engine
 
 # Создаем движок SQLAlchemy
 engine = create_engine(
@@ -12,10 +14,24 @@ engine = create_engine(
     echo=False,  # Для production: False, для debug: True
 )
 
+# SQL запросы записываются span'ами трассировки
+instrument_engine(engine)
+
 # Фабрика сессий
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+@event.listens_for(SessionLocal, "after_begin")
+def _apply_statement_timeout(session, transaction, connection) -> None:
+    """
+    Ограничивает запросы транзакции оставшимся сроком HTTP запроса
+    (X-Request-Deadline): Postgres сам прерывает запрос, который не успевает.
+    """
+    timeout_ms = statement_timeout_ms()
+    if timeout_ms is not None and connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout_ms}")
+
+
 def get_db() -> Generator:
     """
     Dependency для получения DB сессии в FastAPI эндпоинтах.
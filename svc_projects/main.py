@@ -8,6 +8,8 @@ from fastapi.responses import JSONResponse
 
 from api.v1 import projects
 from core.config import settings
+from core.deadline import DeadlineMiddleware
+from core.tracing import TracingMiddleware, configure_tracing
 
 
 @asynccontextmanager
@@ -15,6 +17,7 @@ async def lifespan(app: FastAPI):
     """Lifespan events 4;O FastAPI"""
     # Startup
     print(f"Starting svc_projects on {settings.APP_HOST}:{settings.APP_PORT}")
+    configure_tracing("svc_projects")
     yield
     # Shutdown
     print("Shutting down svc_projects")
@@ -36,6 +39,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Срок запроса от gateway (X-Request-Deadline)
+app.add_middleware(DeadlineMiddleware)
+
+# Трассировка запросов (W3C traceparent)
+app.add_middleware(TracingMiddleware)
+
 
 # Exception handlers 4;O 548=>3> D>@<0B0 >B25B>2
 @app.exception_handler(RequestValidationError)
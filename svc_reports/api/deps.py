@@ -1,19 +1,24 @@
+from typing import Optional
 from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-from core.auth import decode_access_token
+from core.identity import authenticate
 
 security = HTTPBearer()
 
 
 def get_current_user_from_token(
     credentials: HTTPAuthorizationCredentials = Depends(security),
+    x_verified_identity: Optional[str] = Header(None, include_in_schema=False),
 ) -> dict:
     """
     Extract user_id and role from JWT token.
 
+    With TRUSTED_IDENTITY_ENABLED the user comes from the gateway's signed
+    X-Verified-Identity header or from the verified token cache.
+
     Returns:
         dict with fields:
             - user_id: UUID of the user
@@ -24,7 +29,7 @@ def get_current_user_from_token(
         HTTPException 401: If token is invalid
     """
     token = credentials.credentials
-    payload = decode_access_token(token)
+    payload = authenticate(token, x_verified_identity)
 
     user_id = UUID(payload.get("sub"))
     role = payload.get("role")
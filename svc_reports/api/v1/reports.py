@@ -15,6 +15,8 @@ router = APIRouter(prefix="/reports", tags=["Reports"])
 
 # Maximum rows for export (as per user decision)
 MAX_EXPORT_ROWS = 5000
+# Maximum rows for the detailed (JSON) report
+MAX_DETAILED_ROWS = 10000
 
 
 @router.get("/summary", response_model=dict)
@@ -42,23 +44,22 @@ async def get_summary_report(
     token = current_user["token"]
     fetcher = DataFetcherService(token)
 
-    # Fetch defects with filters
-    defects = await fetcher.fetch_defects(
+    # svc_defects aggregates in SQL (date range included), only counts travel
+    stats = await fetcher.fetch_defect_stats(
         project_id=project_id,
         status=status.value if status else None,
         priority=priority.value if priority else None,
+        start_date=start_date,
+        end_date=end_date,
     )
 
-    # Apply date range filter (in-memory)
-    defects = ReportGenerator.filter_by_date_range(defects, start_date, end_date)
-
     # Fetch project details if filtered by single project
     project = None
     if project_id:
         project = await fetcher.fetch_project(project_id)
         if not project:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
+                status_code=404,
                 detail=f"Project with ID {project_id} not found",
             )
 
@@ -71,8 +72,8 @@ async def get_summary_report(
         "priority": priority.value if priority else None,
     }
 
-    report = ReportGenerator.generate_summary_report(
-        defects=defects, project=project, filters=filters_applied
+    report = ReportGenerator.generate_summary_report_from_stats(
+        stats=stats, project=project, filters=filters_applied
     )
 
     return {"success": True, "data": report.model_dump()}
@@ -106,15 +107,23 @@ async def get_detailed_report(
     token = current_user["token"]
     fetcher = DataFetcherService(token)
 
-    # Fetch defects with filters
+    # Fetch defects with filters (date range is applied by svc_defects)
     defects = await fetcher.fetch_defects(
         project_id=project_id,
         status=status.value if status else None,
         priority=priority.value if priority else None,
+        start_date=start_date,
+        end_date=end_date,
+        max_rows=MAX_DETAILED_ROWS + 1,
     )
 
-    # Apply date range filter
-    defects = ReportGenerator.filter_by_date_range(defects, start_date, end_date)
+    # Check detailed report limit
+    if len(defects) > MAX_DETAILED_ROWS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Report limit exceeded. More than {MAX_DETAILED_ROWS} defects match the filters. "
+            "Please apply more specific filters (date range, project, status, priority).",
+        )
 
     # Fetch all projects for enrichment (project names)
     projects = await fetcher.fetch_projects()
@@ -168,21 +177,21 @@ async def export_report(
     token = current_user["token"]
     fetcher = DataFetcherService(token)
 
-    # Fetch defects with filters
+    # Fetch defects with filters (date range is applied by svc_defects)
     defects = await fetcher.fetch_defects(
         project_id=project_id,
         status=status.value if status else None,
         priority=priority.value if priority else None,
+        start_date=start_date,
+        end_date=end_date,
+        max_rows=MAX_EXPORT_ROWS + 1,
     )
 
-    # Apply date range filter
-    defects = ReportGenerator.filter_by_date_range(defects, start_date, end_date)
-
-    # Check export limit (5000 rows)
+    # Check export limit (5000 rows); paging stops at the first row over it
     if len(defects) > MAX_EXPORT_ROWS:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Export limit exceeded. Found {len(defects)} defects, maximum allowed is {MAX_EXPORT_ROWS}. "
+            status_code=400,
+            detail=f"Export limit exceeded. More than {MAX_EXPORT_ROWS} defects match the filters. "
             "Please apply more specific filters (date range, project, status, priority).",
         )
 
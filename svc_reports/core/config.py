@@ -21,6 +21,17 @@ class Settings(BaseSettings):
     PROJECTS_SERVICE_URL: str
     AUTH_SERVICE_URL: str
 
+    # Tracing (W3C traceparent): "none", "jsonl" (one JSON span per line in
+    # TRACING_JSONL_PATH) or a custom exporter class as "package.module:ClassName"
+    TRACING_EXPORTER: str = "none"
+    TRACING_JSONL_PATH: str = "/tmp/traces/svc_reports.jsonl"
+
+    # Trusted-internal mode: accept the user verified by the gateway from the signed
+    # X-Verified-Identity header instead of decoding the JWT again, and cache
+    # verified tokens (LRU keyed by token digest, until exp)
+    TRUSTED_IDENTITY_ENABLED: bool = False
+    VERIFIED_TOKEN_CACHE_SIZE: int = 10000
+
     model_config = SettingsConfigDict(
         env_file=str(BASE_DIR / ".env"), case_sensitive=True, extra="ignore"
     )
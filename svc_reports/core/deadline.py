@@ -0,0 +1,95 @@
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from fastapi import HTTPException, status
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Same module as core/deadline.py of svc_auth, svc_projects and svc_defects, minus
+# the Postgres statement_timeout handling (svc_reports has no database); keep the
+# copies in sync. Like the rest of svc_reports it is documented in English.
+
+# Absolute request deadline (Unix time in seconds) stamped by the gateway
+DEADLINE_HEADER = "X-Request-Deadline"
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+def parse_deadline(value: Optional[str]) -> Optional[float]:
+    """Deadline from the header value; None if absent or malformed."""
+    if not value:
+        return None
+    try:
+        deadline = float(value)
+    except ValueError:
+        return None
+    return deadline if deadline > 0 else None
+
+
+def remaining() -> Optional[float]:
+    """Seconds left until the deadline of the current request (None without a deadline)."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.time()
+
+
+def deadline_timeout(default: float) -> float:
+    """
+    Timeout of an outgoing HTTP call: default, capped by the remaining budget.
+
+    Raises:
+        HTTPException 504: If the request deadline has already passed
+    """
+    left = remaining()
+    if left is None:
+        return default
+    if left <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="Request deadline exceeded"
+        )
+    return min(default, left)
+
+
+def deadline_headers() -> Dict[str, str]:
+    """Header that passes the deadline on to the next service."""
+    deadline = _deadline.get()
+    return {} if deadline is None else {DEADLINE_HEADER: f"{deadline:.3f}"}
+
+
+def _deadline_exceeded_response() -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        content={
+            "success": False,
+            "error": {"code": "DEADLINE_EXCEEDED", "message": "Request deadline exceeded"},
+        },
+    )
+
+
+class DeadlineMiddleware:
+    """
+    Honours the request deadline from X-Request-Deadline.
+
+    Expired requests are rejected with 504 before the endpoint runs; for the
+    others the deadline is available through remaining()/deadline_timeout().
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        deadline = parse_deadline(Headers(scope=scope).get(DEADLINE_HEADER))
+        if deadline is not None and deadline <= time.time():
+            await _deadline_exceeded_response()(scope, receive, send)
+            return
+
+        token = _deadline.set(deadline)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _deadline.reset(token)
@@ -0,0 +1,113 @@
+import base64
+import hashlib
+import hmac
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional
+
+from core.auth import decode_access_token
+from core.config import settings
+
+# User already verified by the gateway (TRUSTED_IDENTITY_ENABLED mode):
+#   v1.<user_id>.<role>.<exp>.<signature>
+# The signature is HMAC-SHA256 over the fields plus the SHA-256 digest of the
+# bearer token, so the header is only valid next to the token it was made for.
+IDENTITY_HEADER = "X-Verified-Identity"
+_VERSION = "v1"
+
+
+@lru_cache(maxsize=1)
+def _signing_key() -> bytes:
+    # Derived from JWT_SECRET_KEY under a separate label (same key as the gateway)
+    return hmac.new(settings.JWT_SECRET_KEY.encode(), b"verified-identity", hashlib.sha256).digest()
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def verify_identity(value: Optional[str], digest: str) -> Optional[dict]:
+    """
+    Payload (sub, role, exp) from the X-Verified-Identity header.
+
+    Returns:
+        None if the header is absent, the signature does not match or it has expired
+    """
+    if not value:
+        return None
+    fields, _, signature = value.rpartition(".")
+    parts = fields.split(".")
+    if len(parts) != 4 or parts[0] != _VERSION or not parts[3].isdigit():
+        return None
+    expected = hmac.new(_signing_key(), f"{fields}.{digest}".encode(), hashlib.sha256).digest()
+    if not hmac.compare_digest(base64.urlsafe_b64encode(expected).rstrip(b"=").decode(), signature):
+        return None
+    exp = int(parts[3])
+    if exp <= time.time():
+        return None
+    return {"sub": parts[1], "role": parts[2], "exp": exp}
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU cache of already verified token payloads, keyed by token digest.
+
+    Entries live until the token's exp; the token itself is never stored.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        # Sync FastAPI dependencies run in the threadpool
+        self._lock = threading.Lock()
+
+    def get(self, digest: str) -> Optional[dict]:
+        with self._lock:
+            payload = self._entries.get(digest)
+            if payload is None:
+                return None
+            if payload["exp"] <= time.time():
+                del self._entries[digest]
+                return None
+            self._entries.move_to_end(digest)
+            return payload
+
+    def set(self, digest: str, payload: dict) -> None:
+        if self.max_entries <= 0 or not isinstance(payload.get("exp"), (int, float)):
+            return
+        with self._lock:
+            self._entries[digest] = payload
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+verified_tokens = VerifiedTokenCache(settings.VERIFIED_TOKEN_CACHE_SIZE)
+
+
+def authenticate(token: str, identity: Optional[str] = None) -> dict:
+    """
+    Token payload (sub, role, exp).
+
+    In TRUSTED_IDENTITY_ENABLED mode the verified token cache is checked
+    first, then the gateway's signed header; the JWT is only decoded when
+    neither applies, and the result is cached.
+
+    Raises:
+        HTTPException 401: If token is invalid or expired
+    """
+    if not settings.TRUSTED_IDENTITY_ENABLED:
+        return decode_access_token(token)
+
+    digest = token_digest(token)
+    payload = verified_tokens.get(digest)
+    if payload is None:
+        payload = verify_identity(identity, digest) or decode_access_token(token)
+        verified_tokens.set(digest, payload)
+    return payload
@@ -8,6 +8,8 @@ from fastapi.responses import JSONResponse
 
 from api.v1 import reports
 from core.config import settings
+from core.deadline import DeadlineMiddleware
+from core.tracing import TracingMiddleware, configure_tracing
 
 
 @asynccontextmanager
@@ -15,6 +17,7 @@ async def lifespan(app: FastAPI):
     """Lifespan events for FastAPI"""
     # Startup
     print(f"Starting svc_reports on {settings.APP_HOST}:{settings.APP_PORT}")
+    configure_tracing("svc_reports")
     yield
     # Shutdown
     print("Shutting down svc_reports")
@@ -36,6 +39,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request deadline from the gateway (X-Request-Deadline)
+app.add_middleware(DeadlineMiddleware)
+
+# Request tracing (W3C traceparent)
+app.add_middleware(TracingMiddleware)
+
 
 # Exception handlers for unified response format
 @app.exception_handler(RequestValidationError)
@@ -1,3 +1,4 @@
+from datetime import date, timedelta
 from typing import Dict, List, Optional
 from uuid import UUID
 
@@ -5,6 +6,26 @@ import httpx
 from fastapi import HTTPException, status
 
 from core.config import settings
+from core.deadline import deadline_headers, deadline_timeout
+from core.tracing import span, trace_headers
+
+
+# svc_defects caps a list page at 1000 rows; larger result sets are paged by cursor
+DEFECTS_PAGE_SIZE = 1000
+
+
+def date_range_params(start_date: Optional[date], end_date: Optional[date]) -> Dict[str, str]:
+    """
+    Report date range (inclusive, by creation date) as svc_defects filters.
+
+    created_to is exclusive, so the end date is moved to the next midnight.
+    """
+    params = {}
+    if start_date:
+        params["created_from"] = start_date.isoformat()
+    if end_date:
+        params["created_to"] = (end_date + timedelta(days=1)).isoformat()
+    return params
 
 
 class DataFetcherService:
@@ -21,7 +42,7 @@ class DataFetcherService:
         """
         self.token = token
         self.headers = {"Authorization": f"Bearer {token}"}
-        self.timeout = 10.0  # 10 seconds timeout
+        self.timeout = 10.0  # 10 seconds timeout, capped by the request deadline
 
     async def fetch_defects(
         self,
@@ -30,18 +51,28 @@ class DataFetcherService:
         priority: Optional[str] = None,
         author_id: Optional[UUID] = None,
         assignee_id: Optional[UUID] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        *,
+        max_rows: int,
     ) -> List[Dict]:
         """
         Fetch defects from svc_defects with optional filters.
 
+        The date range (inclusive, by creation date) is filtered by svc_defects,
+        so only matching rows are transferred. Pages are followed by cursor
+        until the last one or until max_rows defects are fetched; callers that
+        enforce a row limit pass limit + 1 to detect an oversized result.
+
         Returns:
             List of defect dictionaries
 
         Raises:
             HTTPException 503: If svc_defects is unavailable
         """
+        # `status` shadows fastapi.status here, so status codes are literals
         try:
-            params = {"limit": 10000}  # Large limit to get all defects
+            params = date_range_params(start_date, end_date)
 
             if project_id:
                 params["project_id"] = str(project_id)
@@ -54,30 +85,91 @@ class DataFetcherService:
             if assignee_id:
                 params["assignee_id"] = str(assignee_id)
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{settings.DEFECTS_SERVICE_URL}/api/v1/defects",
-                    headers=self.headers,
-                    params=params,
-                )
+            defects = []
+            async with httpx.AsyncClient(timeout=deadline_timeout(self.timeout)) as client:
+                while len(defects) < max_rows:
+                    params["limit"] = min(DEFECTS_PAGE_SIZE, max_rows - len(defects))
+                    with span("GET svc_defects /api/v1/defects", kind="client"):
+                        response = await client.get(
+                            f"{settings.DEFECTS_SERVICE_URL}/api/v1/defects",
+                            headers={**self.headers, **deadline_headers(), **trace_headers()},
+                            params=params,
+                        )
+
+                    if response.status_code != 200:
+                        raise HTTPException(
+                            status_code=503,
+                            detail=f"Defects service error: {response.status_code}",
+                        )
 
-                if response.status_code == 200:
                     data = response.json()
-                    return data.get("data", [])
+                    defects.extend(data.get("data", []))
+                    if not data.get("next_cursor"):
+                        break
+                    params["after"] = data["next_cursor"]
+
+            return defects
+
+        except httpx.TimeoutException:
+            raise HTTPException(status_code=503, detail="Defects service timeout")
+        except httpx.RequestError as e:
+            raise HTTPException(
+                status_code=503,
+                detail=f"Defects service unavailable: {str(e)}",
+            )
+
+    async def fetch_defect_stats(
+        self,
+        project_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> Dict:
+        """
+        Fetch aggregate defect statistics computed by svc_defects.
+
+        Counts and the average close time are grouped in the database, so the
+        summary does not have to pull every matching defect over HTTP.
+
+        Returns:
+            Stats dictionary (total, by_status, by_priority, by_project,
+            open, closed, average_close_time_days)
+
+        Raises:
+            HTTPException 503: If svc_defects is unavailable
+        """
+        # `status` shadows fastapi.status here, so status codes are literals
+        try:
+            params = date_range_params(start_date, end_date)
+            if project_id:
+                params["project_id"] = str(project_id)
+            if status:
+                params["status"] = status
+            if priority:
+                params["priority"] = priority
+
+            async with httpx.AsyncClient(timeout=deadline_timeout(self.timeout)) as client:
+                with span("GET svc_defects /api/v1/defects/stats", kind="client"):
+                    response = await client.get(
+                        f"{settings.DEFECTS_SERVICE_URL}/api/v1/defects/stats",
+                        headers={**self.headers, **deadline_headers(), **trace_headers()},
+                        params=params,
+                    )
+
+                if response.status_code == 200:
+                    return response.json()["data"]
                 else:
                     raise HTTPException(
-                        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                        status_code=503,
                         detail=f"Defects service error: {response.status_code}",
                     )
 
         except httpx.TimeoutException:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Defects service timeout",
-            )
+            raise HTTPException(status_code=503, detail="Defects service timeout")
         except httpx.RequestError as e:
             raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                status_code=503,
                 detail=f"Defects service unavailable: {str(e)}",
             )
 
@@ -92,11 +184,12 @@ class DataFetcherService:
             HTTPException 503: If svc_projects is unavailable
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{settings.PROJECTS_SERVICE_URL}/api/v1/projects/{project_id}",
-                    headers=self.headers,
-                )
+            async with httpx.AsyncClient(timeout=deadline_timeout(self.timeout)) as client:
+                with span("GET svc_projects /api/v1/projects/{project_id}", kind="client"):
+                    response = await client.get(
+                        f"{settings.PROJECTS_SERVICE_URL}/api/v1/projects/{project_id}",
+                        headers={**self.headers, **deadline_headers(), **trace_headers()},
+                    )
 
                 if response.status_code == 200:
                     data = response.json()
@@ -135,12 +228,13 @@ class DataFetcherService:
             if manager_id:
                 params["manager_id"] = str(manager_id)
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{settings.PROJECTS_SERVICE_URL}/api/v1/projects",
-                    headers=self.headers,
-                    params=params,
-                )
+            async with httpx.AsyncClient(timeout=deadline_timeout(self.timeout)) as client:
+                with span("GET svc_projects /api/v1/projects", kind="client"):
+                    response = await client.get(
+                        f"{settings.PROJECTS_SERVICE_URL}/api/v1/projects",
+                        headers={**self.headers, **deadline_headers(), **trace_headers()},
+                        params=params,
+                    )
 
                 if response.status_code == 200:
                     data = response.json()
@@ -1,4 +1,3 @@
-from collections import defaultdict
 from datetime import date, datetime
 from io import BytesIO
 from typing import Dict, List, Optional
@@ -24,151 +23,33 @@ class ReportGenerator:
     """
 
     @staticmethod
-    def filter_by_date_range(
-        defects: List[Dict], start_date: Optional[date], end_date: Optional[date]
-    ) -> List[Dict]:
-        """
-        Filter defects by creation date range.
-
-        Args:
-            defects: List of defect dictionaries
-            start_date: Start date (inclusive)
-            end_date: End date (inclusive)
-
-        Returns:
-            Filtered list of defects
-        """
-        if not start_date and not end_date:
-            return defects
-
-        filtered = []
-        for defect in defects:
-            # Parse created_at (ISO format string to datetime)
-            created_at_str = defect.get("created_at")
-            if not created_at_str:
-                continue
-
-            created_at = datetime.fromisoformat(created_at_str.replace("Z", "+00:00"))
-            created_date = created_at.date()
-
-            if start_date and created_date < start_date:
-                continue
-            if end_date and created_date > end_date:
-                continue
-
-            filtered.append(defect)
-
-        return filtered
-
-    @staticmethod
-    def calculate_status_distribution(defects: List[Dict]) -> List[StatusDistribution]:
-        """
-        Calculate count of defects by status.
-
-        Returns:
-            List of StatusDistribution objects
-        """
-        counts = defaultdict(int)
-        for defect in defects:
-            status = defect.get("status")
-            if status:
-                counts[status] += 1
-
-        return [
-            StatusDistribution(status=DefectStatus(s), count=c) for s, c in counts.items()
-        ]
-
-    @staticmethod
-    def calculate_priority_distribution(
-        defects: List[Dict],
-    ) -> List[PriorityDistribution]:
-        """
-        Calculate count of defects by priority.
-
-        Returns:
-            List of PriorityDistribution objects
-        """
-        counts = defaultdict(int)
-        for defect in defects:
-            priority = defect.get("priority")
-            if priority:
-                counts[priority] += 1
-
-        return [
-            PriorityDistribution(priority=DefectPriority(p), count=c)
-            for p, c in counts.items()
-        ]
-
-    @staticmethod
-    def calculate_average_resolution_time(defects: List[Dict]) -> Optional[float]:
-        """
-        Calculate average time (in days) to close defects.
-
-        Only considers defects with status=CLOSED.
-        Uses updated_at as proxy for closed_at.
-
-        Returns:
-            Average resolution time in days, or None if no closed defects
-        """
-        resolution_times = []
-
-        for defect in defects:
-            if defect.get("status") != "CLOSED":
-                continue
-
-            created_at_str = defect.get("created_at")
-            updated_at_str = defect.get("updated_at")  # Proxy for closed_at
-
-            if not created_at_str or not updated_at_str:
-                continue
-
-            try:
-                created_at = datetime.fromisoformat(
-                    created_at_str.replace("Z", "+00:00")
-                )
-                updated_at = datetime.fromisoformat(
-                    updated_at_str.replace("Z", "+00:00")
-                )
-
-                resolution_time = (
-                    updated_at - created_at
-                ).total_seconds() / 86400  # days
-                resolution_times.append(resolution_time)
-            except ValueError:
-                continue
-
-        if not resolution_times:
-            return None
-
-        return sum(resolution_times) / len(resolution_times)
-
-    @staticmethod
-    def generate_summary_report(
-        defects: List[Dict],
+    def generate_summary_report_from_stats(
+        stats: Dict,
         project: Optional[Dict] = None,
         filters: Optional[Dict] = None,
     ) -> DefectSummaryReport:
         """
-        Generate summary statistics report.
+        Generate summary statistics report from svc_defects aggregates.
 
         Args:
-            defects: List of defect dictionaries
+            stats: Response of GET /api/v1/defects/stats
             project: Optional project dictionary (if filtered by single project)
             filters: Optional filters applied
 
         Returns:
             DefectSummaryReport object
         """
-        total_defects = len(defects)
+        total_defects = stats["total"]
+        avg_resolution = stats.get("average_close_time_days")
 
-        status_dist = ReportGenerator.calculate_status_distribution(defects)
-        priority_dist = ReportGenerator.calculate_priority_distribution(defects)
-        avg_resolution = ReportGenerator.calculate_average_resolution_time(defects)
-
-        closed_count = sum(1 for d in defects if d.get("status") == "CLOSED")
-        open_count = sum(
-            1 for d in defects if d.get("status") in ["NEW", "IN_PROGRESS", "ON_REVIEW"]
-        )
+        status_dist = [
+            StatusDistribution(status=DefectStatus(s), count=c)
+            for s, c in stats["by_status"].items()
+        ]
+        priority_dist = [
+            PriorityDistribution(priority=DefectPriority(p), count=c)
+            for p, c in stats["by_priority"].items()
+        ]
 
         project_summary = None
         if project:
@@ -186,8 +67,8 @@ class ReportGenerator:
             status_distribution=status_dist,
             priority_distribution=priority_dist,
             average_resolution_time_days=avg_resolution,
-            closed_defects_count=closed_count,
-            open_defects_count=open_count,
+            closed_defects_count=stats["closed"],
+            open_defects_count=stats["open"],
             project_summary=project_summary,
             filters_applied=filters or {},
             generated_at=datetime.utcnow(),
@@ -0,0 +1,64 @@
+import asyncio
+from datetime import date
+
+import httpx
+
+try:
+    from svc_reports.services import data_fetcher  # type: ignore
+except ModuleNotFoundError:
+    from services import data_fetcher
+
+
+def test_fetch_defects_pushes_date_range_down_and_follows_cursor(monkeypatch):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(dict(request.url.params))
+        if "after" not in request.url.params:
+            return httpx.Response(200, json={"success": True, "data": [{"id": "1"}], "next_cursor": "c1"})
+        return httpx.Response(200, json={"success": True, "data": [{"id": "2"}], "next_cursor": None})
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        data_fetcher.httpx,
+        "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+    fetcher = data_fetcher.DataFetcherService("token")
+
+    defects = asyncio.run(
+        fetcher.fetch_defects(
+            status="NEW", start_date=date(2024, 3, 1), end_date=date(2024, 3, 31), max_rows=10
+        )
+    )
+
+    assert [defect["id"] for defect in defects] == ["1", "2"]
+    assert requests[0] == {
+        "limit": "10",
+        "created_from": "2024-03-01",
+        "created_to": "2024-04-01",
+        "status": "NEW",
+    }
+    assert (requests[1]["after"], requests[1]["limit"]) == ("c1", "9")
+
+
+def test_fetch_defects_stops_paging_at_max_rows(monkeypatch):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(dict(request.url.params))
+        page = [{"id": str(len(requests))}] * int(request.url.params["limit"])
+        return httpx.Response(200, json={"success": True, "data": page, "next_cursor": "more"})
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        data_fetcher.httpx,
+        "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+    fetcher = data_fetcher.DataFetcherService("token")
+
+    defects = asyncio.run(fetcher.fetch_defects(max_rows=data_fetcher.DEFECTS_PAGE_SIZE + 1))
+
+    assert len(defects) == data_fetcher.DEFECTS_PAGE_SIZE + 1
+    assert [params["limit"] for params in requests] == [str(data_fetcher.DEFECTS_PAGE_SIZE), "1"]
@@ -1,5 +1,7 @@
-from datetime import date, datetime, timedelta, timezone
-from uuid import uuid4
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+
+import pytest
 
 try:
     from svc_reports.services.report_generator import ReportGenerator  # type: ignore
@@ -28,32 +30,42 @@ def _make_defect(status=DefectStatus.NEW, priority=DefectPriority.MEDIUM, days_a
     }
 
 
-def test_filter_by_date_range_returns_only_matching_items():
-    defects = [
-        _make_defect(days_ago=10),
-        _make_defect(days_ago=5),
-        _make_defect(days_ago=1),
-    ]
-    start = date.today() - timedelta(days=6)
-    end = date.today() - timedelta(days=2)
+def test_generate_summary_report_from_stats_uses_server_aggregates():
+    project_id = uuid4()
+    stats = {
+        "total": 4,
+        "by_status": {"NEW": 1, "IN_PROGRESS": 1, "CLOSED": 2},
+        "by_priority": {"HIGH": 3, "LOW": 1},
+        "by_project": {str(project_id): 4},
+        "open": 2,
+        "closed": 2,
+        "average_close_time_days": 1.5,
+    }
 
-    filtered = ReportGenerator.filter_by_date_range(defects, start, end)
+    report = ReportGenerator.generate_summary_report_from_stats(
+        stats=stats, project={"id": str(project_id), "name": "Tower"}, filters={}
+    )
 
-    assert len(filtered) == 1
-    assert filtered[0]["title"] == "Sample"
+    assert report.total_defects == 4
+    assert (report.open_defects_count, report.closed_defects_count) == (2, 2)
+    assert report.average_resolution_time_days == 1.5
+    assert {item.status: item.count for item in report.status_distribution}[DefectStatus.CLOSED] == 2
+    assert {item.priority: item.count for item in report.priority_distribution}[DefectPriority.HIGH] == 3
+    assert report.project_summary.project_name == "Tower"
+    assert report.project_summary.total_defects == 4
 
 
-def test_generate_summary_report_counts_statuses_and_priorities():
-    defects = [
-        _make_defect(status=DefectStatus.NEW, priority=DefectPriority.HIGH),
-        _make_defect(status=DefectStatus.CLOSED, priority=DefectPriority.LOW),
-        _make_defect(status=DefectStatus.CLOSED, priority=DefectPriority.LOW),
-    ]
+def test_generate_detailed_report_enriches_projects_and_resolution_time():
+    closed = _make_defect(status=DefectStatus.CLOSED, days_ago=3)
+    open_defect = _make_defect(status=DefectStatus.NEW)
+    project_id = UUID(closed["project_id"])
 
-    report = ReportGenerator.generate_summary_report(defects=defects, project=None, filters={"status": "all"})
+    report = ReportGenerator.generate_detailed_report(
+        defects=[closed, open_defect], projects_map={project_id: {"name": "Tower"}}, filters={}
+    )
 
-    assert report.total_defects == 3
-    assert report.closed_defects_count == 2
-    assert report.open_defects_count == 1
-    assert any(item.status == DefectStatus.NEW for item in report.status_distribution)
-    assert any(item.priority == DefectPriority.LOW for item in report.priority_distribution)
+    assert report.total_count == 2
+    assert report.defects[0].project_name == "Tower"
+    assert report.defects[0].resolution_time_days == pytest.approx(3.0)
+    assert report.defects[1].project_name is None
+    assert report.defects[1].resolution_time_days is None